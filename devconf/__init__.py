@@ -1 +1,41 @@
+# Importing the package loads nothing but this module, the compiler is
+# imported by the first function using it.
 
+DEVCONF_VERSION_MAJOR = 0
+DEVCONF_VERSION_MINOR = 0
+DEVCONF_VERSION_PATCH = 1
+DEVCONF_VERSION = (DEVCONF_VERSION_MAJOR, DEVCONF_VERSION_MINOR, DEVCONF_VERSION_PATCH)
+DEVCONF_VERSION_STRING = '%d.%d.%d' % DEVCONF_VERSION
+
+__version__ = DEVCONF_VERSION_STRING
+
+
+def compile_file(infile: str, outfile: str, format: str = 'macro', depfile: str or None = None,
+                 image: str or None = None, cache_dir: str or None = None, prefix: str or None = None) -> None:
+    # compiles the configuration infile to the header outfile, "-" stands for
+    # standard input and output
+    import devconf.compiler
+
+    generator_class = devconf.compiler.get_generator(format)
+    config = devconf.compiler.DeviceConfiguration(infile, outfile, depfile, image, generator_class, prefix)
+    config.compile(compile_cache=devconf.compiler.open_cache(cache_dir))
+
+
+def compile_string(text: str or bytes, filename: str = '', format: str = 'macro', prefix: str or None = None) -> str:
+    # the header compiled from the configuration text, filename is the name
+    # used in messages
+    import devconf.compiler
+
+    return devconf.compiler.compile_text(text, filename, devconf.compiler.get_generator(format), prefix=prefix)
+
+
+def compile_many(jobs: list, workers: int or None = None, format: str = 'macro', cache_dir: str or None = None,
+                 depfiles: bool = False, threads: bool = False, prefix: str or None = None) -> list:
+    # compiles pairs of configuration and header in worker processes, or in
+    # threads of this process, returns the input, output and error message,
+    # None on success, of every job
+    import devconf.compiler
+
+    generator_class = devconf.compiler.get_generator(format)
+
+    return list(devconf.compiler.compile_batch(jobs, workers, cache_dir, depfiles, generator_class, threads, prefix))
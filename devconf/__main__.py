@@ -2,48 +2,310 @@
 Device Configuration.
 
 Usage:
-    devconf.py -o OUTPUT FILE
+    devconf.py [--cache DIR] [--depfile] [--format FORMAT] [--prefix PREFIX] [--image IMAGE] [--stats]
+               [--stats-json FILE] [--profile FILE] [--trace FILE] -o OUTPUT FILE
+    devconf.py [--cache DIR] [--depfile] [--format FORMAT] [--prefix PREFIX] [-j JOBS] [--threads]
+               (-m MANIFEST | PAIR...)
+    devconf.py [-j JOBS] --serve SOCKET
     devconf.py --version
 
+Arguments:
+    FILE
+        The configuration to compile, "-" reads it from standard input.
+    PAIR
+        A configuration and the header to create from it, joined by "=",
+        e.g. board.dc=board.h.
+
 Options:
     -o --output OUTPUT
-        The name of the header file to be created.
+        The name of the header file to be created, "-" writes it to standard
+        output.
+    -f --format FORMAT
+        What the header contains: "macro" defines a macro per value, "blob"
+        packs all values into a single constant table read through the
+        accessors of ucapi/config.h and "lookup" emits a table of all macro
+        names and values with a function finding a name in constant time
+        [default: macro].
+    -p --prefix PREFIX
+        The prefix of every macro name and of the names of the tables and
+        types of the blob and lookup formats. Headers of several
+        configurations compiled with distinct prefixes can be included
+        together. Defaults to DC.
+    -m --manifest MANIFEST
+        A file listing one configuration and header pair per line, separated
+        by white space. Everything following a "#" is ignored.
+    -j --jobs JOBS
+        The number of worker processes compiling a batch or serving requests.
+        Defaults to the number of processors.
+    --threads
+        Compile a batch in threads of this process instead of worker
+        processes, which saves starting and feeding the workers. The threads
+        only compile in parallel on a free-threaded build of Python.
+    --cache DIR
+        Keep compiled headers in DIR, keyed by the content of the input, and
+        reuse them instead of compiling unchanged input again.
+    --image IMAGE
+        Also write the compiled symbol table to IMAGE, a binary file which
+        tools can map into memory and query without parsing the input again.
+        The compile cache is not used then.
+    --depfile
+        Write the files the input was preprocessed from, as named by its line
+        markers, as a Make/Ninja dependency file next to each header. Its name
+        is the name of the header followed by ".d". The header must not be
+        written to standard output.
+    --stats
+        Print the time and peak traced memory of each phase of the compilation
+        to standard error: reading, lexing, parsing, resolving names and
+        generating the header. Also prints the number of tokens, of syntax tree
+        nodes by class, of symbol table lookups and the namespaces they scan,
+        of filter checks and of map lookups. The compile cache is not used
+        then and the input is lexed once more on its own. Tracing memory slows
+        every phase down, so the times are best compared with each other.
+    --stats-json FILE
+        Like --stats, but write the statistics to FILE as JSON, "-" writes them
+        to standard output.
+    --profile FILE
+        Profile the compilation with cProfile and write the result to FILE,
+        which the pstats module and tools such as snakeviz read.
+    --trace FILE
+        Record every grammar action, symbol table operation and assignment
+        with the file and line of the input it was made for, and write them to
+        FILE in the trace event format of chrome://tracing and Perfetto. The
+        compile cache is not used then.
+    --serve SOCKET
+        Run as a server listening on the UNIX domain socket SOCKET until it is
+        interrupted. The server runs the command lines client.py forwards to
+        it in worker processes which import the compiler and build its parser
+        only once, several clients are served at a time.
 """
 
+import os
+import sys
+
+if not __package__:
+    # run as a script: the directory of the package must not be on the path,
+    # its packages would shadow those of the standard library
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 import docopt
-import generator
-import parser.parser
+import devconf
 
-DEVCONF_VERSION_MAJOR = 0
-DEVCONF_VERSION_MINOR = 0
-DEVCONF_VERSION_PATCH = 1
-DEVCONF_VERSION = (DEVCONF_VERSION_MAJOR, DEVCONF_VERSION_MINOR, DEVCONF_VERSION_PATCH)
-DEVCONF_VERSION_STRING = '%d.%d.%d' % DEVCONF_VERSION
+# everything else is imported when it is used, so that --version and a
+# compilation served from the cache start quickly
 
 
-class DeviceConfiguration(object):
-    def __init__(self, infile: str, outfile: str):
-        self._infile = str(infile)
-        self._outfile = str(outfile)
+def report(results) -> int:
+    failed = 0
 
-    def compile(self) -> None:
-        with open(self._infile, 'rt') as file:
-            document = file.read()
+    for infile, outfile, error in results:
+        if error is None:
+            print('%s -> %s: ok' % (infile, outfile))
 
-            p = parser.parser.Parser(self._infile)
+        else:
+            print('%s -> %s: failed: %s' % (infile, outfile, error), file=sys.stderr)
+            failed += 1
 
-            syntax_tree, symbol_table = p.parse(document, tracking=True)
+    return failed
 
-            gen = generator.MacroGenerator(syntax_tree, symbol_table)
-            gen.generate(self._outfile)
 
+def write_statistics(statistics: 'devconf.stats.Statistics', text: bool, json_file: str or None) -> None:
+    if text:
+        statistics.write_text(sys.stderr)
+
+    if json_file == '-':
+        statistics.write_json(sys.stdout)
+
+    elif json_file is not None:
+        with open(json_file, 'wt') as file:
+            statistics.write_json(file)
+
+
+def _serve_request(argv: list, cwd: str) -> tuple:
+    # runs a command line forwarded by a client in a server worker, which
+    # runs one request at a time
+    import io
+    import traceback
+    import contextlib
+
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            os.chdir(cwd)
+            args = docopt.docopt(__doc__, argv, version=devconf.DEVCONF_VERSION_STRING)
+
+            if args['--serve'] is not None:
+                # a nested server would keep the worker busy for good
+                print('--serve cannot be forwarded to a server.', file=sys.stderr)
+                print(docopt.printable_usage(__doc__), file=sys.stderr)
+                status = 2
+
+            else:
+                status = main(args)
+
+        except SystemExit as e:
+            # usage errors and --version
+            if isinstance(e.code, str):
+                print(e.code, file=sys.stderr)
+
+            status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+            status = 1
+
+    return status, stdout.getvalue(), stderr.getvalue()
+
+
+def _terminate(signum, frame) -> None:
+    # shuts the server down like an interrupt, which removes its socket
+    raise KeyboardInterrupt()
 
-def main(args):
-    config = DeviceConfiguration(args['FILE'], args['--output'])
-    config.compile()
+
+def serve(path: str, workers: int or None = None) -> int:
+    import signal
+
+    import devconf.compiler
+    import devconf.server.daemon
+
+    try:
+        s = devconf.server.daemon.Server(path, _serve_request, workers, initializer=devconf.compiler.init_worker)
+
+    except (devconf.server.ServerError, OSError) as e:
+        print(str(e), file=sys.stderr)
+
+        return 2
+
+    signal.signal(signal.SIGTERM, _terminate)
+
+    with s:
+        try:
+            s.serve_forever()
+
+        except KeyboardInterrupt:
+            pass
 
     return 0
 
 
+def compile_file(args, generator_class: type) -> int:
+    import devconf.compiler
+
+    depfile = devconf.compiler.get_depfile(args['--output'], args['--depfile'])
+
+    try:
+        config = devconf.compiler.DeviceConfiguration(args['FILE'], args['--output'], depfile, args['--image'],
+                                                      generator_class, args['--prefix'])
+
+    except devconf.compiler.CompileError as e:
+        print(str(e), file=sys.stderr)
+
+        return 2
+
+    compile_cache = devconf.compiler.open_cache(args['--cache'])
+    measured = args['--stats'] or args['--stats-json'] is not None
+
+    # the instruments are only imported if they are used, a plain compile and
+    # above all a cache hit does without them
+    profile = None
+    recorder = None
+    statistics = None
+
+    if args['--profile'] is not None:
+        import cProfile
+
+        profile = cProfile.Profile()
+        profile.enable()
+
+    if args['--trace'] is not None:
+        import devconf.tracing
+
+        recorder = devconf.tracing.Recorder()
+        devconf.tracing.subscribe(recorder)
+
+    try:
+        if measured:
+            import devconf.stats
+
+            statistics = devconf.stats.Statistics(args['FILE'])
+            config.measure(statistics)
+
+        else:
+            config.compile(devconf.compiler.get_worker_parser(), compile_cache if recorder is None else None)
+
+    finally:
+        if recorder is not None:
+            devconf.tracing.unsubscribe(recorder)
+
+    if profile is not None:
+        profile.disable()
+        profile.dump_stats(args['--profile'])
+
+    if statistics is not None:
+        write_statistics(statistics, args['--stats'], args['--stats-json'])
+
+    if recorder is not None:
+        with open(args['--trace'], 'wt') as file:
+            devconf.tracing.write_chrome_trace(recorder.get_events(), file)
+
+    return 0
+
+
+def compile_batch(args, generator_class: type) -> int:
+    import devconf.compiler
+
+    try:
+        if args['--manifest'] is not None:
+            jobs = devconf.compiler.read_manifest(args['--manifest'])
+
+        else:
+            jobs = [devconf.compiler.parse_pair(x) for x in args['PAIR']]
+
+        workers = int(args['--jobs']) if args['--jobs'] is not None else None
+
+        if workers is not None and workers < 1:
+            raise devconf.compiler.BatchError('The number of jobs must be positive.')
+
+    except (devconf.compiler.BatchError, OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+
+        return 2
+
+    results = devconf.compiler.compile_batch(jobs, workers, args['--cache'], args['--depfile'], generator_class,
+                                             args['--threads'], args['--prefix'])
+
+    return 1 if report(results) else 0
+
+
+def main(args):
+    if args['--serve'] is not None:
+        try:
+            workers = int(args['--jobs']) if args['--jobs'] is not None else None
+
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+
+            return 2
+
+        return serve(args['--serve'], workers)
+
+    import devconf.compiler
+
+    try:
+        generator_class = devconf.compiler.get_generator(args['--format'])
+        devconf.compiler.check_prefix(args['--prefix'])
+
+    except devconf.compiler.CompileError as e:
+        print(str(e), file=sys.stderr)
+
+        return 2
+
+    if args['--output'] is not None:
+        return compile_file(args, generator_class)
+
+    return compile_batch(args, generator_class)
+
+
 if __name__ == '__main__':
-    exit(main(docopt.docopt(__doc__, version=DEVCONF_VERSION_STRING)))
+    exit(main(docopt.docopt(__doc__, version=devconf.DEVCONF_VERSION_STRING)))
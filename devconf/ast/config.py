@@ -1,24 +1,30 @@
-import ast.mixins.node
+import devconf.ast.namespace
+import devconf.ast.mixins.node
 
 
-class Content(ast.mixins.node.Node):
+class Content(devconf.ast.mixins.node.Node):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
 
-class DeviceConfiguration(ast.mixins.node.Node):
+class DeviceConfiguration(devconf.ast.mixins.node.Node):
+    __slots__ = ('_content',)
+
     def __init__(self):
         super().__init__()
 
         self._content = None
 
-    def get_content(self) -> Content:
-        assert isinstance(self._content, Content)
+    def get_content(self) -> devconf.ast.namespace.Content:
+        assert isinstance(self._content, devconf.ast.namespace.Content)
 
         return self._content
 
-    def set_content(self, content: Content) -> None:
-        assert isinstance(content, Content)
+    def set_content(self, content: devconf.ast.namespace.Content) -> None:
+        # the content of the global namespace, as the grammar builds it
+        assert isinstance(content, devconf.ast.namespace.Content)
 
         self._content = content
         self.add_child(content)
\ No newline at end of file
@@ -1,27 +1,31 @@
-import ast.error
-import ast.value
+import devconf.ast.error
+import devconf.ast.value
 
-import ast.mixins.node
-import ast.mixins.typed
-import ast.mixins.named
-import ast.mixins.expression
+import devconf.ast.mixins.node
+import devconf.ast.mixins.typed
+import devconf.ast.mixins.named
+import devconf.ast.mixins.expression
 
 
-class Constant(ast.mixins.expression.RValueExpression, ast.mixins.named.Named):
+class Constant(devconf.ast.mixins.expression.RValueExpression, devconf.ast.mixins.named.Named):
+    __slots__ = ('_name',)
+
     def __init__(self):
         super().__init__()
 
     def __str__(self):
         return 'constant(%s = %s)' % (self.get_name(), str(self.get_value()))
 
-    def set_value(self, value: ast.value.Value):
-        assert isinstance(value, ast.value.Value)
+    def set_value(self, value: devconf.ast.value.Value):
+        assert isinstance(value, devconf.ast.value.Value)
 
         self.set_type(value.get_type())
         super().set_value(value)
 
 
-class ConstantList(ast.mixins.node.Node, ast.mixins.typed.Typed):
+class ConstantList(devconf.ast.mixins.node.Node, devconf.ast.mixins.typed.Typed):
+    __slots__ = ('_type',)
+
     def __init__(self):
         super().__init__()
 
@@ -34,7 +38,7 @@ class ConstantList(ast.mixins.node.Node, ast.mixins.typed.Typed):
                 self.add_child(constant)
 
             else:
-                raise ast.error.IncompatibleTypesError(self, constant, self)
+                raise devconf.ast.error.IncompatibleTypesError(self, constant, self)
 
         else:
             self.set_type(constant.get_type())
@@ -1,9 +1,9 @@
-import ast.mixins.node
+import devconf.ast.mixins.node
 
 
 class AstError(Exception):
     def __init__(self, node, text):
-        if not isinstance(node, ast.mixins.node.Node):
+        if not isinstance(node, devconf.ast.mixins.node.Node):
             raise TypeError('"node" must be of type "Node".')
 
         if not isinstance(text, str):
@@ -30,10 +30,10 @@ class DescriptionSetError(AstError):
         if not isinstance(entry, str):
             raise TypeError('"entry" must be of type "str".')
 
-        if not isinstance(first, ast.mixins.node.Node):
+        if not isinstance(first, devconf.ast.mixins.node.Node):
             raise TypeError('"first" must be of type "Node".')
 
-        if not isinstance(second, ast.mixins.node.Node):
+        if not isinstance(second, devconf.ast.mixins.node.Node):
             raise TypeError('"second" must be of type "Node".')
 
         text = 'Multiple %s in description set: First: %s; Second: %s.' % (entry, str(first), str(second))
@@ -1,32 +1,34 @@
-import ast.mixins.expression
+import devconf.ast.mixins.expression
 
 
-class BinaryExpression(ast.mixins.expression.RValueExpression):
+class BinaryExpression(devconf.ast.mixins.expression.RValueExpression):
+    __slots__ = ('_performed', '_lhs', '_rhs')
+
     def __init__(self):
         super().__init__()
 
         self._performed: bool = False
-        self._lhs: ast.mixins.expression.LValueExpression or None = None
-        self._rhs: ast.mixins.expression.RValueExpression or None = None
+        self._lhs: devconf.ast.mixins.expression.LValueExpression or None = None
+        self._rhs: devconf.ast.mixins.expression.RValueExpression or None = None
 
-    def get_lhs(self) -> ast.mixins.expression.LValueExpression:
-        assert isinstance(self._lhs, ast.mixins.expression.LValueExpression)
+    def get_lhs(self) -> devconf.ast.mixins.expression.LValueExpression:
+        assert isinstance(self._lhs, devconf.ast.mixins.expression.LValueExpression)
 
         return self._lhs
 
-    def set_lhs(self, lhs: ast.mixins.expression.LValueExpression) -> None:
-        assert isinstance(lhs, ast.mixins.expression.LValueExpression)
+    def set_lhs(self, lhs: devconf.ast.mixins.expression.LValueExpression) -> None:
+        assert isinstance(lhs, devconf.ast.mixins.expression.LValueExpression)
 
         self._lhs = lhs
         self.add_child(lhs)
 
-    def get_rhs(self) -> ast.mixins.expression.LValueExpression:
-        assert isinstance(self._rhs, ast.mixins.expression.LValueExpression)
+    def get_rhs(self) -> devconf.ast.mixins.expression.LValueExpression:
+        assert isinstance(self._rhs, devconf.ast.mixins.expression.LValueExpression)
 
         return self._rhs
 
-    def set_rhs(self, rhs: ast.mixins.expression.LValueExpression) -> None:
-        assert isinstance(rhs, ast.mixins.expression.LValueExpression)
+    def set_rhs(self, rhs: devconf.ast.mixins.expression.LValueExpression) -> None:
+        assert isinstance(rhs, devconf.ast.mixins.expression.LValueExpression)
 
         self._rhs = rhs
         self.add_child(rhs)
@@ -45,6 +47,8 @@ class BinaryExpression(ast.mixins.expression.RValueExpression):
 
 
 class AssignmentExpression(BinaryExpression):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
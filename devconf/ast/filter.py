@@ -1,65 +1,131 @@
-import ast.value
-import ast.range
-import ast.error
+import math
+import bisect
 
-import ast.mixins.node
-import ast.mixins.typed
-import ast.mixins.expression
+import devconf.ast.value
+import devconf.ast.range
+import devconf.ast.error
 
+import devconf.ast.mixins.node
+import devconf.ast.mixins.typed
+import devconf.ast.mixins.expression
+
+
+class FilterPredicateList(devconf.ast.mixins.node.Node, devconf.ast.mixins.typed.Typed):
+    __slots__ = ('_type', '_values', '_starts', '_ends')
 
-class FilterPredicateList(ast.mixins.node.Node, ast.mixins.typed.Typed):
     def __init__(self):
         super().__init__()
 
+        # compiled form: discrete values plus sorted, merged, non-overlapping
+        # closed intervals; None until compile() has run
+        self._values: set or None = None
+        self._starts: list or None = None
+        self._ends: list or None = None
+
     def __str__(self):
         members = ', '.join(str(x) for x in self.get_children())
         return 'filter-predicate-list(%s)' % members
 
-    def __contains__(self, other: ast.value.Value):
+    def __contains__(self, other: devconf.ast.value.Value):
+        if self._values is None:
+            self.compile()
+
+        value = other.get_value()
+
+        if value in self._values and self.has_same_type(other):
+            return True
+
+        i = bisect.bisect_right(self._starts, value) - 1
+
+        return i >= 0 and value <= self._ends[i]
+
+    def compile(self) -> None:
+        values = set()
+        intervals = []
+
         for child in self.get_children():
-            if isinstance(child, ast.mixins.expression.LValueExpression):
-                if other == child.get_value():
-                    return True
+            if isinstance(child, devconf.ast.mixins.expression.LValueExpression):
+                values.add(child.get_value().get_value())
+
+            elif isinstance(child, devconf.ast.range.Range):
+                start = child.get_start()
+                end = child.get_end()
 
-            elif isinstance(child, ast.range.Range):
-                if other in child:
-                    return True
+                start = -math.inf if start is None else start.get_value()
+                end = math.inf if end is None else end.get_value()
+
+                # an empty range never matches
+                if start <= end:
+                    intervals.append((start, end))
 
             else:
                 raise TypeError('Argument is neither a range nor a value.')
 
-        return False
+        intervals.sort()
+
+        starts = []
+        ends = []
 
-    def add_value(self, child: ast.mixins.expression.LValueExpression) -> None:
-        assert isinstance(child, ast.mixins.expression.LValueExpression)
+        for start, end in intervals:
+            if ends and start <= ends[-1]:
+                ends[-1] = max(ends[-1], end)
+
+            else:
+                starts.append(start)
+                ends.append(end)
+
+        self._values = values
+        self._starts = starts
+        self._ends = ends
+
+    def get_discrete_values(self) -> set:
+        if self._values is None:
+            self.compile()
+
+        return self._values
+
+    def get_intervals(self) -> list:
+        if self._values is None:
+            self.compile()
+
+        return list(zip(self._starts, self._ends))
+
+    def add_value(self, child: devconf.ast.mixins.expression.LValueExpression) -> None:
+        assert isinstance(child, devconf.ast.mixins.expression.LValueExpression)
 
         if self.has_type():
             if self.has_same_type(child):
                 self.add_child(child)
 
             else:
-                raise ast.error.IncompatibleTypesError(self, child.get_type(), self.get_type())
+                raise devconf.ast.error.IncompatibleTypesError(self, child.get_type(), self.get_type())
 
         else:
             self.set_type(child.get_type())
             self.add_child(child)
 
-    def add_range(self, child: ast.range.Range) -> None:
-        assert isinstance(child, ast.range.Range)
+        self._values = None
+
+    def add_range(self, child: devconf.ast.range.Range) -> None:
+        assert isinstance(child, devconf.ast.range.Range)
 
         if self.has_type():
             if self.has_same_type(child):
                 self.add_child(child)
 
             else:
-                raise ast.error.IncompatibleTypesError(self, child.get_type(), self.get_type())
+                raise devconf.ast.error.IncompatibleTypesError(self, child.get_type(), self.get_type())
 
         else:
             self.set_type(child.get_type())
             self.add_child(child)
 
+        self._values = None
+
+
+class Filter(devconf.ast.mixins.node.Node, devconf.ast.mixins.typed.Typed):
+    __slots__ = ('_type', '_allow', '_predicate_list')
 
-class Filter(ast.mixins.node.Node, ast.mixins.typed.Typed):
     DENY = 'deny'
     ALLOW = 'allow'
 
@@ -75,7 +141,7 @@ class Filter(ast.mixins.node.Node, ast.mixins.typed.Typed):
         else:
             allow = Filter.ALLOW
 
-        children = str(self.get_children())
+        children = str(list(self.get_children()))
 
         return 'filter(%s, %s)' % (allow, children)
 
@@ -92,16 +158,22 @@ class Filter(ast.mixins.node.Node, ast.mixins.typed.Typed):
     def set_allow(self, allow: bool) -> None:
         self._allow = allow
 
+    def get_predicate_list(self) -> FilterPredicateList or None:
+        return self._predicate_list
+
     def set_predicate_list(self, child: FilterPredicateList) -> None:
         assert self._predicate_list is None
 
+        # the predicate list is complete once it is attached to its filter
+        child.compile()
+
         if self.has_type():
             if self.has_same_type(child):
                 self._predicate_list = child
                 self.add_child(child)
 
             else:
-                raise ast.error.IncompatibleTypesError(self, child.get_type(), self.get_type())
+                raise devconf.ast.error.IncompatibleTypesError(self, child.get_type(), self.get_type())
 
         else:
             self.set_type(child.get_type())
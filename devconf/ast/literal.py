@@ -1,7 +1,9 @@
-import ast.mixins.expression
+import devconf.ast.mixins.expression
 
 
-class Literal(ast.mixins.expression.RValueExpression):
+class Literal(devconf.ast.mixins.expression.RValueExpression):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
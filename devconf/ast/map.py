@@ -1,10 +1,12 @@
-import ast.error
+import devconf.ast.error
 
-import ast.mixins.node
-import ast.mixins.typed
+import devconf.ast.mixins.node
+import devconf.ast.mixins.typed
 
 
-class MapEntry(ast.mixins.node.Node, ast.mixins.typed.Typed):
+class MapEntry(devconf.ast.mixins.node.Node, devconf.ast.mixins.typed.Typed):
+    __slots__ = ('_type', '_key', '_value')
+
     def __init__(self):
         super().__init__()
 
@@ -26,28 +28,44 @@ class MapEntry(ast.mixins.node.Node, ast.mixins.typed.Typed):
         return self._value
 
     def set_value(self, value):
+        if self._value is None:
+            self.add_child(value)
+
+        else:
+            # a later entry for the same key replaces the value
+            self.replace_child(self._value, value)
+
         self._value = value
-        self.add_child(value)
 
 
-class MapHelper(ast.mixins.node.Node, ast.mixins.typed.Typed):
+class MapHelper(devconf.ast.mixins.node.Node, devconf.ast.mixins.typed.Typed):
+    __slots__ = ('_type',)
+
     def __init__(self):
         super().__init__()
 
 
-class Map(ast.mixins.node.Node, ast.mixins.typed.Typed):
+class Map(devconf.ast.mixins.node.Node, devconf.ast.mixins.typed.Typed):
+    __slots__ = ('_type', '_helper', '_index')
+
     def __init__(self):
         super().__init__()
         self._helper = None
 
+        # underlying key value -> entry
+        self._index = {}
+
     def __str__(self):
         return 'map(%s)' % ', '.join((str(x) for x in self.get_children()))
 
     def _add_entry(self, entry):
-        x = next((x for x in self.get_children() if x.get_key() == entry.get_key()), None)
+        key = entry.get_key().get_value().get_value()
+
+        x = self._index.get(key)
         if x is not None:
             x.set_value(entry.get_value())
         else:
+            self._index[key] = entry
             self.add_child(entry)
 
     def add_entry(self, entry):
@@ -57,10 +75,11 @@ class Map(ast.mixins.node.Node, ast.mixins.typed.Typed):
                     self._add_entry(entry)
 
                 else:
-                    raise ast.error.IncompatibleTypesError(self, entry.get_value().get_type(), self._helper.get_type())
+                    raise devconf.ast.error.IncompatibleTypesError(self, entry.get_value().get_type(),
+                                                                   self._helper.get_type())
 
             else:
-                raise ast.error.IncompatibleTypesError(self, entry.get_key().get_type(), self.get_type())
+                raise devconf.ast.error.IncompatibleTypesError(self, entry.get_key().get_type(), self.get_type())
 
         else:
             self._helper = MapHelper()
@@ -73,10 +92,11 @@ class Map(ast.mixins.node.Node, ast.mixins.typed.Typed):
             self._add_entry(entry)
 
     def _get_entry(self, key, default):
-        def compare(x, other):
-            return x.get_key().get_value() == other
-
-        return next((x for x in self.get_children() if compare(x, key)), default)
+        x = self._index.get(key.get_value())
+        if x is not None and x.get_key().get_value() == key:
+            return x
+        else:
+            return default
 
     def get_entry(self, key, default):
         return self._get_entry(key, default)
@@ -1,45 +1,51 @@
-import ast.value
-import ast.qualifier
+import devconf.ast.value
+import devconf.ast.qualifier
 
-import ast.mixins.node
-import ast.mixins.typed
-import ast.mixins.qualified
+import devconf.ast.mixins.node
+import devconf.ast.mixins.typed
+import devconf.ast.mixins.qualified
 
 
-class LValueExpression(ast.mixins.node.Node, ast.mixins.typed.Typed, ast.mixins.qualified.Qualified):
+class LValueExpression(devconf.ast.mixins.node.Node, devconf.ast.mixins.typed.Typed,
+                       devconf.ast.mixins.qualified.Qualified):
+    __slots__ = ('_type', '_qualifiers', '__value')
+
     def __init__(self):
         super().__init__()
 
-        self.__value: ast.value.Value or None = None
+        self.__value: devconf.ast.value.Value or None = None
 
-    def get_value(self) -> ast.value.Value:
-        assert isinstance(self.__value, ast.value.Value) or self.has_default()
+    def get_value(self) -> devconf.ast.value.Value:
+        assert isinstance(self.__value, devconf.ast.value.Value) or self.has_default()
 
         if self.__value is None:
             assert self.has_default()
 
             value = self.get_default()
-            assert isinstance(value, ast.value.Value)
+            assert isinstance(value, devconf.ast.value.Value)
 
             return value
 
         else:
-            assert isinstance(self.__value, ast.value.Value)
+            assert isinstance(self.__value, devconf.ast.value.Value)
 
             return self.__value
 
-    def set_value(self, value: ast.value.Value) -> None:
-        assert isinstance(value, ast.value.Value)
+    def set_value(self, value: devconf.ast.value.Value) -> None:
+        assert isinstance(value, devconf.ast.value.Value)
 
         if hasattr(super(), 'set_value'):
             super().set_value(value)
 
         self.__value = value
 
+    def has_value(self) -> bool:
+        return self.__value is not None or self.has_default()
+
     def has_default(self) -> bool:
         return False
 
-    def get_default(self) -> ast.value.Value or None:
+    def get_default(self) -> devconf.ast.value.Value or None:
         return None
 
     def evaluate(self):
@@ -47,7 +53,9 @@ class LValueExpression(ast.mixins.node.Node, ast.mixins.typed.Typed, ast.mixins.
 
 
 class RValueExpression(LValueExpression):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
-        self.add_qualifier(ast.qualifier.ConstQualifier())
+        self.add_qualifier(devconf.ast.qualifier.ConstQualifier())
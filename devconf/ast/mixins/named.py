@@ -1,3 +1,6 @@
+import sys
+
+
 class UnnamedError(Exception):
     pass
 
@@ -7,13 +10,16 @@ class RenamedError(Exception):
 
 
 class Named(object):
+    # _name is a slot of the classes using the mixin
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
-        self.__name: str or None = None
+        self._name: str or None = None
 
     def has_name(self) -> bool:
-        if isinstance(self.__name, str):
+        if isinstance(self._name, str):
             return True
 
         return False
@@ -22,18 +28,18 @@ class Named(object):
         assert len(args) < 2
 
         if len(args) == 0:
-            assert isinstance(self.__name, str)
-            return str(self.__name)
+            assert isinstance(self._name, str)
+            return str(self._name)
 
         if len(args) == 1:
-            if isinstance(self.__name, str):
-                return str(self.__name)
+            if isinstance(self._name, str):
+                return str(self._name)
 
             else:
                 assert isinstance(args[0], str)
                 return args[0]
 
     def set_name(self, name: str) -> None:
-        assert self.__name is None
+        assert self._name is None
 
-        self.__name = str(name)
+        self._name = sys.intern(str(name))
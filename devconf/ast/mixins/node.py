@@ -1,40 +1,75 @@
+import sys
+
+
 class Node(object):
+    # Node keeps its attributes in slots. Only one base of a class may add
+    # slots, so the mixins combined with it declare none and their attributes
+    # are slots of the first class combining them with Node instead.
+    __slots__ = ('_filename', '_children', '_line_number', '_column_number')
+
     def __init__(self):
         super().__init__()
 
-        self.__filename = ''
-        self.__children = []
-        self.__line_number = 0
-        self.__column_number = 0
+        self._filename = ''
+        self._line_number = 0
+        self._column_number = 0
 
-    def get_children(self) -> list:
-        return self.__children
+        # allocated with the first child, a tuple once frozen
+        self._children: list or tuple or None = None
+
+    def get_children(self) -> list or tuple:
+        if self._children is None:
+            return ()
+
+        return self._children
 
     def add_child(self, child: 'Node') -> None:
         assert isinstance(child, Node)
 
-        self.__children.append(child)
+        if self._children is None:
+            self._children = [child]
+
+        elif isinstance(self._children, tuple):
+            self._children = list(self._children)
+            self._children.append(child)
+
+        else:
+            self._children.append(child)
+
+    def replace_child(self, old: 'Node', new: 'Node') -> None:
+        assert isinstance(new, Node)
+
+        children = list(self.get_children())
+        children[next(i for i, x in enumerate(children) if x is old)] = new
+
+        self._children = children if isinstance(self._children, list) else tuple(children)
+
+    def freeze(self) -> None:
+        # called once the tree is complete, a tuple is smaller than a list
+        # with room to grow
+        if self._children is not None:
+            self._children = tuple(self._children)
 
     def get_line_number(self) -> int:
-        return self.__line_number
+        return self._line_number
 
     def set_line_number(self, n: int) -> None:
-        self.__line_number = int(n)
+        self._line_number = int(n)
 
     def get_column_number(self) -> int:
-        return self.__column_number
+        return self._column_number
 
     def set_column_number(self, n: int) -> None:
-        self.__column_number = int(n)
+        self._column_number = int(n)
 
     def get_file_name(self) -> str:
-        return self.__filename
+        return self._filename
 
     def set_file_name(self, f: str) -> None:
-        self.__filename = str(f)
+        self._filename = sys.intern(str(f))
 
     def is_leaf(self) -> bool:
-        if len(self.__children) == 0:
+        if not self._children:
             return True
 
         return False
@@ -1,22 +1,30 @@
-import ast.value
-import ast.qualifier
+import devconf.ast.value
+import devconf.ast.qualifier
 
 
 class Qualified(object):
+    # _qualifiers is a slot of the classes using the mixin
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
-        self.__qualifiers = ast.qualifier.TypeQualifierList()
+        # allocated with the first qualifier
+        self._qualifiers: devconf.ast.qualifier.TypeQualifierList or None = None
+
+    def add_qualifier(self, qualifier: devconf.ast.qualifier.TypeQualifier) -> None:
+        assert isinstance(qualifier, devconf.ast.qualifier.TypeQualifier)
 
-    def add_qualifier(self, qualifier: ast.qualifier.TypeQualifier) -> None:
-        assert isinstance(qualifier, ast.qualifier.TypeQualifier)
+        if self._qualifiers is None:
+            self._qualifiers = devconf.ast.qualifier.TypeQualifierList()
 
-        self.__qualifiers.add_qualifier(qualifier)
+        self._qualifiers.add_qualifier(qualifier)
 
-    def set_value(self, value: ast.value.Value) -> None:
-        assert isinstance(value, ast.value.Value)
+    def set_value(self, value: devconf.ast.value.Value) -> None:
+        assert isinstance(value, devconf.ast.value.Value)
 
-        self.__qualifiers.set_value(value)
+        if self._qualifiers is not None:
+            self._qualifiers.set_value(value)
 
         if hasattr(super(), 'set_value'):
             super().set_value(value)
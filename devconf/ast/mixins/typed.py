@@ -1,4 +1,4 @@
-import ast.types
+import devconf.ast.types
 
 
 class UndefinedTypeError(Exception):
@@ -10,48 +10,51 @@ class RedefinedTypeError(Exception):
 
 
 class Typed(object):
+    # _type is a slot of the classes using the mixin
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
-        self.__type = None
+        self._type = None
 
     def __check_type(self, other) -> bool:
-        return self.__type == other
+        return self._type is other or self._type == other
 
     def has_type(self) -> bool:
-        if self.__type is None:
+        if self._type is None:
             return False
 
         return True
 
-    def get_type(self) -> ast.types.Type:
-        if self.__type is None:
+    def get_type(self) -> devconf.ast.types.Type:
+        if self._type is None:
             raise UndefinedTypeError()
 
-        return self.__type
+        return self._type
 
-    def set_type(self, _type: ast.types.Type) -> None:
-        if isinstance(self.__type, ast.types.Type):
+    def set_type(self, _type: devconf.ast.types.Type) -> None:
+        if isinstance(self._type, devconf.ast.types.Type):
             raise RedefinedTypeError()
 
-        if isinstance(_type, ast.types.Type):
-            self.__type = _type
+        if isinstance(_type, devconf.ast.types.Type):
+            self._type = _type
 
         else:
             raise TypeError()
 
     def inherit_type(self, other: 'Typed') -> None:
-        if isinstance(self.__type, ast.types.Type):
+        if isinstance(self._type, devconf.ast.types.Type):
             raise RedefinedTypeError()
 
         if isinstance(other, Typed):
-            self.__type = other.get_type()
+            self._type = other.get_type()
 
         else:
             raise TypeError()
 
     def has_same_type(self, other: 'Typed') -> bool:
-        if self.__type is None:
+        if self._type is None:
             raise UndefinedTypeError()
 
         if isinstance(other, Typed):
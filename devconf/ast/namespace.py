@@ -1,13 +1,17 @@
-import ast.mixins.node
-import ast.mixins.named
+import devconf.ast.mixins.node
+import devconf.ast.mixins.named
 
 
-class Content(ast.mixins.node.Node):
+class Content(devconf.ast.mixins.node.Node):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
 
-class Namespace(ast.mixins.node.Node, ast.mixins.named.Named):
+class Namespace(devconf.ast.mixins.node.Node, devconf.ast.mixins.named.Named):
+    __slots__ = ('_name', '_content')
+
     def __init__(self):
         super().__init__()
 
@@ -1,8 +1,10 @@
-import ast.error
-import ast.mixins.node
+import devconf.ast.error
+import devconf.ast.mixins.node
 
 
-class TypeQualifier(ast.mixins.node.Node):
+class TypeQualifier(devconf.ast.mixins.node.Node):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__()
 
@@ -14,6 +16,8 @@ class TypeQualifier(ast.mixins.node.Node):
 
 
 class TypeQualifierList(object):
+    __slots__ = ('_qualifiers',)
+
     def __init__(self):
         self._qualifiers = []
 
@@ -26,6 +30,8 @@ class TypeQualifierList(object):
 
 
 class ConstQualifier(TypeQualifier):
+    __slots__ = ('_assigned',)
+
     def __init__(self):
         super().__init__()
 
@@ -36,7 +42,7 @@ class ConstQualifier(TypeQualifier):
 
     def set_value(self, value):
         if self._assigned:
-            raise ast.error.ConstAssignmentError(self)
+            raise devconf.ast.error.ConstAssignmentError(self)
 
         self._assigned = True
         return True
@@ -1,13 +1,15 @@
-import ast.value
-import ast.error
+import devconf.ast.value
+import devconf.ast.error
 
-import ast.mixins.node
-import ast.mixins.typed
+import devconf.ast.mixins.node
+import devconf.ast.mixins.typed
 
-import ast.types.groups
+import devconf.ast.types.groups
 
 
-class Range(ast.mixins.node.Node, ast.mixins.typed.Typed):
+class Range(devconf.ast.mixins.node.Node, devconf.ast.mixins.typed.Typed):
+    __slots__ = ('_type', '_end', '_start')
+
     def __init__(self):
         super().__init__()
 
@@ -42,11 +44,11 @@ class Range(ast.mixins.node.Node, ast.mixins.typed.Typed):
 
         return True
 
-    def set_end(self, value: ast.value.Value):
-        assert isinstance(value, ast.value.Value)
+    def set_end(self, value: devconf.ast.value.Value):
+        assert isinstance(value, devconf.ast.value.Value)
 
-        if value.get_type() not in ast.types.groups.numeric:
-            raise ast.error.NonNumericRangeMember(value)
+        if value.get_type() not in devconf.ast.types.groups.numeric:
+            raise devconf.ast.error.NonNumericRangeMember(value)
 
         if self._start is None:
             self.set_type(value.get_type())
@@ -56,14 +58,14 @@ class Range(ast.mixins.node.Node, ast.mixins.typed.Typed):
             self._end = value
 
         else:
-            raise ast.error.IncompatibleTypesError(self, value.get_type(), self.get_type())
+            raise devconf.ast.error.IncompatibleTypesError(self, value.get_type(), self.get_type())
 
     def get_end(self):
         return self._end
 
     def set_start(self, value):
-        if value.get_type() not in ast.types.groups.numeric:
-            raise ast.error.NonNumericRangeMember(value)
+        if value.get_type() not in devconf.ast.types.groups.numeric:
+            raise devconf.ast.error.NonNumericRangeMember(value)
 
         if self._end is None:
             self.set_type(value.get_type())
@@ -73,7 +75,7 @@ class Range(ast.mixins.node.Node, ast.mixins.typed.Typed):
             self._start = value
 
         else:
-            raise ast.error.IncompatibleTypesError(self, value.get_type(), self.get_type())
+            raise devconf.ast.error.IncompatibleTypesError(self, value.get_type(), self.get_type())
 
     def get_start(self):
         return self._start
@@ -1,20 +1,22 @@
-import ast.types
-import ast.error
-import ast.variable
+import devconf.ast.types
+import devconf.ast.error
+import devconf.ast.variable
 
-import ast.mixins.node
-import ast.mixins.named
-import ast.mixins.typed
+import devconf.ast.mixins.node
+import devconf.ast.mixins.named
+import devconf.ast.mixins.typed
 
 
-class Member(ast.mixins.node.Node, ast.mixins.typed.Typed, ast.mixins.named.Named):
+class Member(devconf.ast.mixins.node.Node, devconf.ast.mixins.typed.Typed, devconf.ast.mixins.named.Named):
+    __slots__ = ('_type', '_name', '_description')
+
     def __init__(self):
         super().__init__()
 
-        self._description: ast.variable.VariableDescriptionSet or None = None
+        self._description: devconf.ast.variable.VariableDescriptionSet or None = None
 
-    def set_description(self, description: ast.variable.VariableDescriptionSet):
-        assert isinstance(description, ast.variable.VariableDescriptionSet)
+    def set_description(self, description: devconf.ast.variable.VariableDescriptionSet):
+        assert isinstance(description, devconf.ast.variable.VariableDescriptionSet)
 
         if self.has_type():
             if self.has_same_type(description):
@@ -22,83 +24,163 @@ class Member(ast.mixins.node.Node, ast.mixins.typed.Typed, ast.mixins.named.Name
                 self.add_child(description)
 
             else:
-                raise ast.error.IncompatibleTypesError(self, description.get_type(), self.get_type())
+                raise devconf.ast.error.IncompatibleTypesError(self, description.get_type(), self.get_type())
 
         else:
             self.set_type(description.get_type())
             self._description = description
             self.add_child(description)
 
-    def get_description(self) -> ast.variable.VariableDescriptionSet:
-        assert isinstance(self._description, ast.variable.VariableDescriptionSet)
+    def get_description(self) -> devconf.ast.variable.VariableDescriptionSet:
+        assert isinstance(self._description, devconf.ast.variable.VariableDescriptionSet)
 
         return self._description
 
 
-class MemberList(ast.mixins.node.Node):
+class MemberList(devconf.ast.mixins.node.Node):
+    __slots__ = ('_index',)
+
     def __init__(self):
         super().__init__()
 
+        self._index = {}
+
     def get_members(self) -> list:
         return self.get_children()
 
+    def get_member(self, name: str) -> Member or None:
+        return self._index.get(name)
+
     def add_member(self, member: Member):
+        self._index.setdefault(member.get_name(), member)
         self.add_child(member)
 
 
-class StructInstance(ast.mixins.node.Node, ast.mixins.typed.Typed, ast.mixins.named.Named):
+class StructInstance(devconf.ast.mixins.node.Node, devconf.ast.mixins.typed.Typed, devconf.ast.mixins.named.Named):
+    __slots__ = ('_type', '_name', '_members', '_paths')
+
     def __init__(self):
         super().__init__()
 
+        # members are created on first access; until then the struct's shared
+        # prototype stands in for them
+        self._members = {}
+
+        # tuple of member names -> resolved member, allocated with the first
+        # path resolved from this instance
+        self._paths: dict or None = None
+
     def get_members(self) -> list:
-        return self.get_children()
+        prototypes = self.get_type().get_prototypes()
+
+        return [self._members.get(x.get_name(), x) for x in prototypes]
 
     def add_member_struct(self, struct: 'StructInstance') -> None:
         assert isinstance(struct, StructInstance)
 
+        self._members[struct.get_name()] = struct
         self.add_child(struct)
 
-    def add_member_variable(self, variable: ast.variable.Variable) -> None:
-        assert isinstance(variable, ast.variable.Variable)
+    def add_member_variable(self, variable: devconf.ast.variable.Variable) -> None:
+        assert isinstance(variable, devconf.ast.variable.Variable)
 
+        self._members[variable.get_name()] = variable
         self.add_child(variable)
 
-    def get_member(self, name: str) -> ast.variable.Variable or 'StructInstance':
-        m = next((x for x in self.get_children() if x.get_name() == name), None)
+    def get_member(self, name: str) -> devconf.ast.variable.Variable or 'StructInstance':
+        m = self._members.get(name)
+
+        if m is None:
+            m = self.get_type().create_member(name)
+
+            if m is not None:
+                self._members[name] = m
+                self.add_child(m)
+
+        assert isinstance(m, devconf.ast.variable.Variable) or isinstance(m, StructInstance)
+
+        return m
+
+    def get_member_path(self, path) -> devconf.ast.variable.Variable or 'StructInstance':
+        # resolves a whole dotted path, given as a sequence of member names,
+        # repeated accesses cost a single lookup
+        path = tuple(path)
+
+        if self._paths is None:
+            self._paths = {}
+
+        m = self._paths.get(path)
+
+        if m is None:
+            m = self
+
+            for name in path:
+                assert isinstance(m, StructInstance)
 
-        assert isinstance(m, ast.variable.Variable) or isinstance(m, StructInstance)
+                m = m.get_member(name)
+
+            self._paths[path] = m
 
         return m
 
 
-class Struct(ast.mixins.node.Node, ast.types.Type):
+class Struct(devconf.ast.mixins.node.Node, devconf.ast.types.Type):
+    __slots__ = ('_member_list', '_prototypes')
+
     def __init__(self):
         super().__init__()
 
         self._member_list: MemberList or None = None
+        self._prototypes: list or None = None
 
     def set_members(self, member_list: MemberList):
         assert isinstance(member_list, MemberList)
 
         self._member_list = member_list
+        self._prototypes = None
 
-    def create_instance(self) -> StructInstance:
-        struct = StructInstance()
-        struct.set_type(self)
+    @staticmethod
+    def _create_member(member: Member) -> devconf.ast.variable.Variable or StructInstance:
+        if isinstance(member.get_type(), Struct):
+            m = member.get_type().create_instance()
+            m.set_name(member.get_name())
+        else:
+            m = devconf.ast.variable.Variable()
+            m.set_name(member.get_name())
+            m.set_type(member.get_type())
+            m.set_description(member.get_description())
+
+        return m
+
+    def create_member(self, name: str) -> devconf.ast.variable.Variable or StructInstance or None:
+        if self._member_list is None:
+            return None
+
+        assert isinstance(self._member_list, MemberList)
 
-        if self._member_list is not None:
-            assert isinstance(self._member_list, MemberList)
+        member = self._member_list.get_member(name)
 
-            for member in self._member_list.get_members():
-                if isinstance(member.get_type(), Struct):
-                    m = member.get_type().create_instance()
-                    m.set_name(member.get_name())
-                else:
-                    m = ast.variable.Variable()
-                    m.set_name(member.get_name())
-                    m.set_type(member.get_type())
-                    m.set_description(member.get_description())
+        if member is None:
+            return None
 
-                struct.add_child(m)
+        return self._create_member(member)
+
+    def get_prototypes(self) -> list:
+        # unassigned members of every instance share these; they must not be
+        # modified
+        if self._prototypes is None:
+            if self._member_list is None:
+                self._prototypes = []
+
+            else:
+                assert isinstance(self._member_list, MemberList)
+
+                self._prototypes = [self._create_member(x) for x in self._member_list.get_members()]
+
+        return self._prototypes
+
+    def create_instance(self) -> StructInstance:
+        struct = StructInstance()
+        struct.set_type(self)
 
         return struct
@@ -1,23 +1,59 @@
-import ast.mixins.named
+import threading
 
+import devconf.ast.mixins.named
 
-class Type(ast.mixins.named.Named):
+
+class TypeRegistry(object):
+    # every type name gets a small integer id when it is first seen, types of
+    # the same name share it; shared by all parses, which may run in threads
+    def __init__(self):
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def get_id(self, name: str) -> int:
+        type_id = self._ids.get(name)
+
+        if type_id is None:
+            with self._lock:
+                type_id = self._ids.setdefault(name, len(self._ids))
+
+        return type_id
+
+
+registry = TypeRegistry()
+
+
+class Type(devconf.ast.mixins.named.Named):
     def __init__(self):
         super().__init__()
 
+        self._type_id: int or None = None
+
     def __eq__(self, other: 'Type'):
+        if self is other:
+            return True
+
         if isinstance(other, Type):
-            return self.get_name() == other.get_name()
+            return self._type_id == other._type_id
 
         else:
             return False
 
     def __ne__(self, other: 'Type'):
-        if isinstance(other, Type):
-            return self.get_name() != other.get_name()
+        return not self.__eq__(other)
 
-        else:
-            return True
+    def __hash__(self):
+        return hash(self._type_id)
 
     def __repr__(self):
         return self.get_name()
+
+    def get_type_id(self) -> int:
+        assert isinstance(self._type_id, int)
+
+        return self._type_id
+
+    def set_name(self, name: str) -> None:
+        super().set_name(name)
+
+        self._type_id = registry.get_id(self.get_name())
@@ -1,14 +1,15 @@
-import ast.types
+import devconf.ast.types
 
 
-integer = ast.types.Type()
+# shared by all parses, which only read them
+integer = devconf.ast.types.Type()
 integer.set_name('int')
 
-boolean = ast.types.Type()
+boolean = devconf.ast.types.Type()
 boolean.set_name('bool')
 
-string = ast.types.Type()
+string = devconf.ast.types.Type()
 string.set_name('string')
 
-floating = ast.types.Type()
+floating = devconf.ast.types.Type()
 floating.set_name('float')
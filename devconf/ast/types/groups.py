@@ -1,3 +1,3 @@
-import ast.types.builtin
+import devconf.ast.types.builtin
 
-numeric = [ast.types.builtin.integer, ast.types.builtin.floating]
+numeric = [devconf.ast.types.builtin.integer, devconf.ast.types.builtin.floating]
@@ -1,10 +1,12 @@
-import ast.types
-import ast.types.builtin
+import devconf.ast.types
+import devconf.ast.types.builtin
 
-import ast.mixins.typed
+import devconf.ast.mixins.typed
 
 
-class Value(ast.mixins.typed.Typed):
+class Value(devconf.ast.mixins.typed.Typed):
+    __slots__ = ('_type', '_value')
+
     def __init__(self, _type):
         super().__init__()
 
@@ -14,6 +16,9 @@ class Value(ast.mixins.typed.Typed):
     def __eq__(self, other: 'Value'):
         assert isinstance(other, Value)
 
+        if self is other:
+            return True
+
         if self.get_type() != other.get_type():
             return False
 
@@ -35,9 +40,31 @@ class Value(ast.mixins.typed.Typed):
         self._value = value
 
 
+class ValueCache(object):
+    # Literal values are never modified once set, so equal literals can share
+    # a single value object. Floats are keyed by their exact representation
+    # to keep 0.0 and -0.0 apart.
+    def __init__(self):
+        self._values = {}
+
+    def get(self, cls: type, value) -> Value:
+        key = (cls, value.hex() if isinstance(value, float) else value)
+        v = self._values.get(key)
+
+        if v is None:
+            v = cls()
+            v.set_value(value)
+
+            self._values[key] = v
+
+        return v
+
+
 class FloatValue(Value):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(ast.types.builtin.floating)
+        super().__init__(devconf.ast.types.builtin.floating)
 
     def set_value(self, value):
         v = float(value)
@@ -45,8 +72,10 @@ class FloatValue(Value):
 
 
 class StringValue(Value):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(ast.types.builtin.string)
+        super().__init__(devconf.ast.types.builtin.string)
 
     def set_value(self, value):
         v = str(value)
@@ -54,8 +83,10 @@ class StringValue(Value):
 
 
 class BooleanValue(Value):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(ast.types.builtin.boolean)
+        super().__init__(devconf.ast.types.builtin.boolean)
 
     def set_value(self, value):
         if isinstance(value, bool):
@@ -66,8 +97,10 @@ class BooleanValue(Value):
 
 
 class IntegerValue(Value):
+    __slots__ = ()
+
     def __init__(self):
-        super().__init__(ast.types.builtin.integer)
+        super().__init__(devconf.ast.types.builtin.integer)
 
     def set_value(self, value):
         v = int(value)
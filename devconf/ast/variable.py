@@ -1,16 +1,18 @@
-import ast.map
-import ast.error
-import ast.value
-import ast.filter
-import ast.constant
+import devconf.ast.map
+import devconf.ast.error
+import devconf.ast.value
+import devconf.ast.filter
+import devconf.ast.constant
 
-import ast.mixins.node
-import ast.mixins.typed
-import ast.mixins.named
-import ast.mixins.expression
+import devconf.ast.mixins.node
+import devconf.ast.mixins.typed
+import devconf.ast.mixins.named
+import devconf.ast.mixins.expression
 
 
-class VariableDescriptionSet(ast.mixins.node.Node, ast.mixins.typed.Typed):
+class VariableDescriptionSet(devconf.ast.mixins.node.Node, devconf.ast.mixins.typed.Typed):
+    __slots__ = ('_type', '_deny_filter', '_allow_filter', '_mapping_list', '_constant_list', '_default_value')
+
     def __init__(self):
         super().__init__()
 
@@ -53,13 +55,22 @@ class VariableDescriptionSet(ast.mixins.node.Node, ast.mixins.typed.Typed):
     def has_default_value(self) -> bool:
         return self._default_value is not None
 
-    def get_default_value(self) -> ast.value.Value or None:
+    def get_default_value(self) -> devconf.ast.value.Value or None:
         if self._default_value is not None:
             return self._default_value.get_value()
 
         else:
             return None
 
+    def get_allow_filter(self) -> devconf.ast.filter.Filter or None:
+        return self._allow_filter
+
+    def get_deny_filter(self) -> devconf.ast.filter.Filter or None:
+        return self._deny_filter
+
+    def get_mapping_list(self) -> devconf.ast.map.Map or None:
+        return self._mapping_list
+
     def get_mapped_value(self, key, default):
         if self._mapping_list is not None:
             return self._mapping_list.get_value(key, default)
@@ -75,7 +86,7 @@ class VariableDescriptionSet(ast.mixins.node.Node, ast.mixins.typed.Typed):
 
                 else:
                     args = (self, self.get_type(), deny.get_type())
-                    raise ast.error.IncompatibleTypesError(*args)
+                    raise devconf.ast.error.IncompatibleTypesError(*args)
 
             else:
                 self.set_type(deny.get_type())
@@ -84,7 +95,7 @@ class VariableDescriptionSet(ast.mixins.node.Node, ast.mixins.typed.Typed):
 
         else:
             args = (self, 'deny', self._deny_filter, deny)
-            raise ast.error.DescriptionSetError(*args)
+            raise devconf.ast.error.DescriptionSetError(*args)
 
     def set_allow_filter(self, allow):
         if self._allow_filter is None:
@@ -95,7 +106,7 @@ class VariableDescriptionSet(ast.mixins.node.Node, ast.mixins.typed.Typed):
 
                 else:
                     args = (self, self.get_type(), allow.get_type())
-                    raise ast.error.IncompatibleTypesError(*args)
+                    raise devconf.ast.error.IncompatibleTypesError(*args)
 
             else:
                 self.set_type(allow.get_type())
@@ -104,7 +115,7 @@ class VariableDescriptionSet(ast.mixins.node.Node, ast.mixins.typed.Typed):
 
         else:
             args = (self, 'allow', self._allow_filter, allow)
-            raise ast.error.DescriptionSetError(*args)
+            raise devconf.ast.error.DescriptionSetError(*args)
 
     def set_mapping_list(self, mapping):
         if self._mapping_list is None:
@@ -115,7 +126,7 @@ class VariableDescriptionSet(ast.mixins.node.Node, ast.mixins.typed.Typed):
 
                 else:
                     args = (self, self.get_type(), mapping.get_type())
-                    raise ast.error.IncompatibleTypesError(*args)
+                    raise devconf.ast.error.IncompatibleTypesError(*args)
 
             else:
                 self.set_type(mapping.get_type())
@@ -124,7 +135,7 @@ class VariableDescriptionSet(ast.mixins.node.Node, ast.mixins.typed.Typed):
 
         else:
             args = (self, 'map', self._mapping_list, mapping)
-            raise ast.error.DescriptionSetError(*args)
+            raise devconf.ast.error.DescriptionSetError(*args)
 
     def set_constant_list(self, constants):
         if self._constant_list is None:
@@ -135,7 +146,7 @@ class VariableDescriptionSet(ast.mixins.node.Node, ast.mixins.typed.Typed):
 
                 else:
                     args = (self, self.get_type(), constants.get_type())
-                    raise ast.error.IncompatibleTypesError(*args)
+                    raise devconf.ast.error.IncompatibleTypesError(*args)
 
             else:
                 self.set_type(constants.get_type())
@@ -144,7 +155,7 @@ class VariableDescriptionSet(ast.mixins.node.Node, ast.mixins.typed.Typed):
 
         else:
             args = (self, 'const', self._constant_list, constants)
-            raise ast.error.DescriptionSetError(*args)
+            raise devconf.ast.error.DescriptionSetError(*args)
 
     def set_default_value(self, default):
         if self._default_value is None:
@@ -155,7 +166,7 @@ class VariableDescriptionSet(ast.mixins.node.Node, ast.mixins.typed.Typed):
 
                 else:
                     args = (self, self.get_type(), default.get_type())
-                    raise ast.error.IncompatibleTypesError(*args)
+                    raise devconf.ast.error.IncompatibleTypesError(*args)
 
             else:
                 self.set_type(default.get_type())
@@ -164,10 +175,12 @@ class VariableDescriptionSet(ast.mixins.node.Node, ast.mixins.typed.Typed):
 
         else:
             args = (self, 'default', self._default_value, default)
-            raise ast.error.DescriptionSetError(*args)
+            raise devconf.ast.error.DescriptionSetError(*args)
+
 
+class Variable(devconf.ast.mixins.expression.LValueExpression, devconf.ast.mixins.named.Named):
+    __slots__ = ('_name', '_description')
 
-class Variable(ast.mixins.expression.LValueExpression, ast.mixins.named.Named):
     def __init__(self):
         super().__init__()
 
@@ -180,7 +193,7 @@ class Variable(ast.mixins.expression.LValueExpression, ast.mixins.named.Named):
         else:
             return False
 
-    def get_default(self) -> ast.value.Value or None:
+    def get_default(self) -> devconf.ast.value.Value or None:
         if self._description is not None:
             return self._description.get_default_value()
 
@@ -196,12 +209,15 @@ class Variable(ast.mixins.expression.LValueExpression, ast.mixins.named.Named):
                 super().set_value(value)
 
             else:
-                raise ast.error.IncompatibleTypesError(self, value.get_type(), self.get_type())
+                raise devconf.ast.error.IncompatibleTypesError(self, value.get_type(), self.get_type())
 
         else:
             self.set_type(value.get_type())
             super().set_value(value)
 
+    def get_description(self) -> VariableDescriptionSet or None:
+        return self._description
+
     def set_description(self, description: VariableDescriptionSet):
         assert isinstance(description, VariableDescriptionSet)
 
@@ -211,7 +227,7 @@ class Variable(ast.mixins.expression.LValueExpression, ast.mixins.named.Named):
                 self.add_child(description)
 
             else:
-                raise ast.error.IncompatibleTypesError(self, description.get_type(), self.get_type())
+                raise devconf.ast.error.IncompatibleTypesError(self, description.get_type(), self.get_type())
 
         else:
             self.set_type(description.get_type())
@@ -0,0 +1,464 @@
+"""
+Device Configuration Benchmark.
+
+Compiles synthetic configurations of increasing size and times each phase of
+the compiler separately: lexing, parsing including the construction of the
+symbol table, and generating a header with the macro generator. The results
+are written as JSON, so that runs of different commits can be compared.
+
+Usage:
+    benchmark.py [-r REPEAT] [--seed SEED] [--steps STEPS] [--scale NAME...] [--set PARAM...] [--no-memory]
+                 [--compare BASELINE] [-o OUTPUT]
+    benchmark.py --config [--seed SEED] [--set PARAM...]
+
+Options:
+    -o --output OUTPUT
+        Write the results to OUTPUT as JSON, "-" writes them to standard
+        output. A summary is printed to standard error in any case.
+    -r --repeat REPEAT
+        How often each phase is timed, the fastest run counts [default: 3].
+    --seed SEED
+        The seed of the synthetic configurations [default: 1].
+    --steps STEPS
+        The factors a parameter is scaled by, separated by commas
+        [default: 1,2,4,8].
+    --scale NAME
+        Only scale the parameter NAME, all parameters are scaled in turn if
+        omitted.
+    --set PARAM
+        Change the base value of a parameter, e.g. --set depth=3.
+    --no-memory
+        Do not trace the peak memory of each phase, which takes an extra run
+        of every phase.
+    --compare BASELINE
+        Print the time and memory of each phase relative to the results of an
+        earlier run read from BASELINE.
+    --config
+        Write the synthetic configuration of the base parameters to standard
+        output instead of running the benchmark.
+
+Parameters:
+    namespaces  the number of top level namespaces
+    depth       the nesting depth of each of them, 1 nests no namespaces
+    structs     the number of structures declared per namespace
+    instances   the number of instances of each structure
+    variables   the number of variables declared per namespace
+    filter      the number of entries of the allow filter of each variable
+    map         the number of elements of the map of each variable
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import random
+import hashlib
+import platform
+import tracemalloc
+import subprocess
+import collections
+
+if not __package__:
+    # run as a script: the directory of the package must not be on the path,
+    # its packages would shadow those of the standard library
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+import docopt
+import devconf.generator
+import devconf.parser.parser
+import devconf.parser.scanner
+
+# version of the JSON results, changed whenever their layout changes
+RESULTS_VERSION = 1
+
+PHASES = ('lex', 'parse', 'generate')
+
+Parameters = collections.namedtuple('Parameters', [
+    'namespaces',
+    'depth',
+    'structs',
+    'instances',
+    'variables',
+    'filter',
+    'map',
+])
+
+BASE_PARAMETERS = Parameters(
+    namespaces=4,
+    depth=2,
+    structs=2,
+    instances=4,
+    variables=16,
+    filter=4,
+    map=4,
+)
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class SyntheticConfig(object):
+    # Writes a configuration exercising all parts of the language. The text
+    # depends on nothing but the parameters and the seed, so the same
+    # configuration is compiled by every commit.
+    #
+    # Every variable is assigned from a variable of a namespace declared
+    # before, through its fully qualified name, so that the cost of name
+    # lookups grows with the number and depth of the namespaces. All names
+    # are unique: nested namespaces may not redefine a name of an enclosing
+    # one and namespace names are resolved by their name alone.
+
+    def __init__(self, parameters: Parameters, seed: int = 1):
+        assert isinstance(parameters, Parameters)
+        assert all(isinstance(x, int) and x >= 0 for x in parameters)
+
+        self._parameters = parameters
+        self._random = random.Random(seed)
+        self._variables = []
+        self._lines = []
+
+    def _emit(self, level: int, line: str) -> None:
+        self._lines.append('    ' * level + line + '\n')
+
+    def _allow_filter(self) -> str:
+        # an interval covering all values assigned, then discrete values
+        # beyond it
+        if self._parameters.filter == 0:
+            return ''
+
+        entries = ['[0 .. 999]']
+        entries.extend(str(1000 + 10 * x) for x in range(self._parameters.filter - 1))
+
+        return 'allow { %s }; ' % ', '.join(entries)
+
+    def _map(self) -> str:
+        if self._parameters.map == 0:
+            return ''
+
+        elements = ('%d = %d' % (x, x + 100) for x in range(self._parameters.map))
+
+        return ' map { %s };' % ', '.join(elements)
+
+    def _value(self) -> int:
+        return self._random.randrange(1000)
+
+    def _structure(self, level: int, name: str) -> None:
+        self._emit(level, 'struct %s {' % name)
+        self._emit(level + 1, 'int id { %sdefault = %d; };' % (self._allow_filter(), self._value()))
+        self._emit(level + 1, 'bool enabled { default = false; };')
+        self._emit(level + 1, 'float ratio { default = 0.5; };')
+        self._emit(level + 1, 'string label { default = "%s"; };' % name)
+        self._emit(level, '};')
+
+        for i in range(self._parameters.instances):
+            instance = '%s_%d' % (name, i)
+
+            self._emit(level, 'struct %s %s;' % (name, instance))
+            self._emit(level, '%s.id = %d;' % (instance, self._value()))
+            self._emit(level, '%s.enabled = true;' % instance)
+            self._emit(level, '%s.label = "%s \\"%d\\"";' % (instance, instance, i))
+
+    def _namespace_content(self, level: int, path: tuple) -> list:
+        prefix = path[-1]
+
+        for i in range(self._parameters.structs):
+            self._structure(level, 's_%s_%d' % (prefix, i))
+
+        declared = []
+
+        for i in range(self._parameters.variables):
+            name = 'v_%s_%d' % (prefix, i)
+            description = '%sdefault = %d;%s' % (self._allow_filter(), self._value(), self._map())
+
+            self._emit(level, 'int %s { %s const { LOW = 0, HIGH = 999 }; };' % (name, description))
+
+            if self._variables and i % 2 == 0:
+                self._emit(level, '%s = %s;' % (name, self._random.choice(self._variables)))
+
+            elif i % 4 == 1:
+                self._emit(level, '%s = %s::HIGH;' % (name, name))
+
+            else:
+                self._emit(level, '%s = %d;' % (name, self._value()))
+
+            declared.append('::' + '::'.join(path + (name,)))
+
+        # the variables of a namespace become visible to the namespaces
+        # following it only
+        return declared
+
+    def _namespace(self, level: int, path: tuple, depth: int) -> None:
+        self._emit(level, 'namespace %s {' % path[-1])
+
+        declared = self._namespace_content(level + 1, path)
+
+        if depth > 1:
+            self._namespace(level + 1, path + ('%s_n%d' % (path[0], len(path)),), depth - 1)
+
+        self._emit(level, '}')
+
+        self._variables.extend(declared)
+
+    def text(self) -> str:
+        if not self._lines:
+            self._emit(0, '#line 1 "synthetic.dc"')
+
+            for i in range(self._parameters.namespaces):
+                self._namespace(0, ('ns%d' % i,), max(1, self._parameters.depth))
+
+        return ''.join(self._lines)
+
+
+def parse_parameters(assignments: list, base: Parameters = BASE_PARAMETERS) -> Parameters:
+    values = base._asdict()
+
+    for x in assignments:
+        name, sep, value = x.partition('=')
+
+        if not sep or name not in values:
+            raise BenchmarkError('Expected one of %s followed by "=" and a number, got "%s".' %
+                                 (', '.join(values), x))
+
+        try:
+            values[name] = int(value)
+
+        except ValueError:
+            raise BenchmarkError('The parameter %s must be a number, got "%s".' % (name, value))
+
+        if values[name] < 0:
+            raise BenchmarkError('The parameter %s must not be negative.' % name)
+
+    return Parameters(**values)
+
+
+def scale(base: Parameters, names: list, steps: list) -> list:
+    # one series per parameter, each scaling that parameter by all steps
+    series = []
+
+    for name in names:
+        for step in steps:
+            series.append(('%s x%d' % (name, step), base._replace(**{name: getattr(base, name) * step})))
+
+    return series
+
+
+def _phases(document: bytes) -> dict:
+    # each phase gets the input it needs prepared beforehand, so that only
+    # the phase itself is measured; the parse includes the scanner
+    p = devconf.parser.parser.Parser('synthetic.dc', scanner=True)
+    syntax_tree, symbol_table = p.parse(document, tracking=True)
+
+    def lex():
+        for _ in devconf.parser.scanner.Scanner().scan(document):
+            pass
+
+    def parse():
+        p.parse(document, tracking=True)
+
+    def generate():
+        with open(os.devnull, 'wt') as file:
+            devconf.generator.MacroGenerator(syntax_tree, symbol_table).write(file)
+
+    return {'lex': lex, 'parse': parse, 'generate': generate}
+
+
+def _time(f, repeat: int) -> list:
+    runs = []
+
+    for _ in range(repeat):
+        gc.collect()
+
+        start = time.perf_counter()
+        f()
+        runs.append(time.perf_counter() - start)
+
+    return runs
+
+
+def _peak_memory(f) -> int:
+    gc.collect()
+
+    tracemalloc.start()
+
+    try:
+        f()
+
+        return tracemalloc.get_traced_memory()[1]
+
+    finally:
+        tracemalloc.stop()
+
+
+def run(name: str, parameters: Parameters, seed: int = 1, repeat: int = 3, memory: bool = True) -> dict:
+    text = SyntheticConfig(parameters, seed).text()
+    document = text.encode('utf-8')
+
+    phases = _phases(document)
+    tokens = sum(1 for _ in devconf.parser.scanner.Scanner().scan(document))
+
+    result = {
+        'name': name,
+        'parameters': parameters._asdict(),
+        'bytes': len(document),
+        'lines': text.count('\n'),
+        'tokens': tokens,
+        # identifies the input, results of different inputs are not compared
+        'digest': hashlib.sha256(document).hexdigest(),
+        'phases': {},
+    }
+
+    for phase in PHASES:
+        runs = _time(phases[phase], repeat)
+
+        result['phases'][phase] = {
+            'seconds': min(runs),
+            'runs': runs,
+            'peak_bytes': _peak_memory(phases[phase]) if memory else None,
+        }
+
+    return result
+
+
+def get_commit() -> str or None:
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    try:
+        output = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=directory, capture_output=True, text=True)
+
+    except OSError:
+        return None
+
+    if output.returncode != 0:
+        return None
+
+    return output.stdout.strip() or None
+
+
+def get_environment() -> dict:
+    return {
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+    }
+
+
+def format_result(result: dict) -> str:
+    phases = []
+
+    for phase in PHASES:
+        timing = result['phases'][phase]
+        text = '%s %.3fs' % (phase, timing['seconds'])
+
+        if timing['peak_bytes'] is not None:
+            text += ' %.1f MB' % (timing['peak_bytes'] / 1e6)
+
+        phases.append(text)
+
+    return '%-16s %9d bytes  %s' % (result['name'], result['bytes'], '  '.join(phases))
+
+
+def compare(results: list, baseline: dict) -> list:
+    # ratios of the phases of results present in both runs with the same input
+    previous = {x['name']: x for x in baseline.get('results', ())}
+    lines = []
+
+    for result in results:
+        old = previous.get(result['name'])
+
+        if old is None:
+            lines.append('%-16s not in the baseline' % result['name'])
+            continue
+
+        if old['digest'] != result['digest']:
+            lines.append('%-16s input differs from the baseline' % result['name'])
+            continue
+
+        ratios = []
+
+        for phase in PHASES:
+            new_timing = result['phases'][phase]
+            old_timing = old['phases'][phase]
+
+            text = '%s %.2fx' % (phase, new_timing['seconds'] / max(old_timing['seconds'], 1e-9))
+
+            if new_timing['peak_bytes'] is not None and old_timing['peak_bytes']:
+                text += ' mem %.2fx' % (new_timing['peak_bytes'] / old_timing['peak_bytes'])
+
+            ratios.append(text)
+
+        lines.append('%-16s %s' % (result['name'], '  '.join(ratios)))
+
+    return lines
+
+
+def main(args) -> int:
+    try:
+        base = parse_parameters(args['--set'])
+        seed = int(args['--seed'])
+
+        if args['--config']:
+            sys.stdout.write(SyntheticConfig(base, seed).text())
+
+            return 0
+
+        repeat = int(args['--repeat'])
+        steps = [int(x) for x in args['--steps'].split(',')]
+        names = args['--scale'] or list(Parameters._fields)
+
+        if repeat < 1 or any(x < 1 for x in steps):
+            raise BenchmarkError('The number of runs and the steps must be positive.')
+
+        unknown = [x for x in names if x not in Parameters._fields]
+
+        if unknown:
+            raise BenchmarkError('Unknown parameters: %s.' % ', '.join(unknown))
+
+        baseline = None
+
+        if args['--compare'] is not None:
+            with open(args['--compare'], 'rt') as file:
+                baseline = json.load(file)
+
+    except (BenchmarkError, OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+
+        return 2
+
+    results = []
+
+    for name, parameters in scale(base, names, steps):
+        result = run(name, parameters, seed, repeat, not args['--no-memory'])
+        results.append(result)
+
+        print(format_result(result), file=sys.stderr)
+
+    document = {
+        'version': RESULTS_VERSION,
+        'environment': get_environment(),
+        'seed': seed,
+        'repeat': repeat,
+        'results': results,
+    }
+
+    if baseline is not None:
+        for line in compare(results, baseline):
+            print(line, file=sys.stderr)
+
+    if args['--output'] == '-':
+        json.dump(document, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+    elif args['--output'] is not None:
+        with open(args['--output'], 'wt') as file:
+            json.dump(document, file, indent=2)
+            file.write('\n')
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main(docopt.docopt(__doc__)))
@@ -0,0 +1,62 @@
+import os
+import shutil
+import hashlib
+
+import devconf.files
+
+
+class CompileCache(object):
+    def __init__(self, directory: str, version: str):
+        self._directory = str(directory)
+        self._version = str(version)
+
+        os.makedirs(self._directory, exist_ok=True)
+
+    def get_directory(self) -> str:
+        return self._directory
+
+    def key(self, document, options: tuple) -> str:
+        # anything that changes the output must be part of the key: the
+        # compiler version, the generator and its settings and the input
+        digest = hashlib.sha256()
+        digest.update(self._version.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(repr(options).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(document)
+
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, key[:2], key)
+
+    def load(self, key: str, filename: str) -> list or None:
+        # copies a cached output to filename and returns the source files the
+        # output was compiled from, None on a cache miss
+        path = self._path(key)
+
+        try:
+            with open(path + '.deps', 'rt') as deps:
+                dependencies = deps.read().splitlines()
+
+            source = open(path, 'rb')
+
+        except FileNotFoundError:
+            return None
+
+        with source, devconf.files.replace_if_changed(filename, 'wb') as target:
+            shutil.copyfileobj(source, target)
+
+        return dependencies
+
+    def store(self, key: str, filename: str, dependencies: list) -> None:
+        path = self._path(key)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # the output goes last, an entry is complete once it exists
+        with devconf.files.replace_if_changed(path + '.deps', 'wt') as deps:
+            deps.write(''.join('%s\n' % x for x in dependencies))
+
+        with open(filename, 'rb') as source, devconf.files.replace_if_changed(path, 'wb') as target:
+            shutil.copyfileobj(source, target)
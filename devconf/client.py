@@ -0,0 +1,89 @@
+"""
+Device Configuration Client.
+
+Usage:
+    client.py [--socket SOCKET] ARGS...
+
+Runs devconf with ARGS on the server started by devconf.py --serve SOCKET,
+which saves starting the interpreter, importing the compiler and building the
+parser for every configuration. If no server is listening, devconf runs in
+this process instead. Reading the configuration from standard input always
+runs in this process.
+
+The socket defaults to the value of DEVCONF_SOCKET and else to devconf-UID.sock
+in XDG_RUNTIME_DIR or the temporary directory. This script only imports the
+standard library, argument errors are reported by devconf.
+"""
+
+import os
+import sys
+import runpy
+
+if not __package__:
+    # run as a script: the directory of the package must not be on the path,
+    # its packages would shadow those of the standard library
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+import devconf.server
+
+SOCKET_VARIABLE = 'DEVCONF_SOCKET'
+
+# options whose value may be "-" without meaning standard input
+STDOUT_OPTIONS = ('-o', '--output', '--stats-json')
+
+
+def reads_stdin(argv: list) -> bool:
+    previous = None
+
+    for x in argv:
+        if x == '-' and previous not in STDOUT_OPTIONS:
+            return True
+
+        previous = x
+
+    return False
+
+
+def run_locally(argv: list) -> int:
+    sys.argv = ['devconf'] + argv
+
+    try:
+        runpy.run_module('devconf', run_name='__main__', alter_sys=True)
+
+    except SystemExit as e:
+        if isinstance(e.code, str):
+            print(e.code, file=sys.stderr)
+
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+
+    return 0
+
+
+def main(argv: list) -> int:
+    path = os.environ.get(SOCKET_VARIABLE) or devconf.server.get_default_socket()
+
+    if argv[:1] == ['--socket'] and len(argv) > 1:
+        path = argv[1]
+        argv = argv[2:]
+
+    elif argv[:1] and argv[0].startswith('--socket='):
+        path = argv[0].partition('=')[2]
+        argv = argv[1:]
+
+    if reads_stdin(argv):
+        return run_locally(argv)
+
+    try:
+        status, stdout, stderr = devconf.server.request(path, argv, os.getcwd())
+
+    except (devconf.server.ServerError, OSError):
+        return run_locally(argv)
+
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+
+    return status
+
+
+if __name__ == '__main__':
+    exit(main(sys.argv[1:]))
@@ -0,0 +1,322 @@
+import io
+import os
+import re
+import sys
+import mmap
+import shlex
+import functools
+import importlib
+import contextlib
+import concurrent.futures
+
+import devconf
+import devconf.files
+import devconf.cache
+
+# The parser, which loads PLY and the whole syntax tree, and the generators
+# are imported when they are first needed, so that a compilation served from
+# the cache never loads them.
+
+# generator classes of the formats, by module and class name
+GENERATORS = {
+    'macro': ('devconf.generator', 'MacroGenerator'),
+    'blob': ('devconf.generator', 'BlobGenerator'),
+    'lookup': ('devconf.generator', 'LookupGenerator'),
+}
+
+DEFAULT_FORMAT = 'macro'
+
+
+class CompileError(Exception):
+    pass
+
+
+class BatchError(CompileError):
+    pass
+
+
+def get_generator(name: str) -> type:
+    if name not in GENERATORS:
+        raise CompileError('Unknown format "%s", expected one of: %s.' % (name, ', '.join(GENERATORS)))
+
+    module, class_name = GENERATORS[name]
+
+    return getattr(importlib.import_module(module), class_name)
+
+
+def check_prefix(prefix: str or None) -> None:
+    # the prefix starts C identifiers
+    if prefix is not None and re.fullmatch(r'[_a-zA-Z][_a-zA-Z0-9]*', prefix) is None:
+        raise CompileError('The prefix "%s" is not a C identifier.' % prefix)
+
+
+def get_generator_options(generator_class: type, prefix: str or None = None) -> tuple:
+    # settings of the generator that affect its output, part of the cache key
+    prefix = generator_class.PREFIX if prefix is None else prefix
+
+    return generator_class.__name__, prefix, generator_class.SEPARATOR
+
+
+def create_parser(filename: str = '') -> 'devconf.parser.parser.Parser':
+    import devconf.parser.parser
+
+    return devconf.parser.parser.Parser(filename, scanner=True)
+
+
+class DeviceConfiguration(object):
+    STDIN = '-'
+    STDOUT = '-'
+    DEPFILE_SUFFIX = '.d'
+
+    def __init__(self, infile: str, outfile: str, depfile: str or None = None, imagefile: str or None = None,
+                 generator_class: type or None = None, prefix: str or None = None):
+        check_prefix(prefix)
+
+        # a dependency file names its output, standard output has no name
+        if depfile is not None and str(outfile) == self.STDOUT:
+            raise CompileError('A dependency file needs an output file, not standard output.')
+
+        self._infile = str(infile)
+        self._outfile = str(outfile)
+        self._depfile = depfile
+        self._imagefile = imagefile
+        self._generator_class = generator_class or get_generator(DEFAULT_FORMAT)
+        self._prefix = prefix
+
+    def _write_depfile(self, source_files: list) -> None:
+        dependencies = {}
+
+        if self._infile != self.STDIN:
+            dependencies[self._infile] = None
+
+        for x in source_files:
+            # skip pseudo files of the preprocessor such as <built-in>
+            if not (x.startswith('<') and x.endswith('>')):
+                dependencies.setdefault(x, None)
+
+        devconf.files.write_depfile(self._depfile, self._outfile, list(dependencies))
+
+    def _write_image(self, symbol_table) -> None:
+        import devconf.image
+
+        with devconf.files.replace_if_changed(self._imagefile, 'wb') as imagefile:
+            devconf.image.write(symbol_table, imagefile)
+
+    @contextlib.contextmanager
+    def _open(self):
+        # the document is never read as a whole: files are mapped into memory
+        # and standard input is scanned in chunks
+        if self._infile == self.STDIN:
+            yield sys.stdin.buffer
+            return
+
+        with open(self._infile, 'rb') as file:
+            try:
+                document = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            except ValueError:
+                # empty files cannot be mapped
+                document = None
+
+            if document is None:
+                yield b''
+
+            else:
+                with document:
+                    yield document
+
+    def compile(self, p: 'devconf.parser.parser.Parser' or None = None,
+                compile_cache: devconf.cache.CompileCache or None = None) -> None:
+        key = None
+
+        with self._open() as document:
+            # standard input is not cached, hashing it would require reading
+            # all of it before parsing, and neither is standard output; an
+            # image needs the symbol table of an actual parse
+            if compile_cache is not None and self.STDIN not in (self._infile, self._outfile) and self._imagefile is None:
+                key = compile_cache.key(document, get_generator_options(self._generator_class, self._prefix))
+
+                source_files = compile_cache.load(key, self._outfile)
+
+                if source_files is not None:
+                    if self._depfile is not None:
+                        self._write_depfile(source_files)
+
+                    return
+
+            if p is None:
+                p = create_parser(self._infile)
+
+            context = p.create_context(self._infile)
+            syntax_tree, symbol_table = p.parse(document, context=context, tracking=True)
+            source_files = context.get_source_files()
+
+        gen = self._generator_class(syntax_tree, symbol_table, self._prefix)
+        gen.generate(self._outfile)
+
+        if self._imagefile is not None:
+            self._write_image(symbol_table)
+
+        if self._depfile is not None:
+            self._write_depfile(source_files)
+
+        if key is not None:
+            compile_cache.store(key, self._outfile, source_files)
+
+    def measure(self, statistics: 'devconf.stats.Statistics') -> None:
+        # compiles like compile() without a cache, each phase on its own
+        import devconf.parser.scanner
+
+        p = create_parser(self._infile)
+        context = p.create_context(self._infile)
+
+        with statistics.run(), statistics.instrument():
+            with statistics.phase('read'):
+                with self._open() as document:
+                    document = document if isinstance(document, bytes) else document.read()
+
+            with statistics.phase('lex'):
+                statistics.count_tokens(devconf.parser.scanner.Scanner().scan(document))
+
+            with statistics.phase('parse'):
+                syntax_tree, symbol_table = p.parse(document, context=context, tracking=True)
+
+            with statistics.phase('generate'):
+                gen = self._generator_class(syntax_tree, symbol_table, self._prefix)
+                gen.generate(self._outfile)
+
+            if self._imagefile is not None:
+                with statistics.phase('image'):
+                    self._write_image(symbol_table)
+
+        if self._depfile is not None:
+            self._write_depfile(context.get_source_files())
+
+
+def compile_text(text: str or bytes, filename: str = '', generator_class: type or None = None,
+                 p: 'devconf.parser.parser.Parser' or None = None, prefix: str or None = None) -> str:
+    # the header compiled from text, which is neither read from nor written
+    # to a file
+    check_prefix(prefix)
+
+    if p is None:
+        p = create_parser(filename)
+
+    syntax_tree, symbol_table = p.parse(text, filename=filename, tracking=True)
+
+    output = io.StringIO()
+    (generator_class or get_generator(DEFAULT_FORMAT))(syntax_tree, symbol_table, prefix).write(output)
+
+    return output.getvalue()
+
+
+# parser, cache and generator of a batch worker, kept across all jobs the
+# worker runs
+_worker_parser: 'devconf.parser.parser.Parser' or None = None
+_worker_cache: devconf.cache.CompileCache or None = None
+_worker_generator: type or None = None
+_worker_prefix: str or None = None
+
+
+def init_worker(cache_dir: str or None = None, generator_class: type or None = None,
+                prefix: str or None = None) -> None:
+    global _worker_parser
+    global _worker_cache
+    global _worker_generator
+    global _worker_prefix
+
+    _worker_parser = create_parser()
+    _worker_cache = open_cache(cache_dir)
+    _worker_generator = generator_class
+    _worker_prefix = prefix
+
+
+def get_worker_parser() -> 'devconf.parser.parser.Parser' or None:
+    # the parser of this process if it is a worker
+    return _worker_parser
+
+
+def _run_job(job: tuple, p: 'devconf.parser.parser.Parser', compile_cache: devconf.cache.CompileCache or None,
+             generator_class: type or None, prefix: str or None) -> tuple:
+    infile, outfile, depfile = job
+
+    try:
+        config = DeviceConfiguration(infile, outfile, depfile, generator_class=generator_class, prefix=prefix)
+        config.compile(p, compile_cache)
+
+    except Exception as e:
+        return infile, outfile, '%s: %s' % (type(e).__name__, e)
+
+    return infile, outfile, None
+
+
+def _compile_job(job: tuple) -> tuple:
+    return _run_job(job, _worker_parser, _worker_cache, _worker_generator, _worker_prefix)
+
+
+def open_cache(directory: str or None) -> devconf.cache.CompileCache or None:
+    if directory is None:
+        return None
+
+    return devconf.cache.CompileCache(directory, devconf.DEVCONF_VERSION_STRING)
+
+
+def parse_pair(pair: str) -> tuple:
+    infile, sep, outfile = pair.partition('=')
+
+    if not sep or not infile or not outfile:
+        raise BatchError('Expected INPUT=OUTPUT, got "%s".' % pair)
+
+    return infile, outfile
+
+
+def read_manifest(filename: str) -> list:
+    jobs = []
+
+    with open(filename, 'rt') as file:
+        for n, line in enumerate(file, 1):
+            fields = shlex.split(line, comments=True)
+
+            if not fields:
+                continue
+
+            if len(fields) != 2:
+                raise BatchError('%s, line %d: expected an input and an output file.' % (filename, n))
+
+            jobs.append(tuple(fields))
+
+    return jobs
+
+
+def get_depfile(outfile: str, enabled: bool) -> str or None:
+    return outfile + DeviceConfiguration.DEPFILE_SUFFIX if enabled else None
+
+
+def compile_batch(jobs: list, workers: int or None = None, cache_dir: str or None = None, depfiles: bool = False,
+                  generator_class: type or None = None, threads: bool = False, prefix: str or None = None):
+    # yields the input, output and error, None on success, of every job in
+    # the order of jobs as the jobs complete
+    check_prefix(prefix)
+
+    jobs = [(infile, outfile, get_depfile(outfile, depfiles)) for infile, outfile in jobs]
+
+    if workers == 1:
+        init_worker(cache_dir, generator_class, prefix)
+
+        yield from map(_compile_job, jobs)
+
+    elif threads:
+        # parses share nothing but the parser's tables, so a single parser
+        # and cache serve all threads; the threads only compile in parallel
+        # on a free-threaded interpreter
+        run = functools.partial(_run_job, p=create_parser(), compile_cache=open_cache(cache_dir),
+                                generator_class=generator_class, prefix=prefix)
+
+        with concurrent.futures.ThreadPoolExecutor(workers or os.cpu_count()) as executor:
+            yield from executor.map(run, jobs)
+
+    else:
+        initargs = (cache_dir, generator_class, prefix)
+
+        with concurrent.futures.ProcessPoolExecutor(workers, initializer=init_worker, initargs=initargs) as executor:
+            yield from executor.map(_compile_job, jobs)
@@ -0,0 +1,39 @@
+import os
+import filecmp
+import contextlib
+
+
+@contextlib.contextmanager
+def replace_if_changed(filename: str, mode: str = 'wt'):
+    # Output goes to a temporary file next to the target, which then replaces
+    # the target in one step. An existing target with identical content is
+    # left alone, so its modification time only changes with its content.
+    temp = '%s.%s.tmp' % (filename, os.urandom(4).hex())
+
+    try:
+        with open(temp, mode.replace('w', 'x')) as file:
+            yield file
+
+        if os.path.isfile(filename) and filecmp.cmp(temp, filename, shallow=False):
+            os.remove(temp)
+
+        else:
+            os.replace(temp, filename)
+
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+        raise
+
+
+def _escape_make(path: str) -> str:
+    return path.replace('$', '$$').replace('#', '\\#').replace(' ', '\\ ')
+
+
+def write_depfile(filename: str, target: str, dependencies: list) -> None:
+    # a Make rule without recipe, which Ninja understands as well
+    deps = ''.join(' \\\n  %s' % _escape_make(x) for x in dependencies)
+
+    with replace_if_changed(filename) as depfile:
+        depfile.write('%s:%s\n' % (_escape_make(target), deps))
@@ -1,107 +1,399 @@
+import re
+import sys
+import struct
+import itertools
 import collections
 
-import ast.struct
-import ast.variable
-import ast.constant
+import devconf.ast.struct
+import devconf.ast.variable
+import devconf.ast.constant
 
-import ast.mixins.node
+import devconf.ast.mixins.node
 
-import symbols.table
+import devconf.symbols.table
+
+import devconf.files
+import devconf.image
+import devconf.visitor
+
+import devconf.generator.perfect_hash
 
 
 class BaseGenerator(object):
-    def __init__(self, syntax_tree: ast.mixins.node.Node, symbol_table: symbols.table.SymbolTable):
+    STDOUT = '-'
+
+    def __init__(self, syntax_tree: devconf.ast.mixins.node.Node, symbol_table: devconf.symbols.table.SymbolTable):
         super().__init__()
 
         self._syntax_tree = syntax_tree
         self._symbol_table = symbol_table
 
-    def get_syntax_tree(self) -> ast.mixins.node.Node:
-        assert isinstance(self._syntax_tree, ast.mixins.node.Node)
+    def get_syntax_tree(self) -> devconf.ast.mixins.node.Node:
+        assert isinstance(self._syntax_tree, devconf.ast.mixins.node.Node)
 
         return self._syntax_tree
 
-    def get_symbol_table(self) -> symbols.table.SymbolTable:
-        assert isinstance(self._symbol_table, symbols.table.SymbolTable)
+    def get_symbol_table(self) -> devconf.symbols.table.SymbolTable or devconf.image.SymbolTable:
+        assert isinstance(self._symbol_table, (devconf.symbols.table.SymbolTable, devconf.image.SymbolTable))
 
         return self._symbol_table
 
-    def generate(self, filename: str) -> None:
+    def write(self, outfile) -> None:
         pass
 
+    def generate(self, filename: str) -> None:
+        # '-' writes to standard output, anything else replaces the file only
+        # if the output differs from its content
+        if filename == self.STDOUT:
+            self.write(sys.stdout)
+
+        else:
+            with devconf.files.replace_if_changed(filename) as outfile:
+                self.write(outfile)
+
 
 TableElement = collections.namedtuple('TableElement', ['name', 'value'])
 
 
-class MacroGenerator(BaseGenerator):
+class MacroGenerator(BaseGenerator, devconf.symbols.table.NamespaceVisitor):
+    PREFIX = 'DC'
     SEPARATOR = '_'
 
-    def __init__(self, syntax_tree: ast.mixins.node.Node, symbol_table: symbols.table.SymbolTable):
+    # number of macros joined into a single write
+    CHUNK_SIZE = 4096
+
+    def __init__(self, syntax_tree: devconf.ast.mixins.node.Node, symbol_table: devconf.symbols.table.SymbolTable,
+                 prefix: str or None = None):
         super().__init__(syntax_tree, symbol_table)
 
-    def _handle_constant(self, constant: ast.constant.Constant, path: str, table: list) -> None:
-        assert isinstance(constant, ast.constant.Constant)
-        assert isinstance(path, str)
-        assert isinstance(table, list)
+        # the prefix of all names, distinct prefixes let the headers of
+        # several configurations be included together
+        self._prefix = self.PREFIX if prefix is None else str(prefix)
+
+        # macro names are upper case, prefixes are converted once per scope
+        self._value_suffix = (self.SEPARATOR + 'value').upper()
+        self._prefixes = []
+
+    def get_prefix(self) -> str:
+        return self._prefix
+
+    def get_guard(self, kind: str) -> str:
+        # the include guard of a header defining more than macros
+        return '%s_CONFIG_%s_H_INCLUDED' % (self._prefix.upper(), kind.upper())
+
+    def _child_prefix(self, prefix: str, name: str) -> str:
+        return prefix + (name + self.SEPARATOR).upper()
+
+    @devconf.visitor.children(devconf.ast.mixins.node.Node)
+    def _no_children(self, node: devconf.ast.mixins.node.Node) -> None:
+        # only namespaces and struct instances contribute nested macros
+        return None
+
+    @devconf.visitor.children(devconf.ast.struct.StructInstance, devconf.image.StructInstance)
+    def _struct_children(self, struct: devconf.ast.struct.StructInstance) -> list:
+        return struct.get_members()
+
+    @devconf.visitor.children(devconf.image.Namespace)
+    def _image_namespace_children(self, namespace: devconf.image.Namespace) -> list:
+        return namespace.get_members() + namespace.get_namespaces()
+
+    @devconf.visitor.enter(devconf.symbols.table.Namespace, devconf.image.Namespace)
+    def _enter_namespace(self, namespace: devconf.symbols.table.Namespace) -> None:
+        if namespace.get_parent() is None:
+            self._prefixes.append((self._prefix + self.SEPARATOR).upper())
+
+        else:
+            self._prefixes.append(self._child_prefix(self._prefixes[-1], namespace.get_name()))
+
+    @devconf.visitor.enter(devconf.ast.struct.StructInstance, devconf.image.StructInstance)
+    def _enter_structure(self, struct: devconf.ast.struct.StructInstance) -> None:
+        self._prefixes.append(self._child_prefix(self._prefixes[-1], struct.get_name()))
+
+    @devconf.visitor.leave(devconf.symbols.table.Namespace, devconf.ast.struct.StructInstance,
+                           devconf.image.Namespace, devconf.image.StructInstance)
+    def _leave_scope(self, scope) -> None:
+        self._prefixes.pop()
+
+    @devconf.visitor.enter(devconf.ast.constant.Constant, devconf.image.Constant)
+    def _handle_constant(self, constant: devconf.ast.constant.Constant) -> tuple:
+        assert isinstance(constant, (devconf.ast.constant.Constant, devconf.image.Constant))
 
-        p = path
-        s = self.SEPARATOR
-        n = constant.get_name()
         v = constant.get_value()
 
-        table.append(TableElement('%s%s%s' % (p, s, n), v.get_value()))
+        return TableElement(self._prefixes[-1] + constant.get_name().upper(), v.get_value()),
 
-    def _handle_variable(self, variable: ast.variable.Variable, path: str, table: list) -> None:
-        assert isinstance(variable, ast.variable.Variable)
-        assert isinstance(path, str)
-        assert isinstance(table, list)
+    @devconf.visitor.enter(devconf.ast.variable.Variable, devconf.image.Variable)
+    def _handle_variable(self, variable: devconf.ast.variable.Variable) -> tuple:
+        assert isinstance(variable, (devconf.ast.variable.Variable, devconf.image.Variable))
 
-        p = path
-        s = self.SEPARATOR
-        n = variable.get_name()
+        n = self._prefixes[-1] + variable.get_name().upper()
         v = variable.get_value()
         m = variable.get_mapped_value(v, v)
 
-        table.append(TableElement('%s%s%s%s%s' % (p, s, n, s, 'value'), v.get_value()))
-        table.append(TableElement('%s%s%s' % (p, s, n), m.get_value()))
+        return TableElement(n + self._value_suffix, v.get_value()), TableElement(n, m.get_value())
 
-    def _iterate_structure(self, struct: ast.struct.StructInstance, path: str, table: list):
-        for m in struct.get_members():
-            if isinstance(m, ast.variable.Variable):
-                self._handle_variable(m, path, table)
+    def iterate(self):
+        # yields a TableElement per macro, one at a time
+        self._prefixes = []
 
-            elif isinstance(m, ast.struct.StructInstance):
-                struct_path = '%s%s%s' % (path, self.SEPARATOR, m.get_name())
-                self._iterate_structure(m, struct_path, table)
+        return self.walk(self.get_symbol_table().get_root())
 
-    def _iterate_namespace(self, root, path, table):
-        for m in root.get_members():
-            if isinstance(m, ast.variable.Variable):
-                self._handle_variable(m, path, table)
+    def lines(self):
+        for entry in self.iterate():
+            yield '#define %s %s\n' % entry
 
-            elif isinstance(m, ast.constant.Constant):
-                self._handle_constant(m, path, table)
+    def write(self, outfile) -> None:
+        outfile.write('\n')
 
-            elif isinstance(m, ast.struct.StructInstance):
-                struct_path = '%s%s%s' % (path, self.SEPARATOR, m.get_name())
-                self._iterate_structure(m, struct_path, table)
+        lines = self.lines()
 
-    def _iterate_namespaces(self, root, path, table):
-        self._iterate_namespace(root, path, table)
+        while True:
+            chunk = ''.join(itertools.islice(lines, self.CHUNK_SIZE))
 
-        for n in root.get_namespaces():
-            namespace_path = '%s%s%s' % (path, self.SEPARATOR, n.get_name())
-            self._iterate_namespaces(n, namespace_path, table)
+            if not chunk:
+                break
 
-    def generate(self, filename: str) -> None:
-        tab = []
-        path = 'DC'
-        root = self.get_symbol_table().get_root()
+            outfile.write(chunk)
+
+
+class BlobGenerator(MacroGenerator):
+    # Packs every value into a single static const table, the fields of which
+    # are named by an enumeration of their offsets; include/ucapi/config.h
+    # has the accessors. Fields are ordered by alignment, so no padding is
+    # needed, and strings are stored NUL terminated behind the fields.
+    # Numbers are packed little endian and floating point values as 64 bit
+    # doubles whatever the target, so the header refuses targets differing
+    # in either.
+    BYTE_ORDER = '<'
+
+    # bytes per line of the table's initializer
+    LINE_WIDTH = 16
+
+    # escapes of the string literals which do not stand for themselves
+    ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0', 'a': '\a', 'b': '\b', 'f': '\f', 'v': '\v'}
+
+    STRING_DESCRIPTOR = 'II'
+
+    def get_blob_name(self) -> str:
+        return '%s_config' % self._prefix.lower()
+
+    def _unescape(self, text: str) -> bytes:
+        # string values keep their quotes and escapes as written
+        text = re.sub(r'\\(.)', lambda m: self.ESCAPES.get(m.group(1), m.group(1)), text[1:-1])
+
+        return text.encode('utf-8')
+
+    def _get_format(self, value) -> str:
+        if isinstance(value, bool):
+            return '?'
+
+        if isinstance(value, int):
+            return 'q'
+
+        if isinstance(value, float):
+            return 'd'
+
+        if isinstance(value, str):
+            return self.STRING_DESCRIPTOR
+
+        raise TypeError('Cannot store a value of type %s.' % type(value).__name__)
+
+    def layout(self) -> tuple:
+        # returns the offset of every field, in declaration order, and the
+        # packed content of the table
+        entries = list(self.iterate())
+        formats = [self._get_format(x.value) for x in entries]
+        sizes = [struct.calcsize(self.BYTE_ORDER + x) for x in formats]
+
+        # the largest field size is the alignment of its group: 8 for
+        # numbers, 4 for string descriptors and 1 for booleans
+        alignments = [struct.calcsize(self.BYTE_ORDER + x[0]) for x in formats]
+        order = sorted(range(len(entries)), key=lambda i: -alignments[i])
+
+        offsets = [0] * len(entries)
+        size = 0
+
+        for i in order:
+            offsets[i] = size
+            size += sizes[i]
+
+        data = bytearray(size)
+        strings = {}
+
+        for i, entry in enumerate(entries):
+            value = entry.value
+
+            if formats[i] == self.STRING_DESCRIPTOR:
+                text = self._unescape(value)
+                offset = strings.get(text)
+
+                if offset is None:
+                    offset = len(data)
+                    data += text + b'\0'
+
+                    strings[text] = offset
+
+                value = (offset, len(text))
+
+            else:
+                value = (value,)
+
+            struct.pack_into(self.BYTE_ORDER + formats[i], data, offsets[i], *value)
+
+        return [(x.name, offsets[i]) for i, x in enumerate(entries)], bytes(data)
+
+    def lines(self):
+        fields, data = self.layout()
+        name = self.get_blob_name()
+        guard = self.get_guard('blob')
 
-        self._iterate_namespaces(root, path, tab)
+        yield '#ifndef %s\n' % guard
+        yield '#define %s\n' % guard
+        yield '\n'
+        yield '#include <ucapi/config.h>\n'
+        yield '\n'
+        yield '#if defined(__BYTE_ORDER__) && __BYTE_ORDER__ != __ORDER_LITTLE_ENDIAN__\n'
+        yield '#error "%s is packed little endian"\n' % name
+        yield '#endif\n'
+        yield '\n'
+        yield '#if DBL_MANT_DIG != 53 || DBL_MAX_EXP != 1024\n'
+        yield '#error "%s stores floating point values as 64 bit doubles"\n' % name
+        yield '#endif\n'
+        yield '\n'
+        yield 'enum %s_field\n' % name
+        yield '{\n'
 
-        with open(filename, 'wt') as outfile:
-            outfile.write('\n')
+        for field, offset in fields:
+            yield '    %s = %d,\n' % (field, offset)
 
-            for entry in tab:
-                outfile.write('#define %s %s\n' % (entry.name.upper(), str(entry.value)))
+        yield '};\n'
+        yield '\n'
+        yield 'static const union\n'
+        yield '{\n'
+        yield '    uint64_t align;\n'
+        yield '    unsigned char bytes[%d];\n' % max(len(data), 1)
+        yield '} %s = { .bytes = {\n' % name
+
+        for i in range(0, len(data), self.LINE_WIDTH):
+            yield '    %s,\n' % ', '.join('0x%02x' % x for x in data[i:i + self.LINE_WIDTH])
+
+        yield '} };\n'
+        yield '\n'
+        yield '#endif\n'
+
+
+class LookupGenerator(MacroGenerator):
+    # Emits a table of every macro name and its value as a string together
+    # with a minimal perfect hash over the names, so a name is found by
+    # hashing it once and comparing it with a single entry.
+
+    # entries per line of the tables' initializers
+    LINE_WIDTH = 8
+
+    # the type of the entries, declared by include/ucapi/config.h so that it
+    # is shared by the tables of all configurations
+    ENTRY = 'ucapi_config_lookup_entry'
+
+    def get_table_name(self) -> str:
+        return '%s_lookup' % self._prefix.lower()
+
+    @staticmethod
+    def _c_string(text: str) -> str:
+        chars = []
+
+        for c in text.encode('utf-8'):
+            if c in b'"\\':
+                chars.append('\\' + chr(c))
+
+            elif 32 <= c < 127:
+                chars.append(chr(c))
+
+            else:
+                chars.append('\\%03o' % c)
+
+        return '"%s"' % ''.join(chars)
+
+    def lines(self):
+        entries = list(self.iterate())
+        table = devconf.generator.perfect_hash.build([x.name for x in entries])
+
+        ordered = [None] * len(entries)
+
+        for entry, slot in zip(entries, table.slots):
+            ordered[slot] = entry
+
+        name = self.get_table_name()
+        guard = self.get_guard('lookup')
+        size = max(1, len(entries))
+        buckets = len(table.displacements)
+
+        yield '#ifndef %s\n' % guard
+        yield '#define %s\n' % guard
+        yield '\n'
+        yield '#include <ucapi/config.h>\n'
+        yield '\n'
+        yield 'static const struct %s %s_entries[%d] = {\n' % (self.ENTRY, name, size)
+
+        for entry in ordered:
+            yield '    { %s, %s },\n' % (self._c_string(entry.name), self._c_string(str(entry.value)))
+
+        if not ordered:
+            yield '    { NULL, NULL },\n'
+
+        yield '};\n'
+        yield '\n'
+        yield 'static const int32_t %s_displacements[%d] = {\n' % (name, buckets)
+
+        for i in range(0, buckets, self.LINE_WIDTH):
+            yield '    %s,\n' % ', '.join(str(x) for x in table.displacements[i:i + self.LINE_WIDTH])
+
+        yield '};\n'
+        yield '\n'
+        yield 'static inline uint64_t %s_hash(const char* name)\n' % name
+        yield '{\n'
+        yield '    uint64_t h = UINT64_C(0x%016x) ^ UINT64_C(%d);\n' % (devconf.generator.perfect_hash.FNV_OFFSET,
+                                                                     table.salt)
+        yield '\n'
+        yield '    for (; *name != \'\\0\'; ++name)\n'
+        yield '    {\n'
+        yield '        h ^= (unsigned char)*name;\n'
+        yield '        h *= UINT64_C(0x%x);\n' % devconf.generator.perfect_hash.FNV_PRIME
+        yield '    }\n'
+        yield '\n'
+        yield '    return h;\n'
+        yield '}\n'
+        yield '\n'
+        yield 'static inline uint32_t %s_mix(uint32_t x)\n' % name
+        yield '{\n'
+        yield '    x ^= x >> 16;\n'
+        yield '    x *= UINT32_C(0x85ebca6b);\n'
+        yield '    x ^= x >> 13;\n'
+        yield '    x *= UINT32_C(0xc2b2ae35);\n'
+        yield '    x ^= x >> 16;\n'
+        yield '\n'
+        yield '    return x;\n'
+        yield '}\n'
+        yield '\n'
+        yield '/* Returns the entry of the macro called name, NULL if there is none. */\n'
+        yield 'static inline const struct %s* %s(const char* name)\n' % (self.ENTRY, name)
+        yield '{\n'
+        yield '    uint64_t h = %s_hash(name);\n' % name
+        yield '    int32_t d = %s_displacements[(uint32_t)(h >> 32) %% %du];\n' % (name, buckets)
+        yield '    uint32_t i;\n'
+        yield '    const struct %s* entry;\n' % self.ENTRY
+        yield '\n'
+        yield '    if (d < 0)\n'
+        yield '        i = (uint32_t)(-(d + 1));\n'
+        yield '    else\n'
+        golden = devconf.generator.perfect_hash.GOLDEN
+        yield '        i = %s_mix((uint32_t)h ^ ((uint32_t)d * UINT32_C(0x%x))) %% %du;\n' % (name, golden, size)
+        yield '\n'
+        yield '    entry = &%s_entries[i];\n' % name
+        yield '\n'
+        yield '    if (entry->name == NULL || strcmp(entry->name, name) != 0)\n'
+        yield '        return NULL;\n'
+        yield '\n'
+        yield '    return entry;\n'
+        yield '}\n'
+        yield '\n'
+        yield '#endif\n'
@@ -0,0 +1,138 @@
+import collections
+
+# Minimal perfect hashing by hash and displace. Every key is hashed once with
+# 64 bit FNV-1a. The upper half picks a bucket, the lower half is mixed with
+# the bucket's displacement to pick a slot. Buckets are placed largest first,
+# each trying displacements until all its keys land on free slots; buckets
+# of a single key take one of the slots left over directly, which is stored
+# as a negative displacement. The C code emitted by the lookup generator
+# implements the same functions.
+
+FNV_OFFSET = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+
+GOLDEN = 0x9e3779b9
+
+MASK32 = (1 << 32) - 1
+MASK64 = (1 << 64) - 1
+
+# average number of keys per bucket, more keys per bucket make the table of
+# displacements smaller and its construction slower
+KEYS_PER_BUCKET = 2
+
+# displacements tried per bucket before starting over with another salt
+MAX_DISPLACEMENT = 1 << 16
+
+PerfectHash = collections.namedtuple('PerfectHash', ['salt', 'displacements', 'slots'])
+
+
+class PerfectHashError(Exception):
+    pass
+
+
+def fnv1a(data: bytes, salt: int) -> int:
+    h = FNV_OFFSET ^ salt
+
+    for c in data:
+        h = ((h ^ c) * FNV_PRIME) & MASK64
+
+    return h
+
+
+def mix(x: int) -> int:
+    # the finalizer of MurmurHash3
+    x ^= x >> 16
+    x = (x * 0x85ebca6b) & MASK32
+    x ^= x >> 13
+    x = (x * 0xc2b2ae35) & MASK32
+    x ^= x >> 16
+
+    return x
+
+
+def get_slot(h: int, displacement: int, size: int) -> int:
+    if displacement < 0:
+        return -displacement - 1
+
+    return mix((h & MASK32) ^ ((displacement * GOLDEN) & MASK32)) % size
+
+
+def _place(hashes: list, buckets: int) -> tuple or None:
+    size = len(hashes)
+
+    members = [[] for _ in range(buckets)]
+
+    for i, h in enumerate(hashes):
+        members[(h >> 32) % buckets].append(i)
+
+    order = sorted(range(buckets), key=lambda b: -len(members[b]))
+
+    taken = bytearray(size)
+    displacements = [0] * buckets
+    slots = [0] * size
+    singles = []
+
+    for b in order:
+        keys = members[b]
+
+        if len(keys) < 2:
+            if keys:
+                singles.append(b)
+
+            continue
+
+        lows = [hashes[i] & MASK32 for i in keys]
+
+        for d in range(1, MAX_DISPLACEMENT):
+            m = (d * GOLDEN) & MASK32
+            candidates = [mix(x ^ m) % size for x in lows]
+
+            if not any(taken[x] for x in candidates) and len(set(candidates)) == len(candidates):
+                break
+
+        else:
+            return None
+
+        for i, x in zip(keys, candidates):
+            taken[x] = 1
+            slots[i] = x
+
+        displacements[b] = d
+
+    free = [x for x in range(size) if not taken[x]]
+
+    for b in singles:
+        x = free.pop()
+
+        displacements[b] = -x - 1
+        slots[members[b][0]] = x
+
+    return displacements, slots
+
+
+def build(keys: list, max_salt: int = 64) -> PerfectHash:
+    # slots[i] is the slot of keys[i], slots are a permutation of the indices
+    # of keys
+    data = [x.encode('utf-8') for x in keys]
+
+    if len(set(data)) != len(data):
+        raise PerfectHashError('The keys are not unique.')
+
+    buckets = max(1, len(data) // KEYS_PER_BUCKET)
+
+    for salt in range(max_salt):
+        hashes = [fnv1a(x, salt) for x in data]
+        placed = _place(hashes, buckets)
+
+        if placed is not None:
+            return PerfectHash(salt, *placed)
+
+    raise PerfectHashError('No perfect hash found for %d keys.' % len(data))
+
+
+def lookup(table: PerfectHash, key: str) -> int:
+    # the slot key would be stored in, a slot of another key if it is unknown
+    h = fnv1a(key.encode('utf-8'), table.salt)
+    d = table.displacements[(h >> 32) % len(table.displacements)]
+
+    return get_slot(h, d, max(1, len(table.slots)))
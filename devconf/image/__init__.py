@@ -0,0 +1,836 @@
+import io
+import sys
+import math
+import mmap
+import array
+import bisect
+import struct
+import contextlib
+
+import devconf.ast.map
+import devconf.ast.value
+import devconf.ast.types
+import devconf.ast.filter
+import devconf.ast.struct
+import devconf.ast.variable
+import devconf.ast.constant
+
+import devconf.ast.types.builtin
+
+import devconf.ast.mixins.node
+
+import devconf.symbols.table
+
+import devconf.visitor
+
+# A compiled configuration image is a flat, little-endian file: a header, a
+# table of sections and the sections themselves. Records refer to each other
+# by index, names are indices into the string table and lists of indices live
+# in the shared LINKS section. Everything can be read in place from a mapped
+# file, nothing is decoded before it is used.
+
+MAGIC = b'DCIMAGE\0'
+VERSION = 1
+
+# index of an absent record
+NONE = 0xFFFFFFFF
+
+HEADER = struct.Struct('<8sII')
+SECTION = struct.Struct('<II')
+
+# offset and length of the UTF-8 encoded string in STRING_DATA
+STRING = struct.Struct('<II')
+
+# name, kind
+TYPE = struct.Struct('<II')
+
+# kind, payload
+VALUE = struct.Struct('<I8s')
+
+# name, parent, first member link, member count, first namespace link,
+# namespace count
+NAMESPACE = struct.Struct('<IIIIII')
+
+# kind, name, type, value, description, first member link, member count
+SYMBOL = struct.Struct('<IIIIIII')
+
+# allow filter, deny filter, map, default value
+DESCRIPTION = struct.Struct('<IIII')
+
+# type, first value link, value count, first interval link, interval count;
+# an interval is a pair of links to its bounds, NONE for an open bound
+FILTER = struct.Struct('<IIIII')
+
+# first entry link, entry count; an entry is a pair of links to key and value
+MAP = struct.Struct('<II')
+
+LINK = struct.Struct('<I')
+INT64 = struct.Struct('<q')
+FLOAT64 = struct.Struct('<d')
+
+SECTIONS = ('strings', 'string_data', 'types', 'values', 'namespaces', 'symbols', 'descriptions', 'filters', 'maps', 'links')
+
+TYPE_BUILTIN = 0
+TYPE_STRUCT = 1
+
+VALUE_INTEGER = 0
+VALUE_BIG_INTEGER = 1
+VALUE_FLOAT = 2
+VALUE_BOOLEAN = 3
+VALUE_STRING = 4
+
+SYMBOL_VARIABLE = 0
+SYMBOL_CONSTANT = 1
+SYMBOL_STRUCT_INSTANCE = 2
+SYMBOL_MEMBER = 3
+SYMBOL_STRUCT = 4
+
+BUILTIN_TYPES = {x.get_name(): x for x in (
+    devconf.ast.types.builtin.integer,
+    devconf.ast.types.builtin.boolean,
+    devconf.ast.types.builtin.string,
+    devconf.ast.types.builtin.floating,
+)}
+
+VALUE_CLASSES = {
+    VALUE_INTEGER: devconf.ast.value.IntegerValue,
+    VALUE_BIG_INTEGER: devconf.ast.value.IntegerValue,
+    VALUE_FLOAT: devconf.ast.value.FloatValue,
+    VALUE_BOOLEAN: devconf.ast.value.BooleanValue,
+    VALUE_STRING: devconf.ast.value.StringValue,
+}
+
+
+class ImageError(Exception):
+    pass
+
+
+class _Writer(devconf.symbols.table.NamespaceVisitor):
+    def __init__(self):
+        super().__init__()
+
+        self._strings = {}
+        self._types = {}
+        self._values = {}
+        self._descriptions = {}
+        self._filters = {}
+        self._maps = {}
+
+        self._sections = {x: [] for x in SECTIONS if x != 'string_data'}
+        self._string_data = bytearray()
+        self._links = array.array('I')
+
+        # member and namespace lists of the scopes being visited
+        self._scopes = []
+
+    def _add_string(self, s: str) -> int:
+        i = self._strings.get(s)
+
+        if i is None:
+            data = s.encode('utf-8')
+
+            i = len(self._sections['strings'])
+            self._sections['strings'].append(STRING.pack(len(self._string_data), len(data)))
+            self._string_data += data
+
+            self._strings[s] = i
+
+        return i
+
+    def _add_links(self, indices) -> tuple:
+        first = len(self._links)
+        self._links.extend(indices)
+
+        return first, len(self._links) - first
+
+    def _add_type(self, t: devconf.ast.types.Type) -> int:
+        i = self._types.get(t)
+
+        if i is None:
+            kind = TYPE_STRUCT if isinstance(t, devconf.ast.struct.Struct) else TYPE_BUILTIN
+
+            i = len(self._sections['types'])
+            self._sections['types'].append(TYPE.pack(self._add_string(t.get_name()), kind))
+
+            self._types[t] = i
+
+        return i
+
+    def _add_raw_value(self, value) -> int:
+        if value is None:
+            return NONE
+
+        key = (type(value), value.hex() if isinstance(value, float) else value)
+        i = self._values.get(key)
+
+        if i is None:
+            if isinstance(value, bool):
+                record = VALUE.pack(VALUE_BOOLEAN, INT64.pack(value))
+
+            elif isinstance(value, int) and -(1 << 63) <= value < (1 << 63):
+                record = VALUE.pack(VALUE_INTEGER, INT64.pack(value))
+
+            elif isinstance(value, int):
+                record = VALUE.pack(VALUE_BIG_INTEGER, INT64.pack(self._add_string(str(value))))
+
+            elif isinstance(value, float):
+                record = VALUE.pack(VALUE_FLOAT, FLOAT64.pack(value))
+
+            elif isinstance(value, str):
+                record = VALUE.pack(VALUE_STRING, INT64.pack(self._add_string(value)))
+
+            else:
+                raise ImageError('Cannot store a value of type %s.' % type(value).__name__)
+
+            i = len(self._sections['values'])
+            self._sections['values'].append(record)
+
+            self._values[key] = i
+
+        return i
+
+    def _add_value(self, value: devconf.ast.value.Value or None) -> int:
+        return self._add_raw_value(None if value is None else value.get_value())
+
+    def _add_filter(self, f: devconf.ast.filter.Filter or None) -> int:
+        if f is None or f.get_predicate_list() is None:
+            return NONE
+
+        i = self._filters.get(id(f))
+
+        if i is None:
+            predicates = f.get_predicate_list()
+
+            values = [self._add_raw_value(x) for x in predicates.get_discrete_values()]
+            bounds = []
+
+            for start, end in predicates.get_intervals():
+                bounds.append(NONE if start == -math.inf else self._add_raw_value(start))
+                bounds.append(NONE if end == math.inf else self._add_raw_value(end))
+
+            t = self._add_type(predicates.get_type())
+            values_first, values_count = self._add_links(values)
+            bounds_first, bounds_count = self._add_links(bounds)
+
+            i = len(self._sections['filters'])
+            self._sections['filters'].append(FILTER.pack(t, values_first, values_count, bounds_first, bounds_count // 2))
+
+            self._filters[id(f)] = i
+
+        return i
+
+    def _add_map(self, m: devconf.ast.map.Map or None) -> int:
+        if m is None:
+            return NONE
+
+        i = self._maps.get(id(m))
+
+        if i is None:
+            entries = []
+
+            for entry in m.get_children():
+                entries.append(self._add_value(entry.get_key().get_value()))
+                entries.append(self._add_value(entry.get_value().get_value()))
+
+            first, count = self._add_links(entries)
+
+            i = len(self._sections['maps'])
+            self._sections['maps'].append(MAP.pack(first, count // 2))
+
+            self._maps[id(m)] = i
+
+        return i
+
+    def _add_description(self, description: devconf.ast.variable.VariableDescriptionSet or None) -> int:
+        if description is None:
+            return NONE
+
+        # members of the instances of a struct share their description
+        i = self._descriptions.get(id(description))
+
+        if i is None:
+            allow = self._add_filter(description.get_allow_filter())
+            deny = self._add_filter(description.get_deny_filter())
+            mapping = self._add_map(description.get_mapping_list())
+            default = self._add_value(description.get_default_value())
+
+            i = len(self._sections['descriptions'])
+            self._sections['descriptions'].append(DESCRIPTION.pack(allow, deny, mapping, default))
+
+            self._descriptions[id(description)] = i
+
+        return i
+
+    def _add_symbol(self, kind: int, symbol, value: int = NONE, description: int = NONE, members: tuple = (0, 0)) -> int:
+        if isinstance(symbol, devconf.ast.types.Type):
+            # a struct declaration is its own type
+            t = self._add_type(symbol)
+
+        elif symbol.has_type():
+            t = self._add_type(symbol.get_type())
+
+        else:
+            t = NONE
+
+        i = len(self._sections['symbols'])
+        self._sections['symbols'].append(SYMBOL.pack(kind, self._add_string(symbol.get_name()), t, value, description, *members))
+
+        self._scopes[-1][0].append(i)
+
+        return i
+
+    @devconf.visitor.children(devconf.ast.mixins.node.Node)
+    def _no_children(self, node: devconf.ast.mixins.node.Node) -> None:
+        return None
+
+    @devconf.visitor.children(devconf.ast.struct.StructInstance)
+    def _struct_children(self, struct: devconf.ast.struct.StructInstance) -> list:
+        return struct.get_members()
+
+    @devconf.visitor.enter(devconf.symbols.table.Namespace)
+    def _enter_namespace(self, namespace: devconf.symbols.table.Namespace) -> None:
+        namespaces = self._sections['namespaces']
+
+        if self._scopes:
+            self._scopes[-1][1].append(len(namespaces))
+
+        self._scopes.append(([], [], len(namespaces)))
+
+        # completed once the members are known
+        namespaces.append(None)
+
+    @devconf.visitor.leave(devconf.symbols.table.Namespace)
+    def _leave_namespace(self, namespace: devconf.symbols.table.Namespace) -> None:
+        members, namespaces, i = self._scopes.pop()
+
+        parent = NONE if not self._scopes else self._scopes[-1][2]
+        name = self._add_string(namespace.get_name())
+
+        record = (name, parent) + self._add_links(members) + self._add_links(namespaces)
+        self._sections['namespaces'][i] = NAMESPACE.pack(*record)
+
+    @devconf.visitor.enter(devconf.ast.variable.Variable)
+    def _enter_variable(self, variable: devconf.ast.variable.Variable) -> None:
+        value = self._add_value(variable.get_value()) if variable.has_value() else NONE
+        description = self._add_description(variable.get_description())
+
+        self._add_symbol(SYMBOL_VARIABLE, variable, value, description)
+
+    @devconf.visitor.enter(devconf.ast.constant.Constant)
+    def _enter_constant(self, constant: devconf.ast.constant.Constant) -> None:
+        self._add_symbol(SYMBOL_CONSTANT, constant, self._add_value(constant.get_value()))
+
+    @devconf.visitor.enter(devconf.ast.struct.Member)
+    def _enter_member(self, member: devconf.ast.struct.Member) -> None:
+        self._add_symbol(SYMBOL_MEMBER, member)
+
+    @devconf.visitor.enter(devconf.ast.struct.Struct)
+    def _enter_struct(self, struct: devconf.ast.struct.Struct) -> None:
+        self._add_symbol(SYMBOL_STRUCT, struct)
+
+    @devconf.visitor.enter(devconf.ast.struct.StructInstance)
+    def _enter_structure(self, struct: devconf.ast.struct.StructInstance) -> None:
+        self._scopes.append(([], [], NONE))
+
+    @devconf.visitor.leave(devconf.ast.struct.StructInstance)
+    def _leave_structure(self, struct: devconf.ast.struct.StructInstance) -> None:
+        members, _, _ = self._scopes.pop()
+
+        self._add_symbol(SYMBOL_STRUCT_INSTANCE, struct, members=self._add_links(members))
+
+    def write(self, symbol_table: devconf.symbols.table.SymbolTable, outfile) -> None:
+        self.visit(symbol_table.get_root())
+
+        links = array.array('I', self._links)
+
+        if sys.byteorder != 'little':
+            links.byteswap()
+
+        sections = dict(self._sections)
+        sections['string_data'] = [bytes(self._string_data)]
+        sections['links'] = [links.tobytes()]
+
+        offset = HEADER.size + SECTION.size * len(SECTIONS)
+        table = []
+
+        for name in SECTIONS:
+            data = b''.join(sections[name])
+
+            if name == 'string_data':
+                count = len(data)
+
+            elif name == 'links':
+                count = len(self._links)
+
+            else:
+                count = len(sections[name])
+
+            table.append((offset, count, data))
+            offset += len(data)
+
+        outfile.write(HEADER.pack(MAGIC, VERSION, len(SECTIONS)))
+
+        for offset, count, _ in table:
+            outfile.write(SECTION.pack(offset, count))
+
+        for _, _, data in table:
+            outfile.write(data)
+
+
+def write(symbol_table: devconf.symbols.table.SymbolTable, outfile) -> None:
+    _Writer().write(symbol_table, outfile)
+
+
+def dumps(symbol_table: devconf.symbols.table.SymbolTable) -> bytes:
+    buffer = io.BytesIO()
+    write(symbol_table, buffer)
+
+    return buffer.getvalue()
+
+
+class Filter(object):
+    def __init__(self, image: 'SymbolTable', record: tuple):
+        t, first, count, interval_first, interval_count = record
+
+        self._type = image.get_type(t)
+        self._values = {image.get_value(x).get_value() for x in image.get_links(first, count)}
+
+        bounds = image.get_links(interval_first, 2 * interval_count)
+        self._starts = [-math.inf if x == NONE else image.get_value(x).get_value() for x in bounds[0::2]]
+        self._ends = [math.inf if x == NONE else image.get_value(x).get_value() for x in bounds[1::2]]
+
+    def __contains__(self, other: devconf.ast.value.Value) -> bool:
+        value = other.get_value()
+
+        if value in self._values and other.get_type() == self._type:
+            return True
+
+        i = bisect.bisect_right(self._starts, value) - 1
+
+        return i >= 0 and value <= self._ends[i]
+
+
+class Map(object):
+    def __init__(self, image: 'SymbolTable', record: tuple):
+        first, count = record
+        links = image.get_links(first, 2 * count)
+
+        # underlying key value -> (key, value)
+        self._index = {}
+
+        for k, v in zip(links[0::2], links[1::2]):
+            key = image.get_value(k)
+            self._index[key.get_value()] = (key, image.get_value(v))
+
+    def get_value(self, key: devconf.ast.value.Value, default):
+        x = self._index.get(key.get_value())
+
+        if x is not None and x[0] == key:
+            return x[1]
+
+        return default
+
+
+class Description(object):
+    def __init__(self, image: 'SymbolTable', record: tuple):
+        allow, deny, mapping, default = record
+
+        self._allow_filter = None if allow == NONE else Filter(image, image.get_record(FILTER, 'filters', allow))
+        self._deny_filter = None if deny == NONE else Filter(image, image.get_record(FILTER, 'filters', deny))
+        self._mapping_list = None if mapping == NONE else Map(image, image.get_record(MAP, 'maps', mapping))
+        self._default_value = None if default == NONE else image.get_value(default)
+
+    def check_value(self, value: devconf.ast.value.Value) -> bool:
+        if self._allow_filter is not None:
+            if value not in self._allow_filter:
+                return False
+
+        if self._deny_filter is not None:
+            if value in self._deny_filter:
+                return False
+
+        return True
+
+    def has_default_value(self) -> bool:
+        return self._default_value is not None
+
+    def get_default_value(self) -> devconf.ast.value.Value or None:
+        return self._default_value
+
+    def get_mapped_value(self, key: devconf.ast.value.Value, default):
+        if self._mapping_list is not None:
+            return self._mapping_list.get_value(key, default)
+
+        return default
+
+
+class Symbol(object):
+    def __init__(self, image: 'SymbolTable', record: tuple):
+        self._image = image
+        self._record = record
+
+    def __str__(self):
+        return '%s(%s)' % (type(self).__name__.lower(), self.get_name())
+
+    def get_name(self) -> str:
+        return self._image.get_string(self._record[1])
+
+    def has_type(self) -> bool:
+        return self._record[2] != NONE
+
+    def get_type(self) -> devconf.ast.types.Type:
+        assert self.has_type()
+
+        return self._image.get_type(self._record[2])
+
+
+class Variable(Symbol):
+    def has_value(self) -> bool:
+        return self._record[3] != NONE
+
+    def get_value(self) -> devconf.ast.value.Value:
+        assert self.has_value()
+
+        return self._image.get_value(self._record[3])
+
+    def get_description(self) -> Description or None:
+        return self._image.get_description(self._record[4])
+
+    def has_default(self) -> bool:
+        description = self.get_description()
+
+        return description is not None and description.has_default_value()
+
+    def get_default(self) -> devconf.ast.value.Value or None:
+        description = self.get_description()
+
+        if description is not None:
+            return description.get_default_value()
+
+        return None
+
+    def check_value(self, value: devconf.ast.value.Value) -> bool:
+        # whether the filters of the variable admit value
+        description = self.get_description()
+
+        if description is not None:
+            return description.check_value(value)
+
+        return True
+
+    def get_mapped_value(self, key: devconf.ast.value.Value, default):
+        description = self.get_description()
+
+        if description is not None:
+            return description.get_mapped_value(key, default)
+
+        return default
+
+
+class Constant(Symbol):
+    def get_value(self) -> devconf.ast.value.Value:
+        return self._image.get_value(self._record[3])
+
+
+class StructInstance(Symbol):
+    def __init__(self, image: 'SymbolTable', record: tuple):
+        super().__init__(image, record)
+
+        # name -> symbol index, built on the first lookup
+        self._names: dict or None = None
+
+    def get_members(self) -> list:
+        return [self._image.get_symbol_at(x) for x in self._image.get_links(self._record[5], self._record[6])]
+
+    def get_member(self, name: str) -> Variable or 'StructInstance' or None:
+        if self._names is None:
+            links = self._image.get_links(self._record[5], self._record[6])
+            self._names = {self._image.get_symbol_name(x): x for x in links}
+
+        i = self._names.get(name)
+
+        if i is None:
+            return None
+
+        return self._image.get_symbol_at(i)
+
+
+SYMBOL_CLASSES = {
+    SYMBOL_VARIABLE: Variable,
+    SYMBOL_CONSTANT: Constant,
+    SYMBOL_STRUCT_INSTANCE: StructInstance,
+    SYMBOL_MEMBER: Symbol,
+    SYMBOL_STRUCT: Symbol,
+}
+
+
+class Namespace(object):
+    def __init__(self, image: 'SymbolTable', index: int, record: tuple):
+        self._image = image
+        self._index = index
+        self._record = record
+
+        # name -> symbol index, built on the first lookup
+        self._names: dict or None = None
+
+        # member name -> child namespaces declaring a member of that name,
+        # built on the first lookup
+        self._containing: dict or None = None
+
+    def __str__(self):
+        members = ', '.join((x.get_name() for x in self.get_members()))
+        return 'Namespace[%s]{%s' % (self.get_name(), members)
+
+    def __contains__(self, name: str):
+        return name in self._get_names()
+
+    def _get_names(self) -> dict:
+        if self._names is None:
+            links = self._image.get_links(self._record[2], self._record[3])
+            self._names = {self._image.get_symbol_name(x): x for x in links}
+
+        return self._names
+
+    def get_name(self, *args) -> str:
+        return self._image.get_string(self._record[0])
+
+    def get_serial(self) -> int:
+        # namespaces are written in the order they were created
+        return self._index
+
+    def get_parent(self) -> 'Namespace' or None:
+        return self._image.get_namespace(self._record[1])
+
+    def get_members(self) -> list:
+        return [self._image.get_symbol_at(x) for x in self._image.get_links(self._record[2], self._record[3])]
+
+    def get_namespaces(self) -> list:
+        return [self._image.get_namespace(x) for x in self._image.get_links(self._record[4], self._record[5])]
+
+    def get_namespaces_containing(self, name: str) -> set:
+        if self._containing is None:
+            self._containing = {}
+
+            for x in self.get_namespaces():
+                for member in x._get_names():
+                    self._containing.setdefault(member, set()).add(x)
+
+        return self._containing.get(name, set())
+
+    def get_symbol(self, name: str) -> Symbol:
+        namespace = self
+
+        while namespace is not None:
+            i = namespace._get_names().get(name)
+
+            if i is not None:
+                return self._image.get_symbol_at(i)
+
+            namespace = namespace.get_parent()
+
+        raise devconf.symbols.table.UndefinedNameError()
+
+
+class SymbolTable(object):
+    # A read-only symbol table on top of an image. Records are decoded when
+    # they are first used and then kept.
+    def __init__(self, buffer):
+        self._buffer = memoryview(buffer)
+
+        if len(self._buffer) < HEADER.size:
+            raise ImageError('Not a configuration image.')
+
+        magic, version, count = HEADER.unpack_from(self._buffer, 0)
+
+        if magic != MAGIC:
+            raise ImageError('Not a configuration image.')
+
+        if version != VERSION or count != len(SECTIONS):
+            raise ImageError('Unsupported image version %d.' % version)
+
+        self._sections = {}
+
+        for n, name in enumerate(SECTIONS):
+            self._sections[name] = SECTION.unpack_from(self._buffer, HEADER.size + n * SECTION.size)
+
+        self._strings = {}
+        self._types = {}
+        self._values = {}
+        self._descriptions = {}
+        self._namespaces = {}
+        self._symbols = {}
+
+        # namespace name -> earliest written namespace carrying that name,
+        # built on the first lookup
+        self._named: dict or None = None
+
+    def close(self) -> None:
+        self._buffer.release()
+
+    def get_record(self, record: struct.Struct, section: str, i: int) -> tuple:
+        offset, count = self._sections[section]
+
+        if not 0 <= i < count:
+            raise ImageError('No record %d in section %s.' % (i, section))
+
+        return record.unpack_from(self._buffer, offset + i * record.size)
+
+    def get_links(self, first: int, count: int) -> list:
+        offset, _ = self._sections['links']
+        start = offset + first * LINK.size
+
+        return list(struct.unpack_from('<%dI' % count, self._buffer, start))
+
+    def get_string(self, i: int) -> str:
+        s = self._strings.get(i)
+
+        if s is None:
+            start, length = self.get_record(STRING, 'strings', i)
+            offset, _ = self._sections['string_data']
+
+            s = str(self._buffer[offset + start:offset + start + length], 'utf-8')
+            self._strings[i] = s
+
+        return s
+
+    def get_type(self, i: int) -> devconf.ast.types.Type:
+        t = self._types.get(i)
+
+        if t is None:
+            name, kind = self.get_record(TYPE, 'types', i)
+            name = self.get_string(name)
+
+            if kind == TYPE_BUILTIN:
+                t = BUILTIN_TYPES[name]
+
+            else:
+                # struct types compare equal by name
+                t = devconf.ast.types.Type()
+                t.set_name(name)
+
+            self._types[i] = t
+
+        return t
+
+    def get_value(self, i: int) -> devconf.ast.value.Value:
+        v = self._values.get(i)
+
+        if v is None:
+            kind, payload = self.get_record(VALUE, 'values', i)
+
+            if kind == VALUE_FLOAT:
+                raw = FLOAT64.unpack(payload)[0]
+
+            else:
+                raw = INT64.unpack(payload)[0]
+
+                if kind == VALUE_BOOLEAN:
+                    raw = bool(raw)
+
+                elif kind == VALUE_STRING:
+                    raw = self.get_string(raw)
+
+                elif kind == VALUE_BIG_INTEGER:
+                    raw = int(self.get_string(raw))
+
+            v = VALUE_CLASSES[kind]()
+            v.set_value(raw)
+
+            self._values[i] = v
+
+        return v
+
+    def get_description(self, i: int) -> Description or None:
+        if i == NONE:
+            return None
+
+        d = self._descriptions.get(i)
+
+        if d is None:
+            d = Description(self, self.get_record(DESCRIPTION, 'descriptions', i))
+            self._descriptions[i] = d
+
+        return d
+
+    def get_symbol_name(self, i: int) -> str:
+        return self.get_string(self.get_record(SYMBOL, 'symbols', i)[1])
+
+    def get_symbol_at(self, i: int) -> Symbol:
+        s = self._symbols.get(i)
+
+        if s is None:
+            record = self.get_record(SYMBOL, 'symbols', i)
+
+            s = SYMBOL_CLASSES[record[0]](self, record)
+            self._symbols[i] = s
+
+        return s
+
+    def get_namespace(self, i: int) -> Namespace or None:
+        if i == NONE:
+            return None
+
+        n = self._namespaces.get(i)
+
+        if n is None:
+            n = Namespace(self, i, self.get_record(NAMESPACE, 'namespaces', i))
+            self._namespaces[i] = n
+
+        return n
+
+    def get_root(self) -> Namespace:
+        return self.get_namespace(0)
+
+    def _get_named(self) -> dict:
+        if self._named is None:
+            self._named = {}
+
+            for i in reversed(range(self._sections['namespaces'][1])):
+                self._named[self.get_string(self.get_record(NAMESPACE, 'namespaces', i)[0])] = i
+
+        return self._named
+
+    def get_symbol(self, name: str, **kwargs) -> devconf.symbols.table.GetSymbolResult:
+        # resolves name like devconf.symbols.table.SymbolTable.get_symbol,
+        # starting at the root unless another namespace is given
+        namespace = kwargs.get('start', self.get_root())
+
+        assert isinstance(namespace, Namespace)
+
+        if name in namespace:
+            symbol = namespace.get_symbol(name)
+
+        else:
+            symbol = None
+
+        named = self._get_named().get(name)
+        named = None if named is None else self.get_namespace(named)
+
+        ns = namespace
+
+        while ns is not None:
+            candidates = ns.get_namespaces_containing(name)
+
+            if named is not None:
+                candidates = candidates | {named}
+
+            if candidates:
+                return devconf.symbols.table.GetSymbolResult(symbol, min(candidates, key=Namespace.get_serial))
+
+            ns = ns.get_parent()
+
+        return devconf.symbols.table.GetSymbolResult(symbol, None)
+
+
+@contextlib.contextmanager
+def load(filename: str):
+    # maps the image into memory for as long as the context lasts
+    with open(filename, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            table = SymbolTable(buffer)
+
+            try:
+                yield table
+
+            finally:
+                table.close()
@@ -1,10 +1,33 @@
+import sys
+
 import ply.lex
 
+# prebuilt lexer table shipped with the package, see parser.parser.write_tables
+LEXTAB = '%s.lextab' % __package__
+
 ID = r'([_a-zA-Z]([_a-zA-Z0-9]*))'
 float_literal = r'((-?)(([0-9]*(\.[0-9]+))|(\.[0-9]+))([eE]-?[0-9]+)?)'
-string_literal = r'\"([^\\\n]|(\\.))*?\"'
+string_literal = r'\"([^\"\\\n]|(\\.))*\"'
 integer_literal = r'((0[xX][0-9a-fA-F]*)|(0[oO][0-7]*)|(-?[1-9][0-9]*))|0'
 
+# identifiers are matched as a whole and classified afterwards, so that a
+# keyword prefix such as 'int' in 'interval' is not split off
+KEYWORDS = {
+    'int': 'KW_INT',
+    'map': 'KW_MAP',
+    'bool': 'KW_BOOL',
+    'deny': 'KW_DENY',
+    'true': 'KW_TRUE',
+    'false': 'KW_FALSE',
+    'float': 'KW_FLOAT',
+    'allow': 'KW_ALLOW',
+    'const': 'KW_CONST',
+    'struct': 'KW_STRUCT',
+    'string': 'KW_STRING',
+    'default': 'KW_DEFAULT',
+    'namespace': 'KW_NAMESPACE',
+}
+
 
 class Lexer(object):
     tokens = [
@@ -41,62 +64,11 @@ class Lexer(object):
         'OP_NAMESPACE',
     ]
 
-    def __init__(self):
-        self.lexer = ply.lex.lex(module=self)
-
-    t_ignore = ' \t'
-
-    def t_KW_INT(self, t):
-        r'int'
-        return t
-
-    def t_KW_MAP(self, t):
-        r'map'
-        return t
+    def __init__(self, optimize: bool = True):
+        self.lexer = ply.lex.lex(module=self, optimize=optimize, lextab=LEXTAB)
 
-    def t_KW_BOOL(self, t):
-        r'bool'
-        return t
-
-    def t_KW_DENY(self, t):
-        r'deny'
-        return t
-
-    def t_KW_TRUE(self, t):
-        r'true'
-        return t
-
-    def t_KW_FALSE(self, t):
-        r'false'
-        return t
-
-    def t_KW_FLOAT(self, t):
-        r'float'
-        return t
-
-    def t_KW_ALLOW(self, t):
-        r'allow'
-        return t
-
-    def t_KW_CONST(self, t):
-        r'const'
-        return t
-
-    def t_KW_STRUCT(self, t):
-        r'struct'
-        return t
-
-    def t_KW_STRING(self, t):
-        r'string'
-        return t
-
-    def t_KW_DEFAULT(self, t):
-        r'default'
-        return t
-
-    def t_KW_NAMESPACE(self, t):
-        r'namespace'
-        return t
+    # the carriage return of a CRLF line break is a blank
+    t_ignore = ' \t\r'
 
     def t_DIR_LINE(self, t):
         r'\#line'
@@ -136,6 +108,7 @@ class Lexer(object):
 
     @ply.lex.TOKEN(ID)
     def t_ID(self, t):
+        t.type = KEYWORDS.get(t.value, 'ID')
         return t
 
     def t_OP_LIST(self, t):
@@ -170,5 +143,5 @@ class Lexer(object):
         t.lexer.lineno += len(t.value)
 
     def t_error(self, t):
-        print('Illegal character "%s"' % t.value[0])
+        print('Illegal character "%s"' % t.value[0], file=sys.stderr)
         t.lexer.skip(1)
@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('DIR_LINE', 'EOS', 'FLOAT_LITERAL', 'ID', 'INTEGER_LITERAL', 'KW_ALLOW', 'KW_BOOL', 'KW_CONST', 'KW_DEFAULT', 'KW_DENY', 'KW_FALSE', 'KW_FLOAT', 'KW_INT', 'KW_MAP', 'KW_NAMESPACE', 'KW_STRING', 'KW_STRUCT', 'KW_TRUE', 'LCURLY', 'LSQUARE', 'OP_ASSIGN', 'OP_LIST', 'OP_MEMBER', 'OP_NAMESPACE', 'OP_RANGE', 'RCURLY', 'RSQUARE', 'STRING_LITERAL'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_DIR_LINE>\\#line)|(?P<t_RCURLY>\\})|(?P<t_LCURLY>\\{)|(?P<t_RSQUARE>\\])|(?P<t_LSQUARE>\\[)|(?P<t_FLOAT_LITERAL>((-?)(([0-9]*(\\.[0-9]+))|(\\.[0-9]+))([eE]-?[0-9]+)?))|(?P<t_STRING_LITERAL>\\"([^\\"\\\\\\n]|(\\\\.))*\\")|(?P<t_INTEGER_LITERAL>((0[xX][0-9a-fA-F]*)|(0[oO][0-7]*)|(-?[1-9][0-9]*))|0)|(?P<t_ID>([_a-zA-Z]([_a-zA-Z0-9]*)))|(?P<t_OP_LIST>,)|(?P<t_OP_RANGE>\\.\\.)|(?P<t_OP_ASSIGN>=)|(?P<t_OP_MEMBER>\\.)|(?P<t_OP_NAMESPACE>::)|(?P<t_EOS>;)|(?P<t_newline>\\n+)', [None, ('t_DIR_LINE', 'DIR_LINE'), ('t_RCURLY', 'RCURLY'), ('t_LCURLY', 'LCURLY'), ('t_RSQUARE', 'RSQUARE'), ('t_LSQUARE', 'LSQUARE'), ('t_FLOAT_LITERAL', 'FLOAT_LITERAL'), None, None, None, None, None, None, None, ('t_STRING_LITERAL', 'STRING_LITERAL'), None, None, ('t_INTEGER_LITERAL', 'INTEGER_LITERAL'), None, None, None, None, ('t_ID', 'ID'), None, None, ('t_OP_LIST', 'OP_LIST'), ('t_OP_RANGE', 'OP_RANGE'), ('t_OP_ASSIGN', 'OP_ASSIGN'), ('t_OP_MEMBER', 'OP_MEMBER'), ('t_OP_NAMESPACE', 'OP_NAMESPACE'), ('t_EOS', 'EOS'), ('t_newline', 'newline')])]}
+_lexstateignore = {'INITIAL': ' \t\r'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {'INITIAL': 't_eof'}
@@ -1,28 +1,44 @@
-import ast.map
-import ast.range
-import ast.value
-import ast.struct
-import ast.filter
-import ast.config
-import ast.literal
-import ast.variable
-import ast.constant
-import ast.qualifier
-import ast.namespace
-import ast.expression
-
-import ast.types
-import ast.types.builtin
+import devconf.ast.map
+import devconf.ast.range
+import devconf.ast.value
+import devconf.ast.struct
+import devconf.ast.filter
+import devconf.ast.config
+import devconf.ast.literal
+import devconf.ast.variable
+import devconf.ast.constant
+import devconf.ast.qualifier
+import devconf.ast.namespace
+import devconf.ast.expression
+
+import devconf.ast.types
+import devconf.ast.types.builtin
+
+import os
+import re
+import copy
 
 import ply.yacc
 
-import parser.lexer
+import devconf.parser.lexer
+import devconf.parser.scanner
 
-import symbols.table
+import devconf.symbols.table
 
+import devconf.tracing
+import devconf.visitor
+
+
+# prebuilt LALR table shipped with the package, see write_tables
+PARSETAB = '%s.parsetab' % __package__
 
-class Parser(object):
-    tokens = parser.lexer.Lexer.tokens
+
+class CompileContext(object):
+    # The state of one parse, which the grammar actions below change and
+    # nothing else does. The actions are methods of the context and a parser
+    # binds them to a new context for every parse, so that a parser runs any
+    # number of parses at once.
+    tokens = devconf.parser.lexer.Lexer.tokens
 
     precedence = (
         ('left', 'OP_ASSIGN'),
@@ -30,30 +46,32 @@ class Parser(object):
         ('left', 'OP_NAMESPACE'),
     )
 
-    def __init__(self, filename):
-        self._symbol_table = None
+    def __init__(self, filename: str = ''):
         self._filename = str(filename)
-        self.lexer = parser.lexer.Lexer()
-        self.parser = ply.yacc.yacc(module=self)
+        self._symbol_table = devconf.symbols.table.SymbolTable()
+        self._source_files = {}
+        self._values = devconf.ast.value.ValueCache()
 
-    def parse(self, text, **kwargs):
-        self._symbol_table = symbols.table.SymbolTable()
+    def get_file_name(self) -> str:
+        return self._filename
 
-        syntax_tree = self.parser.parse(text, **kwargs)
+    def get_symbol_table(self) -> devconf.symbols.table.SymbolTable:
+        return self._symbol_table
 
-        return syntax_tree, self._symbol_table
-
-    def get_file_name(self):
-        return self._filename
+    def get_source_files(self) -> list:
+        # files named by line markers, in order of appearance
+        return list(self._source_files)
 
     def p_device_configuration(self, p):
         """device-configuration : push-scope namespace-content"""
 
-        p[0] = ast.config.DeviceConfiguration()
+        p[0] = devconf.ast.config.DeviceConfiguration()
 
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
 
+        p[0].set_content(p[2])
+
         self._symbol_table.pop_namespace()
 
     def p_namespace_content_1(self, p):
@@ -63,7 +81,7 @@ class Parser(object):
                              | variable-declaration
                              | assignment-expression"""
 
-        p[0] = ast.namespace.Content()
+        p[0] = devconf.ast.namespace.Content()
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
 
@@ -83,7 +101,7 @@ class Parser(object):
     def p_namespace_content_3(self, p):
         """namespace-content : line-marker"""
 
-        p[0] = ast.namespace.Content()
+        p[0] = devconf.ast.namespace.Content()
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
 
@@ -96,7 +114,7 @@ class Parser(object):
     def p_namespace(self, p):
         """namespace : KW_NAMESPACE ID LCURLY push-scope namespace-content RCURLY"""
 
-        p[0] = ast.namespace.Namespace()
+        p[0] = devconf.ast.namespace.Namespace()
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
 
@@ -109,7 +127,7 @@ class Parser(object):
     def p_assignment_expression(self, p):
         """assignment-expression : primary-expression OP_ASSIGN rvalue-expression EOS"""
 
-        p[0] = ast.expression.AssignmentExpression()
+        p[0] = devconf.ast.expression.AssignmentExpression()
         p[0].set_line_number(p.lineno(2))
         p[0].set_file_name(self._filename)
 
@@ -141,7 +159,8 @@ class Parser(object):
     def p_primary_expression_3(p):
         """primary-expression : struct-access"""
 
-        p[0] = p[1]
+        struct, path = p[1]
+        p[0] = struct.get_member_path(path)
 
     @staticmethod
     def p_primary_expression_4(p):
@@ -149,24 +168,27 @@ class Parser(object):
 
         p[0] = p[1].symbol
 
+    # a struct access is the struct instance and the path of member names
+    # after it, the path is resolved as a whole by the primary expression
     def p_struct_access_1(self, p):
         """struct-access : ID OP_MEMBER ID"""
 
         result = self._symbol_table.get_symbol(p[1])
 
-        p[0] = result.symbol.get_member(p[3])
+        p[0] = result.symbol, (p[3],)
 
     @staticmethod
     def p_struct_access_2(p):
         """struct-access : namespace-access OP_MEMBER ID"""
 
-        p[0] = p[1].symbol.get_member(p[3])
+        p[0] = p[1].symbol, (p[3],)
 
     @staticmethod
     def p_struct_access_3(p):
         """struct-access : struct-access OP_MEMBER ID"""
 
-        p[0] = p[1].get_member(p[3])
+        struct, path = p[1]
+        p[0] = struct, path + (p[3],)
 
     def p_namespace_access_1(self, p):
         """namespace-access : OP_NAMESPACE ID"""
@@ -189,7 +211,7 @@ class Parser(object):
     def p_struct_declaration(self, p):
         """struct-declaration : KW_STRUCT ID LCURLY push-scope member-declaration-list RCURLY EOS"""
 
-        p[0] = ast.struct.Struct()
+        p[0] = devconf.ast.struct.Struct()
         p[0].set_line_number(p.lineno(2))
         p[0].set_file_name(self._filename)
 
@@ -203,7 +225,7 @@ class Parser(object):
     def p_member_declaration_list_1(self, p):
         """member-declaration-list : member-declaration"""
 
-        p[0] = ast.struct.MemberList()
+        p[0] = devconf.ast.struct.MemberList()
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
 
@@ -222,7 +244,7 @@ class Parser(object):
         result = self._symbol_table.get_symbol(p[2])
         struct = result.symbol
 
-        p[0] = ast.struct.Member()
+        p[0] = devconf.ast.struct.Member()
         p[0].set_line_number(p.lineno(3))
         p[0].set_file_name(self._filename)
 
@@ -234,7 +256,7 @@ class Parser(object):
     def p_member_declaration_1(self, p):
         """member-declaration : type-name ID EOS"""
 
-        p[0] = ast.struct.Member()
+        p[0] = devconf.ast.struct.Member()
         p[0].set_line_number(p.lineno(2))
         p[0].set_file_name(self._filename)
 
@@ -246,7 +268,7 @@ class Parser(object):
     def p_member_declaration_2(self, p):
         """member-declaration : type-qualifier type-name ID EOS"""
 
-        p[0] = ast.struct.Member()
+        p[0] = devconf.ast.struct.Member()
         p[0].set_line_number(p.lineno(3))
         p[0].set_file_name(self._filename)
 
@@ -259,7 +281,7 @@ class Parser(object):
     def p_member_declaration_3(self, p):
         """member-declaration : type-name ID LCURLY push-scope variable-description-set RCURLY EOS"""
 
-        p[0] = ast.struct.Member()
+        p[0] = devconf.ast.struct.Member()
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
 
@@ -274,7 +296,7 @@ class Parser(object):
     def p_member_declaration_4(self, p):
         """member-declaration : type-qualifier type-name ID LCURLY push-scope variable-description-set RCURLY EOS"""
 
-        p[0] = ast.struct.Member()
+        p[0] = devconf.ast.struct.Member()
         p[0].set_line_number(p.lineno(3))
         p[0].set_file_name(self._filename)
 
@@ -304,7 +326,7 @@ class Parser(object):
     def p_variable_declaration_1(self, p):
         """variable-declaration : type-name ID EOS"""
 
-        p[0] = ast.variable.Variable()
+        p[0] = devconf.ast.variable.Variable()
         p[0].set_line_number(p.lineno(2))
         p[0].set_file_name(self._filename)
 
@@ -316,7 +338,7 @@ class Parser(object):
     def p_variable_declaration_2(self, p):
         """variable-declaration : type-qualifier type-name ID EOS"""
 
-        p[0] = ast.variable.Variable()
+        p[0] = devconf.ast.variable.Variable()
         p[0].set_line_number(p.lineno(3))
         p[0].set_file_name(self._filename)
 
@@ -329,7 +351,7 @@ class Parser(object):
     def p_variable_declaration_3(self, p):
         """variable-declaration : type-name ID LCURLY push-scope variable-description-set RCURLY EOS"""
 
-        p[0] = ast.variable.Variable()
+        p[0] = devconf.ast.variable.Variable()
         p[0].set_line_number(p.lineno(2))
         p[0].set_file_name(self._filename)
 
@@ -344,7 +366,7 @@ class Parser(object):
     def p_variable_declaration_4(self, p):
         """variable-declaration : type-qualifier type-name ID LCURLY push-scope variable-description-set RCURLY EOS"""
 
-        p[0] = ast.variable.Variable()
+        p[0] = devconf.ast.variable.Variable()
         p[0].set_line_number(p.lineno(3))
         p[0].set_file_name(self._filename)
 
@@ -362,7 +384,7 @@ class Parser(object):
                                     | variable-description-set filter"""
 
         if len(p) == 2:
-            p[0] = ast.variable.VariableDescriptionSet()
+            p[0] = devconf.ast.variable.VariableDescriptionSet()
             p[0].set_line_number(p.lineno(1))
             p[0].set_file_name(self._filename)
 
@@ -383,7 +405,7 @@ class Parser(object):
                                     | variable-description-set default"""
 
         if len(p) == 2:
-            p[0] = ast.variable.VariableDescriptionSet()
+            p[0] = devconf.ast.variable.VariableDescriptionSet()
             p[0].set_line_number(p.lineno(1))
             p[0].set_file_name(self._filename)
             p[0].set_default_value(p[1])
@@ -397,7 +419,7 @@ class Parser(object):
                                     | variable-description-set mapping"""
 
         if len(p) == 2:
-            p[0] = ast.variable.VariableDescriptionSet()
+            p[0] = devconf.ast.variable.VariableDescriptionSet()
             p[0].set_line_number(p.lineno(1))
             p[0].set_file_name(self._filename)
             p[0].set_mapping_list(p[1])
@@ -411,7 +433,7 @@ class Parser(object):
                                     | variable-description-set constant"""
 
         if len(p) == 2:
-            p[0] = ast.variable.VariableDescriptionSet()
+            p[0] = devconf.ast.variable.VariableDescriptionSet()
             p[0].set_line_number(p.lineno(1))
             p[0].set_file_name(self._filename)
             p[0].set_constant_list(p[1])
@@ -423,7 +445,7 @@ class Parser(object):
     def p_filter(self, p):
         """filter : filter-type LCURLY filter-list RCURLY EOS"""
 
-        p[0] = ast.filter.Filter()
+        p[0] = devconf.ast.filter.Filter()
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
         p[0].set_allow(p[1])
@@ -432,7 +454,7 @@ class Parser(object):
     def p_filter_list_1(self, p):
         """filter-list : range"""
 
-        p[0] = ast.filter.FilterPredicateList()
+        p[0] = devconf.ast.filter.FilterPredicateList()
 
         p[0].add_range(p[1])
         p[0].set_line_number(p.lineno(1))
@@ -441,7 +463,7 @@ class Parser(object):
     def p_filter_list_2(self, p):
         """filter-list : literal"""
 
-        p[0] = ast.filter.FilterPredicateList()
+        p[0] = devconf.ast.filter.FilterPredicateList()
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
 
@@ -464,7 +486,7 @@ class Parser(object):
     def p_numeric_range_1(self, p):
         """range : LSQUARE OP_RANGE numeric-literal RSQUARE"""
 
-        p[0] = ast.range.Range()
+        p[0] = devconf.ast.range.Range()
         p[0].set_line_number(p.lineno(3))
         p[0].set_file_name(self._filename)
 
@@ -473,7 +495,7 @@ class Parser(object):
     def p_numeric_range_2(self, p):
         """range : LSQUARE numeric-literal OP_RANGE RSQUARE"""
 
-        p[0] = ast.range.Range()
+        p[0] = devconf.ast.range.Range()
         p[0].set_line_number(p.lineno(2))
         p[0].set_file_name(self._filename)
 
@@ -482,7 +504,7 @@ class Parser(object):
     def p_numeric_range_3(self, p):
         """range : LSQUARE numeric-literal OP_RANGE numeric-literal RSQUARE"""
 
-        p[0] = ast.range.Range()
+        p[0] = devconf.ast.range.Range()
         p[0].set_line_number(p.lineno(4))
         p[0].set_file_name(self._filename)
 
@@ -498,7 +520,7 @@ class Parser(object):
     def p_mapping_table_1(self, p):
         """mapping-table : mapping-element"""
 
-        p[0] = ast.map.Map()
+        p[0] = devconf.ast.map.Map()
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
 
@@ -514,7 +536,7 @@ class Parser(object):
     def p_mapping_element_1(self, p):
         """mapping-element : literal OP_ASSIGN literal"""
 
-        p[0] = ast.map.MapEntry()
+        p[0] = devconf.ast.map.MapEntry()
         p[0].set_line_number(p.lineno(3))
         p[0].set_file_name(self._filename)
 
@@ -527,7 +549,7 @@ class Parser(object):
         result = self._symbol_table.get_symbol(p[3])
         value = result.symbol
 
-        p[0] = ast.map.MapEntry()
+        p[0] = devconf.ast.map.MapEntry()
         p[0].set_line_number(p.lineno(3))
         p[0].set_file_name(self._filename)
 
@@ -543,7 +565,7 @@ class Parser(object):
     def p_constant_list_1(self, p):
         """constant-list : constant-element"""
 
-        p[0] = ast.constant.ConstantList()
+        p[0] = devconf.ast.constant.ConstantList()
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
 
@@ -559,7 +581,7 @@ class Parser(object):
     def p_constant_declaration_1(self, p):
         """constant-element : ID OP_ASSIGN literal"""
 
-        p[0] = ast.constant.Constant()
+        p[0] = devconf.ast.constant.Constant()
         p[0].set_line_number(p.lineno(3))
         p[0].set_file_name(self._filename)
 
@@ -574,7 +596,7 @@ class Parser(object):
         result = self._symbol_table.get_symbol(p[3])
         value = result.symbol
 
-        p[0] = ast.constant.Constant()
+        p[0] = devconf.ast.constant.Constant()
         p[0].set_line_number(p.lineno(3))
         p[0].set_file_name(self._filename)
 
@@ -614,30 +636,30 @@ class Parser(object):
     def p_type_name_4(p):
         """type-name : KW_INT"""
 
-        p[0] = ast.types.builtin.integer
+        p[0] = devconf.ast.types.builtin.integer
 
     @staticmethod
     def p_type_name_1(p):
         """type-name : KW_BOOL"""
 
-        p[0] = ast.types.builtin.boolean
+        p[0] = devconf.ast.types.builtin.boolean
     
     @staticmethod
     def p_type_name_2(p):
         """type-name : KW_FLOAT"""
 
-        p[0] = ast.types.builtin.floating
+        p[0] = devconf.ast.types.builtin.floating
 
     @staticmethod
     def p_type_name_3(p):
         """type-name : KW_STRING"""
 
-        p[0] = ast.types.builtin.string
+        p[0] = devconf.ast.types.builtin.string
 
     def p_type_qualifier(self, p):
         """type-qualifier : KW_CONST"""
 
-        p[0] = ast.qualifier.ConstQualifier()
+        p[0] = devconf.ast.qualifier.ConstQualifier()
 
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
@@ -645,56 +667,58 @@ class Parser(object):
     def p_line_marker(self, p):
         """line-marker : DIR_LINE integer-literal string-literal"""
 
+        # the literal keeps its quotes and escapes as written
+        text = p[3].get_value().get_value()
+        name = re.sub(r'\\(.)', r'\1', text[1:-1])
+
+        self._source_files.setdefault(name, None)
+
     def p_bool_literal(self, p):
         """bool-literal : KW_FALSE
                         | KW_TRUE"""
 
-        p[0] = ast.literal.Literal()
+        p[0] = devconf.ast.literal.Literal()
 
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
 
-        value = ast.value.BooleanValue()
-        value.set_value(p[1] == 'true')
+        value = self._values.get(devconf.ast.value.BooleanValue, p[1] == 'true')
 
         p[0].set_value(value)
 
     def p_float_literal(self, p):
         """float-literal : FLOAT_LITERAL"""
 
-        p[0] = ast.literal.Literal()
+        p[0] = devconf.ast.literal.Literal()
 
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
 
-        value = ast.value.FloatValue()
-        value.set_value(p[1])
+        value = self._values.get(devconf.ast.value.FloatValue, p[1])
 
         p[0].set_value(value)
 
     def p_string_literal(self, p):
         """string-literal : STRING_LITERAL"""
 
-        p[0] = ast.literal.Literal()
+        p[0] = devconf.ast.literal.Literal()
 
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
 
-        value = ast.value.StringValue()
-        value.set_value(p[1])
+        value = self._values.get(devconf.ast.value.StringValue, p[1])
 
         p[0].set_value(value)
 
     def p_integer_literal(self, p):
         """integer-literal : INTEGER_LITERAL"""
 
-        p[0] = ast.literal.Literal()
+        p[0] = devconf.ast.literal.Literal()
 
         p[0].set_line_number(p.lineno(1))
         p[0].set_file_name(self._filename)
 
-        value = ast.value.IntegerValue()
-        value.set_value(p[1])
+        value = self._values.get(devconf.ast.value.IntegerValue, p[1])
 
         p[0].set_value(value)
 
@@ -714,3 +738,90 @@ class Parser(object):
         """push-scope :"""
 
         self._symbol_table.push_namespace()
+
+
+class Parser(object):
+    # Holds the parse tables and the lexer rules, which parses only read. A
+    # parser may be shared by threads and used again from within a parse.
+    def __init__(self, filename='', scanner=False):
+        self._filename = str(filename)
+        self._lexer = None if scanner else devconf.parser.lexer.Lexer()
+
+        # the shipped tables are trusted as they are: no grammar checks, no
+        # debug file and nothing written next to the sources or into the cwd
+        self.parser = ply.yacc.yacc(module=CompileContext(), tabmodule=PARSETAB, optimize=True, debug=False,
+                                    write_tables=False)
+
+        # what a parse needs to create its own productions, which is several
+        # times faster than copying them
+        self._productions = [(x.str, x.name, x.len, x.func, x.file, x.line) for x in self.parser.productions]
+
+    def create_context(self, filename=None) -> CompileContext:
+        return CompileContext(self._filename if filename is None else filename)
+
+    def _create_lexer(self):
+        # the scanner also accepts bytes-like objects and file objects
+        if self._lexer is None:
+            return devconf.parser.scanner.Scanner()
+
+        return self._lexer.lexer.clone()
+
+    def _create_parser(self, context: CompileContext) -> ply.yacc.LRParser:
+        # a copy sharing the tables, the stacks of a parse are attributes of
+        # the parser running it; its productions call the actions of context
+        parser = copy.copy(self.parser)
+        parser.productions = []
+
+        for x in self._productions:
+            production = ply.yacc.MiniProduction(*x)
+
+            if production.func is not None:
+                production.callable = getattr(context, production.func)
+
+            parser.productions.append(production)
+
+        return parser
+
+    def parse(self, text, filename=None, context: CompileContext or None = None, **kwargs):
+        # returns the syntax tree and the symbol table, context receives
+        # everything else the parse found out, such as the source files
+        if context is None:
+            context = self.create_context(filename)
+
+        parser = self._create_parser(context)
+        lexer = self._create_lexer()
+
+        try:
+            if devconf.tracing.is_enabled():
+                with devconf.tracing.actions(parser.productions, context):
+                    syntax_tree = parser.parse(text, lexer=lexer, **kwargs)
+
+            else:
+                syntax_tree = parser.parse(text, lexer=lexer, **kwargs)
+
+        finally:
+            if isinstance(lexer, devconf.parser.scanner.Scanner):
+                lexer.close()
+
+        if syntax_tree is not None:
+            devconf.visitor.Freezer().visit(syntax_tree)
+
+        return syntax_tree, context.get_symbol_table()
+
+    def get_file_name(self):
+        return self._filename
+
+
+def write_tables(outputdir=None) -> None:
+    # regenerates parsetab.py and lextab.py, run this after changing the
+    # grammar or the token rules
+    if outputdir is None:
+        outputdir = os.path.dirname(os.path.abspath(__file__))
+
+    # the lexer table goes first, constructing a Parser loads it
+    devconf.parser.lexer.Lexer(optimize=False).lexer.writetab(devconf.parser.lexer.LEXTAB, outputdir)
+    ply.yacc.yacc(module=CompileContext(), tabmodule=PARSETAB, debug=False, outputdir=outputdir)
+
+
+if __name__ == '__main__':
+    write_tables()
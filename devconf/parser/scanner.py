@@ -0,0 +1,134 @@
+import re
+import sys
+import collections
+
+import devconf.parser.lexer
+
+Token = collections.namedtuple('Token', ['type', 'value', 'lineno', 'lexpos'])
+
+# Alternatives are tried in this order. Identifiers and the single character
+# tokens cannot start like any other token and go first since they are the
+# most frequent. Numbers and the dot operators overlap and keep the relative
+# order of the PLY lexer: float before integer, '..' before '.'.
+RULES = (
+    ('ID', devconf.parser.lexer.ID),
+    ('EOS', r';'),
+    ('LCURLY', r'\{'),
+    ('RCURLY', r'\}'),
+    ('OP_ASSIGN', r'='),
+    ('OP_LIST', r','),
+    ('LSQUARE', r'\['),
+    ('RSQUARE', r'\]'),
+    ('STRING_LITERAL', devconf.parser.lexer.string_literal),
+    ('newline', r'\n+'),
+    ('FLOAT_LITERAL', devconf.parser.lexer.float_literal),
+    ('INTEGER_LITERAL', devconf.parser.lexer.integer_literal),
+    ('OP_RANGE', r'\.\.'),
+    ('OP_MEMBER', r'\.'),
+    ('OP_NAMESPACE', r'::'),
+    ('DIR_LINE', r'\#line'),
+    ('error', r'[^ \t\r]'),
+)
+
+# blanks, the carriage return of a CRLF line break included, are consumed in
+# front of every token instead of being matched on their own
+PATTERN = re.compile(r'[ \t\r]*(?:%s)' % '|'.join('(?P<%s>%s)' % rule for rule in RULES))
+
+# the same pattern for bytes-like input such as an mmap or a binary stream
+BINARY_PATTERN = re.compile(PATTERN.pattern.encode('ascii'))
+
+# encoding of bytes-like input, token values are decoded one at a time
+ENCODING = 'utf-8'
+
+# amount read from a stream at a time
+CHUNK_SIZE = 1 << 16
+
+
+class Scanner(object):
+    tokens = devconf.parser.lexer.Lexer.tokens
+
+    def __init__(self):
+        self.lineno = 1
+        self.lexpos = 0
+        self._stream = None
+
+    def input(self, source) -> None:
+        # source is a str, a bytes-like object such as an mmap, or a file
+        # object which is read in chunks
+        if hasattr(source, 'read'):
+            self._stream = self._scan_stream(source)
+
+        else:
+            self._stream = self._scan(source, 0, len(source), 0)
+
+    def token(self) -> Token or None:
+        return next(self._stream, None)
+
+    def close(self) -> None:
+        # drops the input still referenced by an unfinished token stream
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def scan(self, source):
+        self.input(source)
+
+        return self._stream
+
+    def _scan_stream(self, file):
+        # no token spans a line break, so everything up to the last line
+        # break of the buffer is scanned before the next chunk is read
+        base = 0
+        rest = None
+
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+
+            if not chunk:
+                break
+
+            buffer = chunk if rest is None else rest + chunk
+            end = buffer.rfind('\n' if isinstance(buffer, str) else b'\n') + 1
+
+            yield from self._scan(buffer, 0, end, base)
+
+            base += end
+            rest = buffer[end:]
+
+        if rest:
+            yield from self._scan(rest, 0, len(rest), base)
+
+    def _scan(self, buffer, pos: int, endpos: int, base: int):
+        keywords = devconf.parser.lexer.KEYWORDS
+        make = tuple.__new__
+
+        binary = not isinstance(buffer, str)
+        pattern = BINARY_PATTERN if binary else PATTERN
+
+        for m in pattern.finditer(buffer, pos, endpos):
+            kind = m.lastgroup
+            self.lexpos = base + m.end()
+
+            if kind == 'newline':
+                self.lineno += m.end() - m.start(kind)
+                continue
+
+            value = m.group(kind)
+
+            if binary:
+                value = value.decode(ENCODING, 'replace' if kind == 'error' else 'strict')
+
+            if kind == 'ID':
+                yield make(Token, (keywords.get(value, 'ID'), value, self.lineno, base + m.start(kind)))
+
+            elif kind == 'INTEGER_LITERAL':
+                yield make(Token, (kind, int(value, 0), self.lineno, base + m.start(kind)))
+
+            elif kind == 'FLOAT_LITERAL':
+                yield make(Token, (kind, float(value), self.lineno, base + m.start(kind)))
+
+            elif kind == 'error':
+                print('Illegal character "%s"' % value, file=sys.stderr)
+
+            else:
+                yield make(Token, (kind, value, self.lineno, base + m.start(kind)))
@@ -0,0 +1,65 @@
+import os
+import json
+import socket
+import tempfile
+
+# Requests and responses are JSON objects, one per line. A request holds the
+# command line arguments of devconf and the directory they are relative to, a
+# response the exit status and the output the command wrote:
+#
+#   {"argv": ["-o", "board.h", "board.dc"], "cwd": "/src"}
+#   {"status": 0, "stdout": "", "stderr": ""}
+#
+# A connection may carry any number of requests, one after the other.
+
+ENCODING = 'utf-8'
+
+
+class ServerError(Exception):
+    pass
+
+
+def get_default_socket() -> str:
+    # private to the user, so that builds of different users do not share a
+    # server
+    directory = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+
+    return os.path.join(directory, 'devconf-%d.sock' % os.getuid())
+
+
+def is_running(path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        try:
+            s.connect(path)
+
+        except OSError:
+            return False
+
+    return True
+
+
+def encode(message: dict) -> bytes:
+    return (json.dumps(message) + '\n').encode(ENCODING)
+
+
+def request(path: str, argv: list, cwd: str) -> tuple:
+    # runs a command on the server listening on path and returns its exit
+    # status, standard output and standard error; OSError if no server is
+    # listening
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(path)
+        s.sendall(encode({'argv': list(argv), 'cwd': str(cwd)}))
+
+        with s.makefile('rb') as file:
+            line = file.readline()
+
+    if not line:
+        raise ServerError('The server closed the connection.')
+
+    try:
+        response = json.loads(line)
+
+        return int(response['status']), str(response['stdout']), str(response['stderr'])
+
+    except (ValueError, KeyError, TypeError):
+        raise ServerError('Malformed response.')
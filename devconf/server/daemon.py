@@ -0,0 +1,113 @@
+import os
+import json
+import threading
+import socketserver
+import concurrent.futures
+
+import devconf.server
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                argv = [str(x) for x in request['argv']]
+                cwd = str(request['cwd'])
+
+            except (ValueError, KeyError, TypeError):
+                response = {'status': 2, 'stdout': '', 'stderr': 'Malformed request.\n'}
+
+            else:
+                response = self._run(argv, cwd)
+
+            self.wfile.write(devconf.server.encode(response))
+            self.wfile.flush()
+
+    def _run(self, argv: list, cwd: str) -> dict:
+        try:
+            future = self.server.submit(argv, cwd)
+            status, stdout, stderr = future.result(self.server.REQUEST_TIMEOUT)
+
+        except concurrent.futures.TimeoutError:
+            # the worker keeps running the command, the client is not kept
+            # waiting for it
+            future.cancel()
+            message = 'The request did not complete within %d seconds.\n' % self.server.REQUEST_TIMEOUT
+
+            return {'status': 1, 'stdout': '', 'stderr': message}
+
+        except Exception as e:
+            # e.g. a broken pool after a worker died
+            return {'status': 1, 'stdout': '', 'stderr': 'The server failed: %s: %s\n' % (type(e).__name__, e)}
+
+        return {'status': status, 'stdout': stdout, 'stderr': stderr}
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    # Every client is served by a thread of its own, which hands its requests
+    # to a pool of worker processes. run(argv, cwd) is called in a worker and
+    # returns the exit status, standard output and standard error of the
+    # command; the workers are set up once by initializer and keep their
+    # state, such as a parser, across requests.
+    daemon_threads = True
+
+    # seconds a client waits for the result of a request
+    REQUEST_TIMEOUT = 600
+
+    def __init__(self, path: str, run, workers: int or None = None, initializer=None, initargs: tuple = ()):
+        self._path = str(path)
+        self._run = run
+
+        if os.path.exists(self._path):
+            if devconf.server.is_running(self._path):
+                raise devconf.server.ServerError('A server is already listening on %s.' % self._path)
+
+            # left over by a server that did not shut down
+            os.unlink(self._path)
+
+        self._workers = workers
+        self._initializer = initializer
+        self._initargs = initargs
+        self._lock = threading.Lock()
+        self._executor = self._create_executor()
+
+        try:
+            super().__init__(self._path, _Handler)
+
+        except BaseException:
+            self._executor.shutdown()
+            raise
+
+        os.chmod(self._path, 0o600)
+
+    def get_path(self) -> str:
+        return self._path
+
+    def _create_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        return concurrent.futures.ProcessPoolExecutor(self._workers, initializer=self._initializer,
+                                                      initargs=self._initargs)
+
+    def submit(self, argv: list, cwd: str) -> concurrent.futures.Future:
+        with self._lock:
+            try:
+                return self._executor.submit(self._run, argv, cwd)
+
+            except concurrent.futures.process.BrokenProcessPool:
+                # a worker died, the requests it failed have been answered;
+                # later requests get a new pool
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._create_executor()
+
+                return self._executor.submit(self._run, argv, cwd)
+
+    def server_close(self):
+        super().server_close()
+
+        self._executor.shutdown(cancel_futures=True)
+
+        try:
+            os.unlink(self._path)
+
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,236 @@
+import json
+import time
+import functools
+import contextlib
+import collections
+import tracemalloc
+
+import devconf.ast.map
+import devconf.ast.filter
+import devconf.ast.mixins.node
+
+import devconf.symbols.table
+
+# phases of a compilation in the order they run, resolve is the part of parse
+# spent resolving names
+PHASES = ('read', 'lex', 'parse', 'resolve', 'generate', 'image')
+
+# the phase another phase is part of
+PARENT_PHASES = {
+    'resolve': 'parse',
+}
+
+COUNTERS = (
+    'tokens',
+    'symbol_lookups',
+    'member_lookups',
+    'member_lookup_scans',
+    'filter_checks',
+    'map_lookups',
+)
+
+
+class Statistics(object):
+    # Times and peak memory of the phases of a compilation and counters of
+    # the work done in them. The counters are collected by instrumenting the
+    # syntax tree nodes, the symbol table, filters and maps while
+    # instrument() is active, the code is left untouched otherwise.
+
+    def __init__(self, filename: str = '', memory: bool = True):
+        self._filename = str(filename)
+        self._memory = bool(memory)
+
+        self._phases = {}
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        self._nodes = collections.Counter()
+
+        self._start = None
+        self._total = None
+
+    def get_file_name(self) -> str:
+        return self._filename
+
+    def get_phase(self, name: str) -> dict or None:
+        return self._phases.get(name)
+
+    def get_counter(self, name: str) -> int:
+        return self._counters[name]
+
+    def get_nodes(self) -> dict:
+        return dict(self._nodes)
+
+    def get_mean_scan_length(self) -> float:
+        lookups = self._counters['member_lookups']
+
+        return self._counters['member_lookup_scans'] / lookups if lookups else 0.0
+
+    def _add_time(self, name: str, seconds: float) -> None:
+        phase = self._phases.setdefault(name, {'seconds': 0.0, 'peak_bytes': None})
+        phase['seconds'] += seconds
+
+    @contextlib.contextmanager
+    def run(self):
+        # the whole compilation, memory is traced from here on
+        tracing = self._memory and not tracemalloc.is_tracing()
+
+        if tracing:
+            tracemalloc.start()
+
+        self._start = time.perf_counter()
+
+        try:
+            yield self
+
+        finally:
+            self._total = time.perf_counter() - self._start
+
+            if tracing:
+                tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        assert name in PHASES
+
+        if self._memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self._add_time(name, time.perf_counter() - start)
+
+            if self._memory and tracemalloc.is_tracing():
+                self._phases[name]['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+
+    def count_tokens(self, tokens) -> None:
+        self._counters['tokens'] += sum(1 for _ in tokens)
+
+    @contextlib.contextmanager
+    def instrument(self):
+        patches = []
+
+        def patch(cls, name, make_wrapper):
+            original = cls.__dict__[name]
+            patches.append((cls, name, original))
+            setattr(cls, name, functools.wraps(original)(make_wrapper(original)))
+
+        patch(devconf.ast.mixins.node.Node, '__init__', self._wrap_node_init)
+        patch(devconf.symbols.table.SymbolTable, 'get_symbol', self._wrap_get_symbol)
+        patch(devconf.symbols.table.Namespace, '_get_symbol', self._wrap_member_lookup)
+        patch(devconf.ast.filter.Filter, '__contains__', self._wrap_counter('filter_checks'))
+        patch(devconf.ast.map.Map, '_get_entry', self._wrap_counter('map_lookups'))
+
+        try:
+            yield self
+
+        finally:
+            for cls, name, original in reversed(patches):
+                setattr(cls, name, original)
+
+    def _wrap_node_init(self, f):
+        # the syntax tree is not kept as a whole, so nodes are counted as
+        # they are created
+        nodes = self._nodes
+
+        def init(node, *args, **kwargs):
+            nodes[type(node).__name__] += 1
+
+            f(node, *args, **kwargs)
+
+        return init
+
+    def _wrap_get_symbol(self, f):
+        counters = self._counters
+        clock = time.perf_counter
+
+        def get_symbol(table, *args, **kwargs):
+            counters['symbol_lookups'] += 1
+            start = clock()
+
+            try:
+                return f(table, *args, **kwargs)
+
+            finally:
+                self._add_time('resolve', clock() - start)
+
+        return get_symbol
+
+    def _wrap_member_lookup(self, f):
+        counters = self._counters
+
+        def get_member(namespace, name):
+            # the namespaces scanned, from the innermost up to the one
+            # declaring the name or the root
+            scanned = 1
+            x = namespace
+
+            while name not in x and x.get_parent() is not None:
+                x = x.get_parent()
+                scanned += 1
+
+            counters['member_lookups'] += 1
+            counters['member_lookup_scans'] += scanned
+
+            return f(namespace, name)
+
+        return get_member
+
+    def _wrap_counter(self, counter: str):
+        counters = self._counters
+
+        def wrap(f):
+            def count(*args, **kwargs):
+                counters[counter] += 1
+
+                return f(*args, **kwargs)
+
+            return count
+
+        return wrap
+
+    def to_dict(self) -> dict:
+        return {
+            'file': self._filename,
+            'total_seconds': self._total,
+            'phases': {x: dict(self._phases[x]) for x in PHASES if x in self._phases},
+            'counters': dict(self._counters, mean_scan_length=self.get_mean_scan_length()),
+            'nodes': dict(self._nodes.most_common()),
+        }
+
+    def write_json(self, file) -> None:
+        json.dump(self.to_dict(), file, indent=2)
+        file.write('\n')
+
+    def write_text(self, file) -> None:
+        lines = ['%s:' % self._filename, '  %-12s %10s %10s' % ('phase', 'seconds', 'peak MB')]
+
+        for name in PHASES:
+            phase = self._phases.get(name)
+
+            if phase is None:
+                continue
+
+            label = ('  ' + name) if name in PARENT_PHASES else name
+            peak = '-' if phase['peak_bytes'] is None else '%.1f' % (phase['peak_bytes'] / 1e6)
+
+            lines.append('  %-12s %10.3f %10s' % (label, phase['seconds'], peak))
+
+        if self._total is not None:
+            lines.append('  %-12s %10.3f' % ('total', self._total))
+
+        lines.append('  tokens: %d' % self._counters['tokens'])
+        lines.append('  symbol lookups: %d' % self._counters['symbol_lookups'])
+        lines.append('  member lookups: %d, %.2f namespaces scanned on average' %
+                     (self._counters['member_lookups'], self.get_mean_scan_length()))
+        lines.append('  filter checks: %d' % self._counters['filter_checks'])
+        lines.append('  map lookups: %d' % self._counters['map_lookups'])
+        lines.append('  nodes: %d' % sum(self._nodes.values()))
+
+        for name, count in self._nodes.most_common():
+            lines.append('    %-28s %10d' % (name, count))
+
+        file.write(''.join(x + '\n' for x in lines))
+
@@ -1,5 +1,7 @@
 import collections
-import ast.mixins.named
+import devconf.ast.mixins.named
+
+import devconf.visitor
 
 
 class NoNamespaceError(Exception):
@@ -17,26 +19,30 @@ class NameRedefinitionError(Exception):
 GetSymbolResult = collections.namedtuple('GetSymbolResult', ['symbol', 'namespace'])
 
 
-class Namespace(ast.mixins.named.Named):
+class Namespace(devconf.ast.mixins.named.Named):
+    __slots__ = ('_name', '_parent', '_serial', '_members', '_namespaces', '_index', '_containing')
+
     def __init__(self):
         super().__init__()
 
         self._parent: 'Namespace' or None = None
+        self._serial = 0
 
         self._members = []
         self._namespaces = []
 
+        # name -> symbol, kept in sync with the ordered self._members list
+        self._index = {}
+
+        # member name -> child namespaces declaring a member of that name
+        self._containing = {}
+
     def __str__(self):
         members = ', '.join((x.get_name() for x in self._members))
         return 'Namespace[%s]{%s' % (self.get_name('not named yet'), members)
 
     def __contains__(self, name: str):
-        symbol = next((x for x in self._members if x.get_name() == name), None)
-
-        if symbol is None:
-            return False
-
-        return True
+        return name in self._index
 
     def get_parent(self):
         return self._parent
@@ -44,27 +50,28 @@ class Namespace(ast.mixins.named.Named):
     def set_parent(self, parent: 'Namespace'):
         self._parent = parent
 
-    def _get_symbol(self, name: str) -> ast.mixins.named.Named or None:
-        symbol = next((x for x in self._members if x.get_name() == name), None)
+    def get_serial(self) -> int:
+        return self._serial
 
-        if symbol is not None:
-            return symbol
+    def set_serial(self, serial: int):
+        self._serial = int(serial)
 
-        if self._parent is not None:
-            assert isinstance(self._parent, Namespace)
+    def _get_symbol(self, name: str) -> devconf.ast.mixins.named.Named or None:
+        namespace = self
+
+        while namespace is not None:
+            assert isinstance(namespace, Namespace)
 
-            symbol = self._parent._get_symbol(name)
+            symbol = namespace._index.get(name)
 
             if symbol is not None:
                 return symbol
 
-            else:
-                return None
+            namespace = namespace._parent
 
-        else:
-            return None
+        return None
 
-    def get_symbol(self, name: str) -> ast.mixins.named.Named:
+    def get_symbol(self, name: str) -> devconf.ast.mixins.named.Named:
         symbol = self._get_symbol(name)
 
         if symbol is None:
@@ -77,11 +84,20 @@ class Namespace(ast.mixins.named.Named):
 
         return self._members
 
-    def add_symbol(self, symbol: ast.mixins.named.Named):
-        if self._get_symbol(symbol.get_name()) is not None:
+    def add_symbol(self, symbol: devconf.ast.mixins.named.Named):
+        name = symbol.get_name()
+
+        if self._get_symbol(name) is not None:
             raise NameRedefinitionError()
 
         self._members.append(symbol)
+        self._index[name] = symbol
+
+        if self._parent is not None:
+            self._parent._containing.setdefault(name, set()).add(self)
+
+    def get_namespaces_containing(self, name: str) -> set:
+        return self._containing.get(name, set())
 
     def add_namespace(self, namespace: 'Namespace'):
         assert isinstance(namespace, Namespace)
@@ -100,24 +116,20 @@ class SymbolTable(object):
         self._root: Namespace or None = None
         self._current: Namespace or None = None
 
-    def __str__(self):
-        def iterate(ns: Namespace):
-            ns_self = str(ns)
-            ns_members = ', '.join((iterate(x) for x in self._namespaces if x.get_parent() is ns))
-
-            if ns_members:
-                return '%s, %s}' % (ns_self, ns_members)
+        # namespace name -> earliest created namespace carrying that name
+        self._named = {}
 
-            else:
-                return '%s}' % ns_self
-
-        return iterate(self._root)
+    def __str__(self):
+        return ''.join(_SymbolTableFormatter(self._namespaces).walk(self._root))
 
     def get_root(self) -> Namespace:
         assert isinstance(self._root, Namespace)
 
         return self._root
 
+    def get_current_namespace(self) -> Namespace or None:
+        return self._current
+
     def pop_namespace(self):
         if self._current is None:
             raise NoNamespaceError()
@@ -130,11 +142,13 @@ class SymbolTable(object):
 
     def push_namespace(self):
         namespace = Namespace()
+        namespace.set_serial(len(self._namespaces))
         self._namespaces.append(namespace)
 
         if self._root is None:
             # no namespace has been created yet
             namespace.set_name('root')
+            self._named['root'] = namespace
 
             self._root = namespace
             self._current = namespace
@@ -146,6 +160,11 @@ class SymbolTable(object):
     def set_namespace_name(self, name: str):
         self._current.set_name(name)
 
+        named = self._named.get(name)
+
+        if named is None or named.get_serial() > self._current.get_serial():
+            self._named[name] = self._current
+
     def get_symbol(self, name: str, **kwargs) -> GetSymbolResult:
         namespace = kwargs.get('start', self._current)
 
@@ -158,34 +177,62 @@ class SymbolTable(object):
         else:
             symbol = None
 
-        # retrieve namespaces
-        def iterate(ns: Namespace) -> Namespace or None:
-            assert isinstance(ns, Namespace) or ns is None
-
-            if ns is None:
-                return ns
-
-            def check_namespace(_x: Namespace) -> bool:
-                assert isinstance(_x, Namespace)
+        # retrieve namespaces: a namespace carrying the name matches on
+        # every level, otherwise the first child namespace of the closest
+        # enclosing scope that declares the name wins
+        named = self._named.get(name)
 
-                match = ((_x.get_parent() == ns) and name in _x)
+        ns = namespace
 
-                if _x.has_name():
-                    match = match or (_x.get_name() == name)
+        while ns is not None:
+            candidates = ns.get_namespaces_containing(name)
 
-                return match
+            if named is not None:
+                candidates = candidates | {named}
 
-            x = next((x for x in self._namespaces if check_namespace(x)), None)
+            if candidates:
+                return GetSymbolResult(symbol, min(candidates, key=Namespace.get_serial))
 
-            if x is not None:
-                return x
+            ns = ns.get_parent()
 
-            return iterate(ns.get_parent())
+        return GetSymbolResult(symbol, None)
 
-        return GetSymbolResult(symbol, iterate(namespace))
-
-    def add_symbol(self, symbol: ast.mixins.named.Named):
+    def add_symbol(self, symbol: devconf.ast.mixins.named.Named):
         if self._current is None:
             raise NoNamespaceError()
 
         self._current.add_symbol(symbol)
+
+
+class NamespaceVisitor(devconf.visitor.Visitor):
+    # walks namespaces as well as syntax trees, the members of a namespace
+    # are visited before its nested namespaces
+    @devconf.visitor.children(Namespace)
+    def _namespace_children(self, namespace: Namespace) -> list:
+        return namespace.get_members() + namespace.get_namespaces()
+
+
+class _SymbolTableFormatter(NamespaceVisitor):
+    def __init__(self, namespaces: list):
+        super().__init__()
+
+        # every namespace created so far, including those not closed yet
+        self._nested = {}
+
+        for x in namespaces:
+            self._nested.setdefault(x.get_parent(), []).append(x)
+
+    @devconf.visitor.children(Namespace)
+    def _nested_namespaces(self, namespace: Namespace) -> list or None:
+        return self._nested.get(namespace)
+
+    @devconf.visitor.enter(Namespace)
+    def _enter_namespace(self, namespace: Namespace):
+        if namespace.get_parent() is None:
+            return str(namespace),
+
+        return ', ', str(namespace)
+
+    @devconf.visitor.leave(Namespace)
+    def _leave_namespace(self, namespace: Namespace):
+        return '}',
@@ -0,0 +1,266 @@
+import os
+import json
+import time
+import functools
+import threading
+import contextlib
+import collections
+
+import devconf.ast.expression
+import devconf.ast.mixins.named
+
+import devconf.symbols.table
+
+# categories of events
+PARSER = 'parser'
+SYMBOLS = 'symbols'
+EXPRESSIONS = 'expressions'
+
+# An event is reported once the call it describes has returned. The timestamp
+# is the start of the call and both it and the duration are in nanoseconds of
+# time.perf_counter_ns(). The location is the file and line of the input the
+# call was made for, args holds details depending on the event.
+Event = collections.namedtuple('Event', [
+    'name',
+    'category',
+    'timestamp',
+    'duration',
+    'thread',
+    'filename',
+    'line',
+    'args',
+])
+
+_subscribers = []
+_patches = []
+
+# guards subscribing and unsubscribing, which install and remove the hooks
+_lock = threading.Lock()
+
+# file and line of the grammar action running in a thread, the location of
+# events without a syntax tree node of their own
+_state = threading.local()
+
+
+def _get_location() -> tuple:
+    return getattr(_state, 'location', ('', 0))
+
+
+def is_enabled() -> bool:
+    return bool(_subscribers)
+
+
+def subscribe(callback) -> None:
+    # callback is called with every event until it is unsubscribed; the hooks
+    # are only installed while there are subscribers, so tracing costs
+    # nothing otherwise
+    with _lock:
+        if not _subscribers:
+            _install()
+
+        _subscribers.append(callback)
+
+
+def unsubscribe(callback) -> None:
+    with _lock:
+        _subscribers.remove(callback)
+
+        if not _subscribers:
+            _uninstall()
+
+
+@contextlib.contextmanager
+def subscribed(callback):
+    subscribe(callback)
+
+    try:
+        yield callback
+
+    finally:
+        unsubscribe(callback)
+
+
+def emit(name: str, category: str, start: int, filename: str, line: int, args: dict or None = None) -> None:
+    duration = time.perf_counter_ns() - start
+    event = Event(name, category, start, duration, threading.get_ident(), filename, line, args or {})
+
+    # a copy, another thread may subscribe meanwhile
+    for callback in tuple(_subscribers):
+        callback(event)
+
+
+def _patch(cls, name: str, make_wrapper) -> None:
+    original = cls.__dict__[name]
+    _patches.append((cls, name, original))
+    setattr(cls, name, functools.wraps(original)(make_wrapper(original)))
+
+
+def _install() -> None:
+    _patch(devconf.symbols.table.SymbolTable, 'push_namespace', _wrap_push_namespace)
+    _patch(devconf.symbols.table.SymbolTable, 'pop_namespace', _wrap_pop_namespace)
+    _patch(devconf.symbols.table.SymbolTable, 'add_symbol', _wrap_add_symbol)
+    _patch(devconf.symbols.table.SymbolTable, 'get_symbol', _wrap_get_symbol)
+    _patch(devconf.ast.expression.AssignmentExpression, 'perform', _wrap_perform)
+
+
+def _uninstall() -> None:
+    while _patches:
+        cls, name, original = _patches.pop()
+        setattr(cls, name, original)
+
+
+def _wrap_push_namespace(f):
+    def push_namespace(table):
+        start = time.perf_counter_ns()
+
+        try:
+            return f(table)
+
+        finally:
+            emit('push_namespace', SYMBOLS, start, *_get_location())
+
+    return push_namespace
+
+
+def _wrap_pop_namespace(f):
+    def pop_namespace(table):
+        # the namespace is named by the time it is closed
+        current = table.get_current_namespace()
+        name = current.get_name('') if current is not None else ''
+        start = time.perf_counter_ns()
+
+        try:
+            return f(table)
+
+        finally:
+            emit('pop_namespace', SYMBOLS, start, *_get_location(), {'namespace': name})
+
+    return pop_namespace
+
+
+def _wrap_add_symbol(f):
+    def add_symbol(table, symbol):
+        start = time.perf_counter_ns()
+
+        try:
+            return f(table, symbol)
+
+        finally:
+            emit('add_symbol', SYMBOLS, start, *_get_location(), {'name': symbol.get_name()})
+
+    return add_symbol
+
+
+def _wrap_get_symbol(f):
+    def get_symbol(table, name, **kwargs):
+        start = time.perf_counter_ns()
+        result = None
+
+        try:
+            result = f(table, name, **kwargs)
+
+            return result
+
+        finally:
+            found = result is not None and (result.symbol is not None or result.namespace is not None)
+
+            emit('get_symbol', SYMBOLS, start, *_get_location(), {'name': name, 'found': found})
+
+    return get_symbol
+
+
+def _wrap_perform(f):
+    def perform(expression):
+        start = time.perf_counter_ns()
+
+        try:
+            return f(expression)
+
+        finally:
+            lhs = expression.get_lhs()
+            args = {'lhs': lhs.get_name()} if isinstance(lhs, devconf.ast.mixins.named.Named) else None
+
+            emit('perform', EXPRESSIONS, start, expression.get_file_name(), expression.get_line_number(), args)
+
+    return perform
+
+
+def _wrap_action(f, context):
+    name = f.__name__
+
+    def action(p):
+        location = context.get_file_name(), p.lineno(1) if len(p) > 1 else p.lexer.lineno
+        _state.location = location
+
+        start = time.perf_counter_ns()
+
+        try:
+            f(p)
+
+        finally:
+            emit(name, PARSER, start, *location)
+
+    return action
+
+
+@contextlib.contextmanager
+def actions(productions: list, context):
+    # traces the grammar actions of productions, the productions of the LR
+    # parser running a single parse, bound to the actions of its
+    # parser.parser.CompileContext
+    bound = [(x, x.callable) for x in productions if x.callable is not None]
+    location = _get_location()
+
+    for production, f in bound:
+        production.callable = _wrap_action(f, context)
+
+    try:
+        yield
+
+    finally:
+        for production, f in bound:
+            production.callable = f
+
+        _state.location = location
+
+
+class Recorder(object):
+    # a subscriber keeping all events
+    def __init__(self):
+        self._events = []
+
+    def __call__(self, event: Event) -> None:
+        self._events.append(event)
+
+    def get_events(self) -> list:
+        return self._events
+
+
+def to_chrome_trace(events: list) -> dict:
+    # the trace event format read by chrome://tracing and Perfetto, each call
+    # becomes a complete event with timestamps in microseconds
+    pid = os.getpid()
+    trace_events = []
+
+    for x in events:
+        args = dict(x.args)
+        args['file'] = x.filename
+        args['line'] = x.line
+
+        trace_events.append({
+            'name': x.name,
+            'cat': x.category,
+            'ph': 'X',
+            'ts': x.timestamp / 1000,
+            'dur': x.duration / 1000,
+            'pid': pid,
+            'tid': x.thread,
+            'args': args,
+        })
+
+    return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+
+def write_chrome_trace(events: list, file) -> None:
+    json.dump(to_chrome_trace(events), file)
+    file.write('\n')
@@ -0,0 +1,177 @@
+import devconf.ast.mixins.node
+
+# hook kinds, in the order they are resolved for a node class
+ENTER = 'enter'
+LEAVE = 'leave'
+CHILDREN = 'children'
+
+KINDS = (ENTER, LEAVE, CHILDREN)
+
+
+def _hook(kind: str, classes: tuple):
+    assert kind in KINDS
+    assert all(isinstance(x, type) for x in classes)
+
+    def decorate(f):
+        f.__dict__.setdefault('_visitor_hooks', []).extend((kind, x) for x in classes)
+
+        return f
+
+    return decorate
+
+
+def enter(*classes):
+    # marks a method called with every node of one of classes before its
+    # children are visited
+    return _hook(ENTER, classes)
+
+
+def leave(*classes):
+    # marks a method called with every node of one of classes after its
+    # children have been visited, pruned nodes included
+    return _hook(LEAVE, classes)
+
+
+def children(*classes):
+    # marks a method returning the children of the nodes of one of classes,
+    # None for a leaf
+    return _hook(CHILDREN, classes)
+
+
+class Visitor(object):
+    # Hooks are methods registered for node classes with the decorators above
+    # and are resolved along the method resolution order of a node's class,
+    # the most specific class wins. The resolution is cached per visitor class
+    # and node class, so visiting a node costs a single lookup.
+    #
+    # An enter or leave hook returns None or an iterable whose items walk()
+    # yields, which makes generator functions suitable hooks.
+
+    def __init__(self):
+        super().__init__()
+
+        self._pruned = False
+
+    @classmethod
+    def _get_hooks(cls) -> dict:
+        hooks = cls.__dict__.get('_hooks')
+
+        if hooks is None:
+            # names rather than functions are kept, so overriding a hook
+            # method without decorating it again replaces the hook
+            hooks = {x: {} for x in KINDS}
+
+            for klass in reversed(cls.__mro__):
+                for name, f in vars(klass).items():
+                    for kind, node_class in getattr(f, '_visitor_hooks', ()):
+                        hooks[kind][node_class] = name
+
+            cls._hooks = hooks
+
+        return hooks
+
+    @classmethod
+    def _get_dispatch(cls) -> dict:
+        dispatch = cls.__dict__.get('_dispatch')
+
+        if dispatch is None:
+            dispatch = {}
+            cls._dispatch = dispatch
+
+        return dispatch
+
+    @classmethod
+    def _resolve(cls, node_class: type) -> tuple:
+        hooks = cls._get_hooks()
+        resolved = []
+
+        for kind in KINDS:
+            table = hooks[kind]
+            name = next((table[x] for x in node_class.__mro__ if x in table), None)
+
+            resolved.append(None if name is None else getattr(cls, name))
+
+        resolved = tuple(resolved)
+        cls._get_dispatch()[node_class] = resolved
+
+        return resolved
+
+    @children(devconf.ast.mixins.node.Node)
+    def _node_children(self, node: devconf.ast.mixins.node.Node) -> list:
+        return node.get_children()
+
+    def prune(self) -> None:
+        # called from an enter hook, skips the children of the current node
+        self._pruned = True
+
+    def walk(self, root):
+        # depth first and without recursion, so the depth of the tree is not
+        # limited by the interpreter's stack
+        dispatch = self._get_dispatch()
+        resolve = self._resolve
+
+        stack = [(None, None, iter((root,)))]
+        push = stack.append
+
+        while stack:
+            node, on_leave, pending = stack[-1]
+
+            for child in pending:
+                hooks = dispatch.get(type(child))
+
+                if hooks is None:
+                    hooks = resolve(type(child))
+
+                on_enter, child_leave, get_children = hooks
+
+                if on_enter is not None:
+                    self._pruned = False
+                    result = on_enter(self, child)
+
+                    if result is not None:
+                        yield from result
+
+                    if self._pruned:
+                        get_children = None
+
+                grandchildren = None if get_children is None else get_children(self, child)
+
+                if grandchildren or child_leave is not None:
+                    # descend, the remaining siblings stay on the stack
+                    push((child, child_leave, iter(grandchildren or ())))
+                    break
+
+            else:
+                stack.pop()
+
+                if on_leave is not None:
+                    result = on_leave(self, node)
+
+                    if result is not None:
+                        yield from result
+
+    def visit(self, root) -> None:
+        for _ in self.walk(root):
+            pass
+
+
+class Freezer(Visitor):
+    # freezes the child lists of a complete syntax tree. Variables and
+    # descriptions are shared by every node using them, so the tree is a DAG
+    # and each node is only descended into the first time it is reached.
+    def __init__(self):
+        super().__init__()
+
+        self._seen = set()
+
+    @enter(devconf.ast.mixins.node.Node)
+    def _enter(self, node: devconf.ast.mixins.node.Node) -> None:
+        if id(node) in self._seen:
+            self.prune()
+
+        else:
+            self._seen.add(id(node))
+
+    @leave(devconf.ast.mixins.node.Node)
+    def _freeze(self, node: devconf.ast.mixins.node.Node) -> None:
+        node.freeze()
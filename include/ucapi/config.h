@@ -0,0 +1,131 @@
+#ifndef UCAPI_CONFIG_H_INCLUDED
+#define UCAPI_CONFIG_H_INCLUDED
+
+#include <float.h>
+#include <stddef.h>
+#include <stdint.h>
+#include <string.h>
+#include <stdbool.h>
+
+/*
+ * Accessors for configuration blobs created by the devconf blob generator.
+ * A blob is a static const union whose member bytes holds the packed values,
+ * fields are identified by the offsets of the generated enumeration. Fields
+ * are stored little endian and are aligned to their size, integers take 64
+ * bits and floating point values are IEEE 754 doubles of 64 bits. A blob
+ * refuses to compile for a big endian target or a target whose double is
+ * narrower, such as AVR.
+ */
+
+/** The location of a string within a configuration blob. */
+struct ucapi_config_string
+{
+    /** The offset of the first character, the string is NUL terminated. */
+    uint32_t offset;
+
+    /** The number of bytes of the string without the terminating NUL. */
+    uint32_t length;
+};
+
+/**
+ * @brief      Reads an integer field of a configuration blob.
+ *
+ * @param[in]  blob    The bytes of the configuration blob.
+ * @param[in]  offset  The offset of the field.
+ *
+ * @return     The value of the field.
+ */
+static inline int64_t ucapi_config_integer(const unsigned char* blob, size_t offset)
+{
+    int64_t value;
+
+    memcpy(&value, blob + offset, sizeof(value));
+
+    return value;
+}
+
+/**
+ * @brief      Reads a floating point field of a configuration blob.
+ *
+ * @param[in]  blob    The bytes of the configuration blob.
+ * @param[in]  offset  The offset of the field.
+ *
+ * @return     The value of the field.
+ */
+static inline double ucapi_config_float(const unsigned char* blob, size_t offset)
+{
+    double value;
+
+    memcpy(&value, blob + offset, sizeof(value));
+
+    return value;
+}
+
+/**
+ * @brief      Reads a boolean field of a configuration blob.
+ *
+ * @param[in]  blob    The bytes of the configuration blob.
+ * @param[in]  offset  The offset of the field.
+ *
+ * @return     The value of the field.
+ */
+static inline bool ucapi_config_boolean(const unsigned char* blob, size_t offset)
+{
+    return blob[offset] != 0;
+}
+
+/**
+ * @brief      Reads a string field of a configuration blob.
+ *
+ * @param[in]  blob    The bytes of the configuration blob.
+ * @param[in]  offset  The offset of the field.
+ *
+ * @return     The NUL terminated string the field refers to.
+ */
+static inline const char* ucapi_config_string(const unsigned char* blob, size_t offset)
+{
+    struct ucapi_config_string s;
+
+    memcpy(&s, blob + offset, sizeof(s));
+
+    return (const char*)(blob + s.offset);
+}
+
+/**
+ * @brief      Gets the length of a string field of a configuration blob.
+ *
+ * @param[in]  blob    The bytes of the configuration blob.
+ * @param[in]  offset  The offset of the field.
+ *
+ * @return     The number of bytes of the string without the terminating NUL.
+ */
+static inline size_t ucapi_config_string_length(const unsigned char* blob, size_t offset)
+{
+    struct ucapi_config_string s;
+
+    memcpy(&s, blob + offset, sizeof(s));
+
+    return s.length;
+}
+
+/** Accessors taking the generated blob and a field of its enumeration. */
+#define UCAPI_CONFIG_INTEGER(config, field) ucapi_config_integer((config).bytes, (field))
+#define UCAPI_CONFIG_FLOAT(config, field) ucapi_config_float((config).bytes, (field))
+#define UCAPI_CONFIG_BOOLEAN(config, field) ucapi_config_boolean((config).bytes, (field))
+#define UCAPI_CONFIG_STRING(config, field) ucapi_config_string((config).bytes, (field))
+#define UCAPI_CONFIG_STRING_LENGTH(config, field) ucapi_config_string_length((config).bytes, (field))
+
+/**
+ * An entry of the table emitted by the devconf lookup generator, whose lookup
+ * function returns the entry of a macro name.
+ */
+struct ucapi_config_lookup_entry
+{
+    /** The name of the macro. */
+    const char* name;
+
+    /** The value of the macro as written in its definition. */
+    const char* value;
+};
+
+#endif /* UCAPI_CONFIG_H_INCLUDED */
@@ -0,0 +1,83 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the tests import the package from the tree they are part of
+sys.path.insert(0, ROOT)
+
+import devconf.compiler
+import devconf.benchmark
+import devconf.ast.value
+
+# a configuration using every part of the language, two source files named by
+# line markers included
+SAMPLE = r'''#line 1 "board dc$#.dc"
+struct uart {
+    int baud { allow { [1 .. 115200], 230400 }; deny { 0 }; default = 9600; map { 9600 = 1, 115200 = 2 }; };
+    bool enabled { default = false; };
+    string name { default = "uart"; };
+};
+int clock { allow { [..100000000] }; default = 16000000; const { HSI = 16000000, HSE = 8000000 }; };
+clock = clock::HSE;
+const int fixed;
+fixed = 3;
+struct uart uart0;
+uart0.baud = 115200;
+uart0.enabled = true;
+namespace board {
+    struct port { int pin { default = 1; }; bool on { default = false; }; };
+    struct port p0;
+    struct port p1;
+    p1.pin = 4;
+    namespace inner {
+        float f { default = 1.5; };
+        int x;
+        x = 7;
+    }
+    inner::x = 42;
+    int y;
+    y = inner::x;
+}
+::board::p0.on = true;
+board::p1.pin = 9;
+string s;
+s = "hello \"world\"";
+#line 40 "other.dc"
+bool b;
+b = false;
+int m { map { 1 = 10, 2 = 20, 1 = 11 }; };
+m = 1;
+'''
+
+SAMPLE_SOURCES = ['board dc$#.dc', 'other.dc']
+
+# the headers included by generated code
+INCLUDE = os.path.join(ROOT, 'include')
+
+
+def integer(value: int) -> devconf.ast.value.IntegerValue:
+    v = devconf.ast.value.IntegerValue()
+    v.set_value(value)
+
+    return v
+
+
+@pytest.fixture
+def sample_file(tmp_path) -> str:
+    path = tmp_path / 'sample.dc'
+    path.write_text(SAMPLE)
+
+    return str(path)
+
+
+@pytest.fixture(scope='session')
+def synthetic() -> str:
+    return devconf.benchmark.SyntheticConfig(devconf.benchmark.BASE_PARAMETERS, seed=7).text()
+
+
+@pytest.fixture(scope='session')
+def parser():
+    return devconf.compiler.create_parser()
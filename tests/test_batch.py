@@ -0,0 +1,71 @@
+import concurrent.futures
+
+import pytest
+
+import devconf
+import devconf.compiler
+
+from conftest import SAMPLE
+
+
+def _texts(synthetic: str) -> list:
+    return [SAMPLE, synthetic] + [SAMPLE + 'int extra%d;\nextra%d = %d;\n' % (i, i, i) for i in range(6)]
+
+
+def _batch(tmp_path, texts: list, mode: str, **kwargs) -> list:
+    # compiles every text in the given mode, returns the headers and the
+    # errors with the mode's directory taken out
+    options = {
+        'serial': {'workers': 1},
+        'threads': {'workers': 4, 'threads': True},
+        'processes': {'workers': 2},
+    }[mode]
+
+    directory = tmp_path / mode
+    directory.mkdir()
+
+    jobs = []
+
+    for n, text in enumerate(texts):
+        (directory / ('in%d.dc' % n)).write_text(text)
+        jobs.append((str(directory / ('in%d.dc' % n)), str(directory / ('out%d.h' % n))))
+
+    jobs.append((str(directory / 'missing.dc'), str(directory / 'missing.h')))
+
+    results = []
+
+    for (infile, outfile), result in zip(jobs, devconf.compile_many(jobs, **options, **kwargs)):
+        assert result[:2] == (infile, outfile)
+
+        if result[2] is None:
+            with open(outfile) as file:
+                results.append(file.read())
+
+        else:
+            results.append(result[2].replace(str(directory), ''))
+
+    return results
+
+
+@pytest.mark.parametrize('format, prefix', [('macro', None), ('lookup', 'board')])
+def test_modes_produce_the_same_headers(tmp_path, synthetic: str, format: str, prefix: str or None):
+    texts = _texts(synthetic)
+
+    serial = _batch(tmp_path, texts, 'serial', format=format, prefix=prefix)
+
+    assert serial[:-1] == [devconf.compile_string(x, format=format, prefix=prefix) for x in texts]
+    assert serial[-1].startswith('FileNotFoundError: ')
+
+    assert _batch(tmp_path, texts, 'threads', format=format, prefix=prefix) == serial
+    assert _batch(tmp_path, texts, 'processes', format=format, prefix=prefix) == serial
+
+
+def test_parser_is_shared_between_threads(parser, synthetic: str):
+    # contexts keep every parse apart, so concurrent parses must not mix
+    texts = _texts(synthetic) * 4
+    expected = [devconf.compile_string(x) for x in texts]
+
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        headers = list(executor.map(lambda x: devconf.compiler.compile_text(x, p=parser), texts))
+
+    assert headers == expected
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+import devconf
+import devconf.compiler
+
+from conftest import SAMPLE, SAMPLE_SOURCES
+
+
+class _NoParser(object):
+    # stands in for the parser where a compilation must be served from the
+    # cache
+    def create_context(self, filename=None):
+        raise AssertionError('The cache was missed.')
+
+
+def _compile(tmp_path, infile: str, p=None, format: str = 'macro', prefix: str or None = None) -> str:
+    outfile = str(tmp_path / 'out.h')
+
+    config = devconf.compiler.DeviceConfiguration(infile, outfile, outfile + '.d',
+                                                  generator_class=devconf.compiler.get_generator(format),
+                                                  prefix=prefix)
+    config.compile(p, devconf.compiler.open_cache(str(tmp_path / 'cache')))
+
+    with open(outfile) as file:
+        return file.read()
+
+
+def test_hit_reproduces_output_and_depfile(tmp_path, sample_file: str):
+    header = _compile(tmp_path, sample_file)
+
+    with open(str(tmp_path / 'out.h.d')) as file:
+        depfile = file.read()
+
+    os.remove(str(tmp_path / 'out.h'))
+    os.remove(str(tmp_path / 'out.h.d'))
+
+    assert _compile(tmp_path, sample_file, _NoParser()) == header == devconf.compile_string(SAMPLE)
+
+    with open(str(tmp_path / 'out.h.d')) as file:
+        assert file.read() == depfile
+
+
+def test_changed_input_misses(tmp_path, sample_file: str):
+    _compile(tmp_path, sample_file)
+
+    with open(sample_file, 'at') as file:
+        file.write('int added;\nadded = 5;\n')
+
+    with pytest.raises(AssertionError):
+        _compile(tmp_path, sample_file, _NoParser())
+
+    assert '#define DC_ADDED 5\n' in _compile(tmp_path, sample_file)
+
+
+@pytest.mark.parametrize('format, prefix', [('blob', None), ('macro', 'board')])
+def test_generator_options_are_part_of_the_key(tmp_path, sample_file: str, format: str, prefix: str or None):
+    _compile(tmp_path, sample_file)
+
+    with pytest.raises(AssertionError):
+        _compile(tmp_path, sample_file, _NoParser(), format, prefix)
+
+    assert _compile(tmp_path, sample_file, None, format, prefix) == devconf.compile_string(SAMPLE, '', format, prefix)
+
+
+def test_entry_keeps_source_files(tmp_path):
+    cache = devconf.compiler.open_cache(str(tmp_path / 'cache'))
+    options = devconf.compiler.get_generator_options(devconf.compiler.get_generator('macro'))
+    key = cache.key(SAMPLE.encode('utf-8'), options)
+
+    assert cache.load(key, str(tmp_path / 'miss.h')) is None
+    assert not os.path.exists(str(tmp_path / 'miss.h'))
+
+    (tmp_path / 'header.h').write_text('#define DC_X 1\n')
+    cache.store(key, str(tmp_path / 'header.h'), SAMPLE_SOURCES)
+
+    assert cache.load(key, str(tmp_path / 'hit.h')) == SAMPLE_SOURCES
+    assert (tmp_path / 'hit.h').read_text() == '#define DC_X 1\n'
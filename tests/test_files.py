@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+import devconf
+import devconf.files
+import devconf.compiler
+
+from conftest import SAMPLE
+
+
+def test_depfile_escapes_make_specials(tmp_path):
+    depfile = str(tmp_path / 'out.h.d')
+
+    devconf.files.write_depfile(depfile, 'out dir/out.h', ['a b.dc', 'price$.dc', 'no#te.dc', 'plain.dc'])
+
+    with open(depfile) as file:
+        assert file.read() == 'out\\ dir/out.h: \\\n  a\\ b.dc \\\n  price$$.dc \\\n  no\\#te.dc \\\n  plain.dc\n'
+
+
+def test_depfile_lists_input_and_line_marker_files(tmp_path, sample_file: str):
+    outfile = str(tmp_path / 'out.h')
+
+    devconf.compiler.DeviceConfiguration(sample_file, outfile, outfile + '.d').compile()
+
+    with open(outfile + '.d') as file:
+        rules = file.read()
+
+    assert rules.split(' \\\n  ') == [outfile.replace(' ', '\\ ') + ':', sample_file.replace(' ', '\\ '),
+                                        'board\\ dc$$\\#.dc', 'other.dc\n']
+
+
+def test_depfile_for_standard_output_is_rejected(sample_file: str):
+    with pytest.raises(devconf.compiler.CompileError):
+        devconf.compiler.DeviceConfiguration(sample_file, '-', '-.d')
+
+
+def test_unchanged_output_is_left_alone(tmp_path):
+    path = str(tmp_path / 'out.h')
+
+    with devconf.files.replace_if_changed(path) as file:
+        file.write('same\n')
+
+    os.utime(path, (0, 0))
+
+    with devconf.files.replace_if_changed(path) as file:
+        file.write('same\n')
+
+    assert os.stat(path).st_mtime == 0
+    assert os.listdir(str(tmp_path)) == ['out.h']
+
+
+def test_crlf_file_compiles_to_standard_output(tmp_path, capfd):
+    path = tmp_path / 'crlf.dc'
+    path.write_bytes(SAMPLE.replace('\n', '\r\n').encode('utf-8'))
+
+    devconf.compiler.DeviceConfiguration(str(path), '-').compile()
+
+    assert capfd.readouterr() == (devconf.compile_string(SAMPLE), '')
@@ -0,0 +1,54 @@
+import pytest
+
+import devconf
+
+from conftest import integer
+
+
+def _description(parser, declaration: str):
+    _, symbol_table = parser.parse(declaration)
+
+    return symbol_table.get_symbol('a', start=symbol_table.get_root()).symbol.get_description()
+
+
+def test_overlapping_and_open_intervals_are_merged(parser):
+    description = _description(parser, 'int a { allow { [1 .. 10], [5 .. 20], 30, [40 ..] }; deny { [.. -5] }; };\n')
+    allow = description.get_allow_filter().get_predicate_list()
+    deny = description.get_deny_filter().get_predicate_list()
+
+    assert allow.get_intervals() == [(1, 20), (40, float('inf'))]
+    assert allow.get_discrete_values() == {30}
+    assert deny.get_intervals() == [(float('-inf'), -5)]
+
+
+def test_empty_range_never_matches(parser):
+    description = _description(parser, 'int a { allow { [10 .. 1], 3 }; };\n')
+
+    assert description.get_allow_filter().get_predicate_list().get_intervals() == []
+    assert description.check_value(integer(3))
+    assert not description.check_value(integer(5))
+
+
+@pytest.mark.parametrize('value, admitted', [
+    (1, True),
+    (20, True),
+    (21, False),
+    (30, True),
+    (15, False),
+    (0, False),
+    (39, False),
+    (10 ** 12, True),
+])
+def test_check_value(parser, value: int, admitted: bool):
+    description = _description(parser, 'int a { allow { [1 .. 10], [5 .. 20], 30, [40 ..] }; deny { 15 }; };\n')
+
+    assert description.check_value(integer(value)) is admitted
+
+
+def test_assignment_outside_the_filter_fails():
+    declaration = 'int a { allow { [1 .. 10] }; };\n'
+
+    assert '#define DC_A 10\n' in devconf.compile_string(declaration + 'a = 10;\n')
+
+    with pytest.raises(AssertionError):
+        devconf.compile_string(declaration + 'a = 11;\n')
@@ -0,0 +1,94 @@
+import math
+import shutil
+import subprocess
+
+import pytest
+
+import devconf
+import devconf.generator
+
+from conftest import SAMPLE, INCLUDE
+
+
+class _Recorder(object):
+    # a file object keeping every write apart
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text: str) -> None:
+        self.writes.append(text)
+
+
+def _macros(parser, text: str) -> devconf.generator.MacroGenerator:
+    syntax_tree, symbol_table = parser.parse(text)
+
+    return devconf.generator.MacroGenerator(syntax_tree, symbol_table)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 4096])
+def test_macros_are_written_in_chunks(monkeypatch, parser, synthetic: str, chunk_size: int):
+    monkeypatch.setattr(devconf.generator.MacroGenerator, 'CHUNK_SIZE', chunk_size)
+
+    recorder = _Recorder()
+    _macros(parser, synthetic).write(recorder)
+
+    lines = sum(x.count('\n') for x in recorder.writes[1:])
+
+    # a blank line, then one write per chunk of lines
+    assert recorder.writes[0] == '\n'
+    assert len(recorder.writes) == 1 + math.ceil(lines / chunk_size)
+    assert ''.join(recorder.writes) == devconf.compile_string(synthetic)
+
+
+def test_macros_are_produced_lazily(parser):
+    lines = _macros(parser, SAMPLE).lines()
+
+    assert next(lines) == '#define DC_CLOCK_VALUE 8000000\n'
+    assert next(lines) == '#define DC_CLOCK 8000000\n'
+
+
+BLOB = 'int a; a = 258; bool b; b = true; float f; f = -1.5; string s; s = "hi";\n'
+
+
+def test_blob_layout(parser):
+    syntax_tree, symbol_table = parser.parse(BLOB)
+    fields, data = devconf.generator.BlobGenerator(syntax_tree, symbol_table).layout()
+
+    # 8 byte numbers first, then string descriptors and booleans, the
+    # strings behind the fields
+    assert fields == [('DC_A_VALUE', 0), ('DC_A', 8), ('DC_B_VALUE', 48), ('DC_B', 49), ('DC_F_VALUE', 16),
+                      ('DC_F', 24), ('DC_S_VALUE', 32), ('DC_S', 40)]
+
+    assert data == bytes.fromhex('0201000000000000' * 2 +
+                                 '000000000000f8bf' * 2 +
+                                 '3200000002000000' * 2 +
+                                 '0101' +
+                                 '686900')
+
+
+def test_blob_refuses_other_targets():
+    header = devconf.compile_string(BLOB, format='blob')
+
+    assert '#if defined(__BYTE_ORDER__) && __BYTE_ORDER__ != __ORDER_LITTLE_ENDIAN__\n' in header
+    assert '#if DBL_MANT_DIG != 53 || DBL_MAX_EXP != 1024\n' in header
+
+
+@pytest.mark.skipif(shutil.which('cc') is None, reason='needs a C compiler')
+def test_blob_accessors_read_every_field(tmp_path):
+    (tmp_path / 'blob.h').write_text(devconf.compile_string(BLOB, format='blob'))
+    (tmp_path / 'main.c').write_text(
+        '#include <stdio.h>\n'
+        '#include "blob.h"\n'
+        'int main(void)\n'
+        '{\n'
+        '    printf("%lld %d %g %s %zu\\n", (long long)UCAPI_CONFIG_INTEGER(dc_config, DC_A),\n'
+        '           UCAPI_CONFIG_BOOLEAN(dc_config, DC_B), UCAPI_CONFIG_FLOAT(dc_config, DC_F),\n'
+        '           UCAPI_CONFIG_STRING(dc_config, DC_S), UCAPI_CONFIG_STRING_LENGTH(dc_config, DC_S));\n'
+        '    return 0;\n'
+        '}\n')
+
+    program = str(tmp_path / 'main')
+    subprocess.run(['cc', '-std=c99', '-Wall', '-Werror', '-I', INCLUDE, '-o', program, str(tmp_path / 'main.c')],
+                   check=True)
+
+    assert subprocess.run([program], check=True, capture_output=True, text=True).stdout == '258 1 -1.5 hi 2\n'
@@ -0,0 +1,116 @@
+import io
+
+import pytest
+
+import devconf
+import devconf.image
+import devconf.compiler
+import devconf.generator
+
+from conftest import SAMPLE, integer
+
+
+def _namespace(parent: devconf.image.Namespace, name: str) -> devconf.image.Namespace:
+    return next(x for x in parent.get_namespaces() if x.get_name() == name)
+
+
+def _generate(generator_class: type, symbol_table) -> str:
+    output = io.StringIO()
+    generator_class(None, symbol_table).write(output)
+
+    return output.getvalue()
+
+
+@pytest.fixture
+def image(parser):
+    _, symbol_table = parser.parse(SAMPLE)
+    table = devconf.image.SymbolTable(devconf.image.dumps(symbol_table))
+
+    try:
+        yield table
+
+    finally:
+        table.close()
+
+
+@pytest.mark.parametrize('format', ['macro', 'blob', 'lookup'])
+def test_image_generates_the_same_header(image, format: str):
+    generator_class = devconf.compiler.get_generator(format)
+
+    assert _generate(generator_class, image) == devconf.compile_string(SAMPLE, format=format)
+
+
+def test_written_image_loads(tmp_path, sample_file: str):
+    path = str(tmp_path / 'sample.img')
+
+    devconf.compile_file(sample_file, str(tmp_path / 'out.h'), image=path)
+
+    with devconf.image.load(path) as table:
+        assert _generate(devconf.generator.MacroGenerator, table) == devconf.compile_string(SAMPLE)
+
+
+def test_symbols_keep_values_and_descriptions(image):
+    root = image.get_root()
+    board = _namespace(root, 'board')
+    uart0 = root.get_symbol('uart0')
+    baud = uart0.get_member('baud')
+
+    assert board.get_symbol('y').get_value().get_value() == 42
+    assert _namespace(board, 'inner').get_symbol('f').get_default().get_value() == 1.5
+    assert root.get_symbol('s').get_value().get_value() == '"hello \\"world\\""'
+    assert root.get_symbol('clock').get_value().get_value() == 8000000
+
+    assert baud.get_value().get_value() == 115200
+    assert baud.get_mapped_value(baud.get_value(), None).get_value() == 2
+    assert baud.get_default().get_value() == 9600
+    assert [baud.check_value(integer(x)) for x in (9600, 0, 200000, 230400)] == [True, False, False, True]
+
+    assert uart0.get_member('enabled').get_value().get_value() is True
+    assert uart0.get_member('missing') is None
+
+
+def test_foreign_data_is_rejected():
+    with pytest.raises(devconf.image.ImageError):
+        devconf.image.SymbolTable(b'not an image at all')
+
+
+def _walk(namespace) -> list:
+    namespaces = [namespace]
+
+    for x in namespace.get_namespaces():
+        namespaces += _walk(x)
+
+    return namespaces
+
+
+def _resolved(result) -> tuple:
+    symbol, namespace = result
+
+    return (None if symbol is None else symbol.get_name(),
+            None if namespace is None else (namespace.get_name(), namespace.get_serial()))
+
+
+def test_symbols_resolve_like_the_symbol_table(parser, image):
+    _, symbol_table = parser.parse(SAMPLE)
+
+    starts = list(zip(_walk(symbol_table.get_root()), _walk(image.get_root())))
+    names = {x.get_name() for namespace, _ in starts for x in namespace.get_members() + [namespace]} | {'missing'}
+
+    assert [x.get_serial() for _, x in starts] == [x.get_serial() for x, _ in starts]
+
+    for name in sorted(names):
+        expected = _resolved(symbol_table.get_symbol(name, start=symbol_table.get_root()))
+
+        assert _resolved(image.get_symbol(name)) == expected
+
+        for namespace, loaded in starts:
+            expected = _resolved(symbol_table.get_symbol(name, start=namespace))
+
+            assert _resolved(image.get_symbol(name, start=loaded)) == expected
+
+
+def test_members_are_indexed(image):
+    uart0 = image.get_root().get_symbol('uart0')
+
+    assert [uart0.get_member(x.get_name()) for x in uart0.get_members()] == uart0.get_members()
+    assert uart0.get_member('baud') is uart0.get_member('baud')
@@ -0,0 +1,29 @@
+import devconf.ast.map
+
+
+def _map(parser, entries: str) -> devconf.ast.map.Map:
+    _, symbol_table = parser.parse('int m { map { %s }; };\n' % entries)
+    m = symbol_table.get_symbol('m', start=symbol_table.get_root()).symbol
+
+    return m.get_description().get_mapping_list()
+
+
+def _values(entry: devconf.ast.map.MapEntry) -> list:
+    return [x.get_value().get_value() for x in entry.get_children()]
+
+
+def test_last_entry_for_a_key_wins(parser):
+    mapping = _map(parser, '1 = 10, 2 = 20, 1 = 11, 1 = 12')
+    entries = mapping.get_children()
+
+    # the replaced values are gone from the tree, not only from the index
+    assert [_values(x) for x in entries] == [[1, 12], [2, 20]]
+    assert entries[0].get_value() is entries[0].get_children()[1]
+    assert entries[0].get_value().get_value().get_value() == 12
+
+
+def test_entries_are_found_by_key(parser):
+    mapping = _map(parser, ', '.join('%d = %d' % (x, x * 10) for x in range(100)))
+    keys = [x.get_key().get_value() for x in mapping.get_children()]
+
+    assert [mapping.get_value(x, None).get_value() for x in keys] == [x * 10 for x in range(100)]
@@ -0,0 +1,61 @@
+import re
+import shutil
+import subprocess
+
+import pytest
+
+import devconf
+import devconf.generator.perfect_hash
+
+from conftest import SAMPLE, INCLUDE
+
+
+@pytest.mark.parametrize('count', [0, 1, 2, 3, 17, 1000, 5000])
+def test_every_key_has_its_own_slot(count: int):
+    keys = ['DC_NS%d_V_%d' % (i % 7, i) for i in range(count)]
+    table = devconf.generator.perfect_hash.build(keys)
+
+    assert sorted(table.slots) == list(range(count))
+    assert [devconf.generator.perfect_hash.lookup(table, x) for x in keys] == table.slots
+
+
+def test_macro_names_of_a_configuration(synthetic: str):
+    names = re.findall(r'^#define (\w+) ', devconf.compile_string(synthetic), re.MULTILINE)
+    table = devconf.generator.perfect_hash.build(names)
+
+    assert [devconf.generator.perfect_hash.lookup(table, x) for x in names] == table.slots
+
+
+def test_duplicate_keys_are_rejected():
+    with pytest.raises(devconf.generator.perfect_hash.PerfectHashError):
+        devconf.generator.perfect_hash.build(['A', 'B', 'A'])
+
+
+@pytest.mark.skipif(shutil.which('cc') is None, reason='needs a C compiler')
+def test_generated_lookup_finds_every_macro(tmp_path):
+    # the C functions of the lookup header must agree with the Python ones
+    macros = re.findall(r'^#define (\w+) (.*)$', devconf.compile_string(SAMPLE), re.MULTILINE)
+
+    (tmp_path / 'lookup.h').write_text(devconf.compile_string(SAMPLE, format='lookup'))
+    (tmp_path / 'main.c').write_text(
+        '#include <stdio.h>\n'
+        '#include "lookup.h"\n'
+        '#include "lookup.h"\n'
+        'int main(int argc, char** argv)\n'
+        '{\n'
+        '    for (int i = 1; i < argc; ++i)\n'
+        '    {\n'
+        '        const struct ucapi_config_lookup_entry* e = dc_lookup(argv[i]);\n'
+        '        printf("%s\\n", e == NULL ? "(none)" : e->value);\n'
+        '    }\n'
+        '    return 0;\n'
+        '}\n')
+
+    program = str(tmp_path / 'main')
+    subprocess.run(['cc', '-std=c99', '-Wall', '-Werror', '-I', INCLUDE, '-o', program, str(tmp_path / 'main.c')],
+                   check=True)
+
+    names = [x for x, _ in macros] + ['DC_MISSING', '']
+    output = subprocess.run([program] + names, check=True, capture_output=True, text=True).stdout
+
+    assert output.splitlines() == [x for _, x in macros] + ['(none)', '(none)']
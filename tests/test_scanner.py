@@ -0,0 +1,58 @@
+import io
+
+import pytest
+
+import devconf.parser.lexer
+import devconf.parser.scanner
+
+from conftest import SAMPLE
+
+
+def _ply_tokens(text: str) -> list:
+    lexer = devconf.parser.lexer.Lexer().lexer
+    lexer.input(text)
+
+    return [(x.type, x.value, x.lineno, x.lexpos) for x in iter(lexer.token, None)]
+
+
+def _scanner_tokens(source) -> list:
+    return [(x.type, x.value, x.lineno, x.lexpos) for x in devconf.parser.scanner.Scanner().scan(source)]
+
+
+@pytest.mark.parametrize('name', ['sample', 'synthetic', 'literals'])
+def test_scanner_matches_ply(name: str, synthetic: str):
+    text = {
+        'sample': SAMPLE,
+        'synthetic': synthetic,
+        'literals': 'a = -12; b = 0x1F; c = 0o17; d = 0; e = .5e-3; f = -1.25; g = "x\\"y"; h = a::b.c;\n\n\t..,[]\n',
+    }[name]
+
+    expected = _ply_tokens(text)
+
+    assert expected
+    assert _scanner_tokens(text) == expected
+    assert _scanner_tokens(text.encode('utf-8')) == expected
+
+
+def test_scanner_reads_streams_in_chunks(monkeypatch, synthetic: str):
+    # chunks far smaller than a line make tokens straddle every boundary
+    monkeypatch.setattr(devconf.parser.scanner, 'CHUNK_SIZE', 7)
+
+    expected = _ply_tokens(synthetic)
+
+    assert _scanner_tokens(io.BytesIO(synthetic.encode('utf-8'))) == expected
+    assert _scanner_tokens(io.StringIO(synthetic)) == expected
+
+
+def test_crlf_line_breaks_are_blanks(capsys, synthetic: str):
+    text = synthetic.replace('\n', '\r\n')
+    expected = [x[:3] for x in _ply_tokens(synthetic)]
+
+    assert [x[:3] for x in _ply_tokens(text)] == expected
+    assert [x[:3] for x in _scanner_tokens(text.encode('utf-8'))] == expected
+    assert capsys.readouterr() == ('', '')
+
+
+def test_illegal_characters_are_reported_on_stderr(capsys):
+    assert [x[0] for x in _scanner_tokens(b'a @= 1;\n')] == ['ID', 'OP_ASSIGN', 'INTEGER_LITERAL', 'EOS']
+    assert capsys.readouterr() == ('', 'Illegal character "@"\n')
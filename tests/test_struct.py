@@ -0,0 +1,82 @@
+import devconf
+import devconf.ast.struct
+
+STRUCTS = '''struct port { int pin { default = 1; }; bool on { default = false; }; };
+struct port p0;
+'''
+
+
+def _outer(parser) -> devconf.ast.struct.StructInstance:
+    # struct members of struct type cannot be declared in the language yet,
+    # the outer struct is put together by hand
+    _, symbol_table = parser.parse(STRUCTS)
+
+    member = devconf.ast.struct.Member()
+    member.set_type(symbol_table.get_symbol('port', start=symbol_table.get_root()).symbol)
+    member.set_name('port')
+
+    member_list = devconf.ast.struct.MemberList()
+    member_list.add_member(member)
+
+    struct = devconf.ast.struct.Struct()
+    struct.set_name('outer')
+    struct.set_members(member_list)
+
+    return struct.create_instance()
+
+
+def test_member_path_resolves_like_chained_members(parser):
+    outer = _outer(parser)
+    pin = outer.get_member_path(['port', 'pin'])
+
+    assert pin is outer.get_member('port').get_member('pin')
+    assert outer.get_member_path(('port', 'pin')) is pin
+    assert outer.get_member_path(('port',)) is outer.get_member('port')
+    assert outer.get_member_path(()) is outer
+
+
+def test_struct_access_assigns_through_the_path(parser):
+    _, symbol_table = parser.parse(STRUCTS + 'p0.pin = 5;\np0.on = true;\np0.pin = 6;\n')
+    p0 = symbol_table.get_symbol('p0', start=symbol_table.get_root()).symbol
+
+    # the assignments resolved their paths through the cache
+    assert set(p0._paths) == {('pin',), ('on',)}
+    assert p0.get_member_path(('pin',)).get_value().get_value() == 6
+    assert p0.get_member_path(('on',)).get_value().get_value() is True
+
+
+def test_struct_access_in_a_namespace():
+    header = devconf.compile_string('namespace n { ' + STRUCTS + '}\nn::p0.pin = 3;\n::n::p0.on = true;\n')
+
+    assert '#define DC_N_P0_PIN 3\n' in header
+    assert '#define DC_N_P0_ON True\n' in header
+
+
+def test_members_are_created_on_first_access(parser):
+    _, symbol_table = parser.parse(STRUCTS + 'struct port p1;\np1.pin = 4;\n')
+    root = symbol_table.get_root()
+    p0 = symbol_table.get_symbol('p0', start=root).symbol
+    p1 = symbol_table.get_symbol('p1', start=root).symbol
+
+    # untouched members are the prototypes all instances share
+    assert p0.get_children() == ()
+    assert [x.get_name() for x in p0.get_members()] == ['pin', 'on']
+    assert p0.get_members()[1] is p1.get_members()[1]
+
+    pin = p1.get_members()[0]
+
+    assert p1.get_children() == (pin,)
+    assert pin is not p0.get_members()[0]
+    assert pin.get_value().get_value() == 4
+
+    # assigning a member leaves the prototype alone
+    assert p0.get_members()[0].get_value().get_value() == 1
+
+
+def test_unassigned_members_are_generated():
+    header = devconf.compile_string(STRUCTS + 'struct port p1;\np1.on = true;\n')
+
+    assert header.split('\n')[1:-1] == [
+        '#define DC_P0_PIN_VALUE 1', '#define DC_P0_PIN 1', '#define DC_P0_ON_VALUE False', '#define DC_P0_ON False',
+        '#define DC_P1_PIN_VALUE 1', '#define DC_P1_PIN 1', '#define DC_P1_ON_VALUE True', '#define DC_P1_ON True',
+    ]
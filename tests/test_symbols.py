@@ -0,0 +1,80 @@
+import pytest
+
+import devconf.ast.variable
+import devconf.symbols.table
+
+from conftest import SAMPLE
+
+
+def _variable(name: str) -> devconf.ast.variable.Variable:
+    v = devconf.ast.variable.Variable()
+    v.set_name(name)
+
+    return v
+
+
+def test_namespace_finds_members_by_name():
+    table = devconf.symbols.table.SymbolTable()
+    table.push_namespace()
+
+    variables = [_variable('v%d' % x) for x in range(1000)]
+
+    for x in variables:
+        table.add_symbol(x)
+
+    root = table.get_root()
+
+    assert root.get_members() == variables
+    assert all(root.get_symbol(x.get_name()) is x for x in variables)
+    assert 'v999' in root and 'v1000' not in root
+
+    with pytest.raises(devconf.symbols.table.UndefinedNameError):
+        root.get_symbol('v1000')
+
+
+def test_nested_namespace_sees_its_parents():
+    table = devconf.symbols.table.SymbolTable()
+    table.push_namespace()
+    table.add_symbol(_variable('a'))
+    table.push_namespace()
+    table.add_symbol(_variable('b'))
+
+    inner = table.get_current_namespace()
+
+    # only the namespace's own members are contained, lookups go outwards
+    assert 'a' not in inner
+    assert inner.get_symbol('a') is table.get_root().get_symbol('a')
+    assert inner.get_symbol('b').get_name() == 'b'
+
+    with pytest.raises(devconf.symbols.table.NameRedefinitionError):
+        table.add_symbol(_variable('a'))
+
+    with pytest.raises(devconf.symbols.table.NameRedefinitionError):
+        table.add_symbol(_variable('b'))
+
+
+def _scan(table: devconf.symbols.table.SymbolTable, name: str, start) -> devconf.symbols.table.Namespace or None:
+    # the linear scan over every namespace the indexes replaced
+    ns = start
+
+    while ns is not None:
+        for x in table._namespaces:
+            if (x.get_parent() is ns and name in x) or (x.has_name() and x.get_name() == name):
+                return x
+
+        ns = ns.get_parent()
+
+    return None
+
+
+@pytest.mark.parametrize('name', ['sample', 'synthetic'])
+def test_namespaces_resolve_like_a_scan(parser, synthetic: str, name: str):
+    _, table = parser.parse({'sample': SAMPLE, 'synthetic': synthetic}[name])
+
+    namespaces = table._namespaces
+    names = {x.get_name() for x in namespaces} | {x.get_name() for ns in namespaces for x in ns.get_members()}
+
+    # a sample of the scopes keeps the quadratic scan short
+    for start in namespaces[::len(namespaces) // 25 + 1]:
+        for x in sorted(names):
+            assert table.get_symbol(x, start=start).namespace is _scan(table, x, start)
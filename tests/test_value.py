@@ -0,0 +1,50 @@
+import devconf.ast.types
+import devconf.ast.value
+import devconf.ast.types.builtin
+
+
+def _type(name: str) -> devconf.ast.types.Type:
+    t = devconf.ast.types.Type()
+    t.set_name(name)
+
+    return t
+
+
+def test_equal_literals_share_a_value():
+    cache = devconf.ast.value.ValueCache()
+
+    assert cache.get(devconf.ast.value.IntegerValue, 5) is cache.get(devconf.ast.value.IntegerValue, 5)
+    assert cache.get(devconf.ast.value.StringValue, '"x"') is cache.get(devconf.ast.value.StringValue, '"x"')
+
+    # equal Python values of different literal kinds or signs stay apart
+    assert cache.get(devconf.ast.value.IntegerValue, 1) is not cache.get(devconf.ast.value.BooleanValue, True)
+    assert cache.get(devconf.ast.value.IntegerValue, 1) is not cache.get(devconf.ast.value.FloatValue, 1.0)
+    assert cache.get(devconf.ast.value.FloatValue, 0.0) is not cache.get(devconf.ast.value.FloatValue, -0.0)
+    assert str(cache.get(devconf.ast.value.FloatValue, -0.0).get_value()) == '-0.0'
+
+
+def test_parses_share_literals_within_a_parse_only(parser):
+    text = 'int a;\na = 5;\nint b;\nb = 5;\n'
+
+    _, first = parser.parse(text)
+    _, second = parser.parse(text)
+
+    def value(table, name):
+        return table.get_symbol(name, start=table.get_root()).symbol.get_value()
+
+    assert value(first, 'a') is value(first, 'b')
+    assert value(first, 'a') is not value(second, 'a')
+
+
+def test_types_compare_by_registry_id():
+    a = _type('port')
+    b = _type('port')
+    c = _type('pin')
+
+    assert a.get_type_id() == b.get_type_id() != c.get_type_id()
+    assert a == b and hash(a) == hash(b) and not a != b
+    assert a != c and not a == c
+    assert a != 'port'
+
+    assert _type('int') == devconf.ast.types.builtin.integer
+    assert len({a, b, c, devconf.ast.types.builtin.integer}) == 3
@@ -0,0 +1,113 @@
+import devconf.ast.mixins.node
+import devconf.visitor
+
+
+class _CountingFreezer(devconf.visitor.Freezer):
+    # counts the nodes whose children the freezer descends into
+    count = 0
+
+    @devconf.visitor.children(devconf.ast.mixins.node.Node)
+    def _node_children(self, node):
+        _CountingFreezer.count += 1
+
+        return super()._node_children(node)
+
+
+def _freeze_count(monkeypatch, parser, text: str) -> int:
+    monkeypatch.setattr(devconf.visitor, 'Freezer', _CountingFreezer)
+    _CountingFreezer.count = 0
+
+    parser.parse(text)
+
+    return _CountingFreezer.count
+
+
+def test_shared_description_is_frozen_once(monkeypatch, parser):
+    # a map shared by every assignment of its variable and every member of
+    # a struct, the work must grow linearly with both
+    def text(n: int) -> str:
+        entries = ', '.join('%d = %d' % (x, x) for x in range(n))
+
+        return ('int m { map { %s }; };\n' % entries + 'm = 1;\n' * n +
+                'struct s { int a { map { %s }; }; };\n' % entries +
+                ''.join('struct s s%d;\ns%d.a = 1;\n' % (x, x) for x in range(n)))
+
+    small = _freeze_count(monkeypatch, parser, text(100))
+    large = _freeze_count(monkeypatch, parser, text(400))
+
+    assert large < 5 * small
+
+
+def test_children_are_frozen(parser, synthetic: str):
+    syntax_tree, _ = parser.parse(synthetic)
+    nodes = [syntax_tree]
+
+    while nodes:
+        node = nodes.pop()
+
+        assert isinstance(node._children, (tuple, type(None)))
+
+        nodes.extend(node.get_children())
+
+
+class _Leaf(devconf.ast.mixins.node.Node):
+    __slots__ = ('name',)
+
+    def __init__(self, name: str, *children):
+        super().__init__()
+
+        self.name = name
+
+        for x in children:
+            self.add_child(x)
+
+
+class _Special(_Leaf):
+    __slots__ = ()
+
+
+class _Tracer(devconf.visitor.Visitor):
+    @devconf.visitor.enter(devconf.ast.mixins.node.Node)
+    def _enter(self, node):
+        yield 'enter ' + node.name
+
+        if node.name == 'pruned':
+            self.prune()
+
+    @devconf.visitor.enter(_Special)
+    def _enter_special(self, node):
+        yield 'special ' + node.name
+
+    @devconf.visitor.leave(_Leaf)
+    def _leave(self, node):
+        yield 'leave ' + node.name
+
+
+def test_hooks_run_in_tree_order():
+    tree = _Leaf('root', _Leaf('a', _Leaf('a1')), _Special('s', _Leaf('s1')), _Leaf('pruned', _Leaf('hidden')))
+
+    assert list(_Tracer().walk(tree)) == [
+        'enter root',
+        'enter a', 'enter a1', 'leave a1', 'leave a',
+        'special s', 'enter s1', 'leave s1', 'leave s',
+        'enter pruned', 'leave pruned',
+        'leave root',
+    ]
+
+    # hooks are resolved once per node class
+    assert set(_Tracer._dispatch) == {_Leaf, _Special}
+
+
+def test_deep_trees_do_not_recurse():
+    tree = _Leaf('0')
+    node = tree
+
+    for n in range(1, 100000):
+        child = _Leaf(str(n))
+        node.add_child(child)
+        node = child
+
+    events = list(_Tracer().walk(tree))
+
+    assert len(events) == 200000
+    assert events[99999:100001] == ['enter 99999', 'leave 99999']